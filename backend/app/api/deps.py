@@ -0,0 +1,92 @@
+import hashlib
+import hmac
+import ipaddress
+from typing import List, Optional
+from fastapi import Depends, Header, HTTPException, Request
+
+from ..config import settings
+from ..core.rate_limit import TokenBucketLimiter
+
+
+_trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxies)
+
+
+def _client_ip(request: Request) -> str:
+    """Peer address, or the address a trusted proxy forwarded for
+
+    X-Forwarded-For is only read when the peer is a trusted proxy; its
+    entries are walked from the right, skipping further trusted proxies,
+    since everything left of those was written by the client itself.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(host):
+        return host
+
+    forwarded_for = request.headers.get("x-forwarded-for", "")
+    for forwarded in reversed([entry.strip() for entry in forwarded_for.split(",") if entry.strip()]):
+        if not _is_trusted_proxy(forwarded):
+            return forwarded
+    return host
+
+
+def get_client_id(request: Request) -> str:
+    """Identify the caller for scheduling and rate limiting
+
+    Uses the X-API-Key header when present (hashed, so keys never end up in
+    Redis), otherwise the client IP (see _client_ip).
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+    return "ip:" + _client_ip(request)
+
+
+_status_limiter = TokenBucketLimiter(settings.STATUS_RATE_LIMIT, settings.STATUS_RATE_BURST)
+
+
+def limit_status_polling(client_id: str = Depends(get_client_id)) -> str:
+    """Token-bucket rate limit for the status polling endpoints"""
+    retry_after = _status_limiter.acquire(client_id)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many status requests, slow down polling",
+            headers={"Retry-After": str(retry_after)},
+        )
+    return client_id
+
+
+def unique_task_ids(task_ids: List[str]) -> List[str]:
+    """Deduplicate and bound the task IDs of a bulk status request"""
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        raise HTTPException(status_code=400, detail="No task IDs provided")
+    if len(task_ids) > settings.BULK_STATUS_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {settings.BULK_STATUS_MAX_IDS} task IDs per request"
+        )
+    return task_ids
+
+
+def is_admin_key(admin_key: Optional[str]) -> bool:
+    if not settings.ADMIN_API_KEY or not admin_key:
+        return False
+    return hmac.compare_digest(admin_key.encode(), settings.ADMIN_API_KEY.encode())
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """Guard for admin endpoints; they don't exist while ADMIN_API_KEY is unset"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_key(x_admin_key):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
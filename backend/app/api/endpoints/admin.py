@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from ...core.profiling import get_profile, list_profiles
+from ..deps import require_admin
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+def get_profiles(limit: int = Query(100, ge=1, le=1000)):
+    """Recently profiled tasks, newest first"""
+    return list_profiles(limit)
+
+@router.get("/profiles/{task_id}")
+def get_task_profile(task_id: str, format: str = Query("html", pattern="^(html|text)$")):
+    """Profile report of a task: pyinstrument flame view (html) or call tree / pstats (text)"""
+    profile = get_profile(task_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="No profile stored for this task")
+
+    # cProfile fallback reports only have the text form
+    if format == "html" and profile.get("html"):
+        return HTMLResponse(profile["html"])
+    return PlainTextResponse(profile["text"])
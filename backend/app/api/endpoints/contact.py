@@ -4,10 +4,13 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+import logging
 import os
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 
 class ContactMessage(BaseModel):
     name: str
@@ -32,7 +35,7 @@ def send_email_notification(contact_data: ContactMessage):
         admin_email = os.getenv("ADMIN_EMAIL", "")
 
         if not all([smtp_user, smtp_pass, admin_email]):
-            print("Email configuration not complete. Skipping email notification.")
+            logger.warning("Email configuration not complete. Skipping email notification.")
             return
 
         # Create message
@@ -98,10 +101,10 @@ def send_email_notification(contact_data: ContactMessage):
             server.login(smtp_user, smtp_pass)
             server.send_message(msg)
 
-        print(f"Email notification sent successfully to {admin_email}")
+        logger.info("Email notification sent successfully to %s", admin_email)
 
     except Exception as e:
-        print(f"Failed to send email notification: {str(e)}")
+        logger.error("Failed to send email notification: %s", e)
 
 
 def save_to_file(contact_data: ContactMessage):
@@ -119,10 +122,10 @@ def save_to_file(contact_data: ContactMessage):
             f.write(f"Subject: {contact_data.subject}\n")
             f.write(f"Message:\n{contact_data.message}\n")
 
-        print(f"Contact message saved to {filename}")
+        logger.info("Contact message saved to %s", filename)
 
     except Exception as e:
-        print(f"Failed to save contact message to file: {str(e)}")
+        logger.error("Failed to save contact message to file: %s", e)
 
 
 @router.post("/", response_model=ContactResponse)
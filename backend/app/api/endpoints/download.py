@@ -1,17 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
+import json
 import os
+from typing import Dict, List, Optional
 
 from ...database import get_db
 from ...models import Script
-from ...schemas import VideoDownloadRequest, MultipleVideoDownloadRequest, VideoDownloadResponse, ScriptVideoDownloadRequest, AudioDownloadRequest, MultipleAudioDownloadRequest
+from ...schemas import VideoDownloadRequest, MultipleVideoDownloadRequest, VideoDownloadResponse, ScriptVideoDownloadRequest, AudioDownloadRequest, MultipleAudioDownloadRequest, BulkStatusRequest
 from ...core.youtube_downloader import YouTubeDownloader
 from ...workers.tasks import download_video_task, download_multiple_videos_task, download_audio_task, download_multiple_audios_task
 from ...core.redis_client import get_redis_client
+from ...core.status_cache import StatusCache
+from ...core.storage import get_storage
+from ...core.media_profiles import media_type_for, resolve_audio_profile
+from ...core.url_utils import normalize_video_url
+from ...config import settings
+from ..deps import limit_status_polling, unique_task_ids
 
 router = APIRouter()
 
+_status_cache = StatusCache("download_status", settings.STATUS_CACHE_TTL)
+
+def _audio_profile(profile: Optional[str]) -> str:
+    try:
+        return resolve_audio_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _video_url(url) -> str:
+    # Checked locally; availability is the worker's problem, so submitting
+    # never waits on YouTube
+    video_url = normalize_video_url(str(url))
+    if video_url is None:
+        raise HTTPException(status_code=400, detail=f"Invalid YouTube video URL: {url}")
+    return video_url
+
 @router.post("/video", response_model=VideoDownloadResponse)
 async def download_single_video(
     request: VideoDownloadRequest,
@@ -19,29 +43,19 @@ async def download_single_video(
     db: Session = Depends(get_db)
 ):
     """Download a single YouTube video"""
-    downloader = YouTubeDownloader()
+    video_url = _video_url(request.url)
     
-    try:
-        # Validate URL - convert HttpUrl to string
-        video_info = downloader.extract_video_info(str(request.url))
-        
-        # Start download task
-        task = download_video_task.delay(
-            video_url=str(request.url),
-            quality=request.quality
-        )
-        
-        return VideoDownloadResponse(
-            task_id=task.id,
-            status="processing",
-            message="Video download started"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid YouTube URL or video not accessible: {str(e)}"
-        )
+    # Start download task
+    task = download_video_task.delay(
+        video_url=video_url,
+        quality=request.quality
+    )
+    
+    return VideoDownloadResponse(
+        task_id=task.id,
+        status="processing",
+        message="Video download started"
+    )
 
 @router.post("/video/direct")
 async def download_video_direct(
@@ -61,7 +75,7 @@ async def download_video_direct(
         return FileResponse(
             path=video_path,
             filename=filename,
-            media_type='video/mp4',
+            media_type=media_type_for(filename),
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
@@ -93,19 +107,11 @@ async def download_multiple_videos(
         )
     
     # Validate all URLs
-    downloader = YouTubeDownloader()
-    for url in request.urls:
-        try:
-            downloader.extract_video_info(str(url))
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid URL {url}: {str(e)}"
-            )
+    video_urls = [_video_url(url) for url in request.urls]
     
     # Start download task
     task = download_multiple_videos_task.delay(
-        video_urls=[str(url) for url in request.urls],
+        video_urls=video_urls,
         quality=request.quality
     )
     
@@ -115,90 +121,127 @@ async def download_multiple_videos(
         message=f"Starting download of {len(request.urls)} videos"
     )
 
-@router.get("/status/{task_id}")
-def get_download_status(task_id: str):
-    """Get the status of a video download task"""
-    redis_client = get_redis_client()
-    
-    # Get task result from Redis
-    import json
-    task_result_str = redis_client.get(f"download_task:{task_id}")
-    
-    if task_result_str:
-        task_result = json.loads(task_result_str)
-        
-        if task_result.get("state") == "SUCCESS":
-            file_path = task_result.get("file_path")
-            
-            if file_path and os.path.exists(file_path):
-                return {
-                    "status": "completed",
-                    "progress": 100,
-                    "download_url": f"/api/v1/download/file/{task_id}"
-                }
-            else:
-                return {
-                    "status": "error",
-                    "progress": 0,
-                    "error": "File not found"
-                }
-        
-        elif task_result.get("state") == "FAILURE":
+def _download_status_from_result(task_id: str, task_result: dict) -> dict:
+    if task_result.get("state") == "SUCCESS":
+        # Trusted without a storage round trip; /file returns 404 if it is gone
+        if task_result.get("storage_key"):
             return {
-                "status": "error",
-                "progress": 0,
-                "error": task_result.get("error", "Download failed")
+                "status": "completed",
+                "progress": 100,
+                "download_url": f"/api/v1/download/file/{task_id}",
+                "transfer": task_result.get("transfer"),
             }
-        
         else:
             return {
-                "status": "processing",
-                "progress": task_result.get("progress", 0),
-                "message": task_result.get("status", "Processing...")
+                "status": "error",
+                "progress": 0,
+                "error": "File not found"
             }
     
-    # Check Celery task status
+    elif task_result.get("state") == "FAILURE":
+        return {
+            "status": "error",
+            "progress": 0,
+            "error": task_result.get("error", "Download failed")
+        }
+    
+    else:
+        return {
+            "status": "processing",
+            "progress": task_result.get("progress", 0),
+            "message": task_result.get("status", "Processing...")
+        }
+
+def _download_status_from_celery(task_id: str) -> dict:
     from ...workers.celery_app import celery_app
     result = celery_app.AsyncResult(task_id)
+    return _download_status_from_state(task_id, result.state, result.info)
+
+def _download_statuses_from_celery(task_ids: List[str]) -> Dict[str, dict]:
+    """Celery states for many tasks with a single result backend MGET"""
+    from ...workers.celery_app import celery_app
+    backend = celery_app.backend
     
-    if result.state == 'PENDING':
+    values = backend.mget([backend.get_key_for_task(task_id) for task_id in task_ids])
+    statuses = {}
+    for task_id, value in zip(task_ids, values):
+        meta = backend.decode_result(value) if value else {"status": "PENDING", "result": None}
+        statuses[task_id] = _download_status_from_state(task_id, meta["status"], meta.get("result"))
+    return statuses
+
+def _download_status_from_state(task_id: str, state: str, info) -> dict:
+    if state == 'PENDING':
         return {
             "status": "pending",
             "progress": 0,
             "message": "Task is waiting to start"
         }
-    elif result.state == 'PROGRESS':
+    elif state == 'PROGRESS':
         return {
             "status": "processing",
-            "progress": result.info.get('current', 0),
-            "message": result.info.get('status', 'Processing...')
+            "progress": info.get('current', 0),
+            "message": info.get('status', 'Processing...')
         }
-    elif result.state == 'SUCCESS':
+    elif state == 'SUCCESS':
         return {
             "status": "completed",
             "progress": 100,
             "download_url": f"/api/v1/download/file/{task_id}"
         }
-    elif result.state == 'FAILURE':
+    elif state == 'FAILURE':
         return {
             "status": "error",
             "progress": 0,
-            "error": str(result.info)
+            "error": str(info)
         }
     else:
         return {
             "status": "unknown",
             "progress": 0,
-            "message": f"Unknown task state: {result.state}"
+            "message": f"Unknown task state: {state}"
         }
 
+def _load_download_status(task_id: str) -> dict:
+    # Get task result from Redis, then fall back to Celery's own state
+    task_result_str = get_redis_client().get(f"download_task:{task_id}")
+    if task_result_str:
+        return _download_status_from_result(task_id, json.loads(task_result_str))
+    return _download_status_from_celery(task_id)
+
+@router.get("/status/{task_id}")
+def get_download_status(task_id: str, client_id: str = Depends(limit_status_polling)):
+    """Get the status of a video download task"""
+    return _status_cache.get_or_load(
+        f"download:{task_id}", lambda: _load_download_status(task_id)
+    )
+
+@router.post("/status/bulk")
+def get_download_statuses(
+    request: BulkStatusRequest,
+    client_id: str = Depends(limit_status_polling),
+):
+    """Get the status of many download tasks in one round trip"""
+    task_ids = unique_task_ids(request.task_ids)
+    
+    results = get_redis_client().mget([f"download_task:{task_id}" for task_id in task_ids])
+    statuses = {
+        task_id: _download_status_from_result(task_id, json.loads(result))
+        for task_id, result in zip(task_ids, results)
+        if result
+    }
+    
+    missing = [task_id for task_id in task_ids if task_id not in statuses]
+    if missing:
+        statuses.update(_download_statuses_from_celery(missing))
+    
+    return {task_id: statuses[task_id] for task_id in task_ids}
+
 @router.get("/file/{task_id}")
-async def download_file(task_id: str):
+def download_file(task_id: str):
     """Download the completed video file"""
     redis_client = get_redis_client()
     
     # Get file path from Redis
-    import json
     task_result_str = redis_client.get(f"download_task:{task_id}")
     
     if not task_result_str:
@@ -208,30 +251,43 @@ async def download_file(task_id: str):
         )
     
     task_result = json.loads(task_result_str)
-    file_path = task_result.get("file_path")
+    storage_key = task_result.get("storage_key")
+    storage = get_storage()
     
-    if not file_path or not os.path.exists(file_path):
+    if not storage_key or not storage.exists(storage_key):
         raise HTTPException(
             status_code=404,
             detail="File not found"
         )
     
     # Get filename
-    filename = os.path.basename(file_path)
+    filename = task_result.get("file_name") or os.path.basename(storage_key)
     
-    # Determine media type
-    if file_path.endswith('.zip'):
-        media_type = 'application/zip'
-    else:
-        media_type = 'video/mp4'
+    media_type = media_type_for(filename)
+    
+    # Same node or shared volume: serve the file directly
+    local_path = storage.local_path(storage_key)
+    if local_path:
+        return FileResponse(
+            path=local_path,
+            filename=filename,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
+    
+    # Object storage: send the client to the bucket, or relay it from there
+    presigned_url = storage.presigned_url(storage_key, filename, media_type)
+    if presigned_url:
+        return RedirectResponse(presigned_url, status_code=307)
     
-    # Return file
-    return FileResponse(
-        path=file_path,
-        filename=filename,
+    return StreamingResponse(
+        storage.stream(storage_key),
         media_type=media_type,
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(storage.size(storage_key)),
         }
     )
 
@@ -256,13 +312,14 @@ async def download_script_video(
         video_path = downloader.download_video(script.video_url, quality)
         
         # Get filename
-        filename = f"{script.video_title or 'video'}.mp4"
+        extension = os.path.splitext(video_path)[1]
+        filename = f"{script.video_title or 'video'}{extension}"
         
         # Return file response
         return FileResponse(
             path=video_path,
             filename=filename,
-            media_type='video/mp4',
+            media_type=media_type_for(filename),
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
@@ -277,9 +334,12 @@ async def download_script_video(
 @router.post("/script/{script_id}/audio")
 async def download_script_audio(
     script_id: int,
+    profile: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Download the audio for a specific script"""
+    profile = _audio_profile(profile)
+    
     # Get script
     script = db.query(Script).filter(Script.id == script_id).first()
     if not script:
@@ -288,7 +348,7 @@ async def download_script_audio(
     # Download audio
     downloader = YouTubeDownloader()
     try:
-        audio_path = downloader.download_audio(script.video_url)
+        audio_path = downloader.download_audio(script.video_url, profile)
         
         # Get filename - sanitize the title for safe filename
         clean_title = script.video_title or 'audio'
@@ -296,13 +356,13 @@ async def download_script_audio(
         invalid_chars = '<>:"/\\|?*'
         for char in invalid_chars:
             clean_title = clean_title.replace(char, '_')
-        filename = f"{clean_title}.mp3"
+        filename = clean_title + os.path.splitext(audio_path)[1]
         
         # Return file response
         return FileResponse(
             path=audio_path,
             filename=filename,
-            media_type='audio/mpeg',
+            media_type=media_type_for(filename),
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
@@ -321,28 +381,20 @@ async def download_single_audio(
     background_tasks: BackgroundTasks
 ):
     """Download audio from a single YouTube video"""
-    downloader = YouTubeDownloader()
+    profile = _audio_profile(request.profile)
+    video_url = _video_url(request.url)
     
-    try:
-        # Validate URL - convert HttpUrl to string
-        video_info = downloader.extract_video_info(str(request.url))
-        
-        # Start download task
-        task = download_audio_task.delay(
-            video_url=str(request.url)
-        )
-        
-        return VideoDownloadResponse(
-            task_id=task.id,
-            status="processing",
-            message="Audio download started"
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid YouTube URL or video not accessible: {str(e)}"
-        )
+    # Start download task
+    task = download_audio_task.delay(
+        video_url=video_url,
+        profile=profile
+    )
+    
+    return VideoDownloadResponse(
+        task_id=task.id,
+        status="processing",
+        message="Audio download started"
+    )
 
 
 @router.post("/audio/direct")
@@ -350,6 +402,7 @@ async def download_audio_direct(
     request: AudioDownloadRequest
 ):
     """Download audio from a single YouTube video directly (sync)"""
+    profile = _audio_profile(request.profile)
     downloader = YouTubeDownloader()
     
     try:
@@ -357,7 +410,7 @@ async def download_audio_direct(
         video_info = downloader.extract_video_info(str(request.url))
         
         # Download audio
-        audio_path = downloader.download_audio(str(request.url))
+        audio_path = downloader.download_audio(str(request.url), profile)
         
         # Get filename - use video title
         clean_title = video_info.get("title", "audio")
@@ -365,13 +418,13 @@ async def download_audio_direct(
         invalid_chars = '<>:"/\\|?*'
         for char in invalid_chars:
             clean_title = clean_title.replace(char, '_')
-        filename = f"{clean_title}.mp3"
+        filename = clean_title + os.path.splitext(audio_path)[1]
         
         # Return file response
         return FileResponse(
             path=audio_path,
             filename=filename,
-            media_type='audio/mpeg',
+            media_type=media_type_for(filename),
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             }
@@ -390,6 +443,7 @@ async def download_multiple_audios(
     background_tasks: BackgroundTasks
 ):
     """Download audio from multiple YouTube videos as a zip file"""
+    profile = _audio_profile(request.profile)
     
     if not request.urls:
         raise HTTPException(
@@ -404,19 +458,12 @@ async def download_multiple_audios(
         )
     
     # Validate all URLs
-    downloader = YouTubeDownloader()
-    for url in request.urls:
-        try:
-            downloader.extract_video_info(str(url))
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid URL {url}: {str(e)}"
-            )
+    video_urls = [_video_url(url) for url in request.urls]
     
     # Start download task
     task = download_multiple_audios_task.delay(
-        video_urls=[str(url) for url in request.urls]
+        video_urls=video_urls,
+        profile=profile
     )
     
     return VideoDownloadResponse(
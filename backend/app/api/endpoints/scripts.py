@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
@@ -9,7 +9,12 @@ from datetime import datetime
 
 from ...database import get_db
 from ...models import Script
-from ...schemas import ScriptWithContent
+from ...schemas import ScriptWithContent, SegmentSearchHit
+from ...config import settings
+from ...core.search import search_segments
+from ...core.segments import resegment
+from ...core.transcriber import WhisperTranscriber
+from ...core.timing import format_duration, render_srt, render_vtt
 
 router = APIRouter()
 
@@ -21,7 +26,16 @@ def get_all_scripts(
 ):
     """Get all scripts - no authentication required"""
     scripts = db.query(Script).offset(skip).limit(limit).all()
-    return scripts
+    return [with_reading_view(script) for script in scripts]
+
+@router.get("/search", response_model=List[SegmentSearchHit])
+def search_scripts(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over transcript segments of all completed scripts"""
+    return search_segments(db, q, min(limit, settings.SEARCH_MAX_RESULTS))
 
 @router.get("/{script_id}", response_model=ScriptWithContent)
 def get_script(
@@ -34,7 +48,7 @@ def get_script(
     if not script:
         raise HTTPException(status_code=404, detail="Script not found")
     
-    return script
+    return with_reading_view(script)
 
 @router.get("/{script_id}/download")
 def download_script(
@@ -60,6 +74,15 @@ def download_script(
         content = generate_json_content(script)
         filename = f"{sanitize_filename(script.video_title or 'transcript')}.json"
         media_type = "application/json"
+    elif format in ("srt", "vtt"):
+        segments = get_timed_segments(script)
+        if not segments:
+            raise HTTPException(status_code=400, detail="Script has no timed segments for subtitle export")
+        # Built from the stored transcriber timings, not the reading view
+        segments = resegment(segments, settings.SUBTITLE_SEGMENT_PROFILE)
+        content = render_srt(segments) if format == "srt" else render_vtt(segments)
+        filename = f"{sanitize_filename(script.video_title or 'transcript')}.{format}"
+        media_type = "application/x-subrip" if format == "srt" else "text/vtt"
     else:
         raise HTTPException(status_code=400, detail="Unsupported format")
     
@@ -86,11 +109,12 @@ def sanitize_filename(filename: str) -> str:
 
 def generate_txt_content(script: Script) -> str:
     """Generate TXT content for download"""
-    if script.formatted_script:
+    formatted_script = reading_script(script)
+    if formatted_script:
         # Handle new list format
-        if isinstance(script.formatted_script, list):
+        if isinstance(formatted_script, list):
             lines = []
-            for script_item in script.formatted_script:
+            for script_item in formatted_script:
                 if isinstance(script_item, dict) and 'timestamp' in script_item and 'script' in script_item:
                     lines.append(f"{script_item['timestamp']}: {script_item['script']}")
                 else:
@@ -98,8 +122,8 @@ def generate_txt_content(script: Script) -> str:
             return '\n\n'.join(lines)
         
         # Handle old string format
-        elif isinstance(script.formatted_script, str):
-            return script.formatted_script
+        elif isinstance(formatted_script, str):
+            return formatted_script
     
     # Fallback to transcript text
     if script.transcript_text:
@@ -107,6 +131,43 @@ def generate_txt_content(script: Script) -> str:
     
     return "No transcript available"
 
+def get_timed_segments(script: Script) -> List[dict]:
+    """Extract start/end/text segments from the stored formatted script"""
+    if not isinstance(script.formatted_script, list):
+        return []
+    return [
+        {
+            "start": item["start_seconds"],
+            "end": item["end_seconds"],
+            "text": item.get("script", ""),
+            "words": item.get("words"),
+        }
+        for item in script.formatted_script
+        if isinstance(item, dict) and "start_seconds" in item and "end_seconds" in item
+    ]
+
+def reading_script(script: Script):
+    """Stored segments merged/split by SEGMENT_PROFILE for display and txt/json
+
+    The stored form keeps the transcriber's own segment timings, which
+    subtitle exports are built from.
+    """
+    if not isinstance(script.formatted_script, list):
+        return script.formatted_script
+    segments = get_timed_segments(script)
+    if len(segments) != len(script.formatted_script):
+        # Items without timings cannot be reshaped
+        return script.formatted_script
+    return WhisperTranscriber.format_transcript_as_list(
+        resegment(segments, settings.SEGMENT_PROFILE)
+    )
+
+def with_reading_view(script: Script) -> ScriptWithContent:
+    """Response for a script, with formatted_script in its reading view"""
+    return ScriptWithContent.model_validate(script).model_copy(
+        update={"formatted_script": reading_script(script)}
+    )
+
 def generate_json_content(script: Script) -> str:
     """Generate JSON content with the required format"""
     
@@ -121,17 +182,18 @@ def generate_json_content(script: Script) -> str:
     }
     
     # Process the formatted script
-    if script.formatted_script and isinstance(script.formatted_script, list):
+    formatted_script = reading_script(script)
+    if formatted_script and isinstance(formatted_script, list):
         # If it's already in the correct list format
-        for item in script.formatted_script:
+        for item in formatted_script:
             if isinstance(item, dict) and 'timestamp' in item and 'script' in item:
                 json_data["formatted_script"].append({
                     "time": item['timestamp'],
                     "text": item['script']
                 })
-    elif script.formatted_script and isinstance(script.formatted_script, str):
+    elif formatted_script and isinstance(formatted_script, str):
         # Parse string format
-        lines = script.formatted_script.split('\n')
+        lines = formatted_script.split('\n')
         for line in lines:
             line = line.strip()
             if line and '[' in line and ']' in line:
@@ -156,17 +218,3 @@ def generate_json_content(script: Script) -> str:
         })
     
     return json.dumps(json_data, indent=2, ensure_ascii=False)
-
-def format_duration(seconds: int) -> str:
-    """Format duration in human-readable format"""
-    if not seconds:
-        return "0:00"
-    
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-    
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    else:
-        return f"{minutes}:{secs:02d}"
\ No newline at end of file
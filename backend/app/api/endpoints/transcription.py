@@ -1,112 +1,252 @@
 import json
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import uuid
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ...database import get_db
 from ...models import Script
-from ...schemas import ScriptCreate, ProcessingStatus
-from ...workers.tasks import process_youtube_video
-from ...core.youtube_downloader import YouTubeDownloader
+from ...config import settings
+from ...schemas import ScriptCreate, ProcessingStatus, BulkTranscriptionRequest, BulkJobStatus, BulkStatusRequest
+from ...workers.tasks import process_youtube_video, expand_bulk_job
+from ...core.bulk_jobs import create_bulk_job, get_bulk_job
+from ...core.scheduling import prepare_schedule, queue_wait_stats, release_schedule
+from ...core import admission
+from ...core.url_utils import canonical_url, parse_video_id
+from ...core.video_info import lookup_video_info
 from ...core.redis_client import get_redis_client
+from ...core.status_cache import StatusCache
+from ..deps import get_client_id, is_admin_key, limit_status_polling, unique_task_ids
 
 router = APIRouter()
 
+_status_cache = StatusCache("transcription_status", settings.STATUS_CACHE_TTL)
+
 @router.post("/", response_model=ProcessingStatus)
 async def create_transcription(
     script_data: ScriptCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    client_id: str = Depends(get_client_id),
+    x_admin_key: Optional[str] = Header(None),
 ):
     """Start transcription process for a YouTube video - No authentication required"""
     
-    # Validate YouTube URL
-    downloader = YouTubeDownloader()
-    try:
-        video_info = downloader.extract_video_info(str(script_data.video_url))
-    except Exception as e:
+    if script_data.profile and not is_admin_key(x_admin_key):
+        raise HTTPException(status_code=403, detail="Profiling requires an admin key")
+    
+    # Validate YouTube URL locally; the worker finds out whether the video
+    # is available, metadata is only used here when it is already cached
+    video_id = parse_video_id(str(script_data.video_url))
+    if video_id is None:
+        raise HTTPException(status_code=400, detail="Invalid YouTube video URL")
+    video_url = canonical_url(video_id)
+    video_info = lookup_video_info(video_id) or {}
+    
+    # Turn work away before queueing it when it can never run or the queue is
+    # full; unknown durations count as ADMISSION_DEFAULT_DURATION. Admitted
+    # work is reserved under the ID the task is sent with
+    task_id = str(uuid.uuid4())
+    decision = admission.check_admission(video_info.get("duration"), task_id)
+    if not decision.admitted:
+        if decision.retry_after is None:
+            raise HTTPException(status_code=400, detail=decision.reason)
         raise HTTPException(
-            status_code=400,
-            detail=f"Invalid YouTube URL or video not accessible: {str(e)}"
+            status_code=429,
+            detail=decision.reason,
+            headers={"Retry-After": str(decision.retry_after)},
         )
     
-    # Create script record
-    db_script = Script(
-        video_url=str(script_data.video_url),
-        video_title=video_info.get('title'),
-        status='pending'
-    )
-    db.add(db_script)
-    db.commit()
-    db.refresh(db_script)
-    
-    # Start async processing
-    task = process_youtube_video.delay(
-        script_id=db_script.id,
-        video_url=str(script_data.video_url)
-    )
+    scheduling = {"task_id": task_id, "client_id": client_id}
+    try:
+        # Create script record
+        db_script = Script(
+            video_url=video_url,
+            video_title=video_info.get('title'),
+            status='pending'
+        )
+        db.add(db_script)
+        db.commit()
+        db.refresh(db_script)
+        
+        # Start async processing, shorter videos and lighter clients first
+        priority, scheduling = prepare_schedule(
+            "interactive", client_id, video_info.get("duration"), task_id
+        )
+        scheduling["audio_seconds"] = decision.audio_seconds
+        task = process_youtube_video.apply_async(
+            kwargs={
+                "script_id": db_script.id,
+                "video_url": video_url,
+                "word_timestamps": script_data.word_timestamps,
+                "captions_first": script_data.captions_first,
+                "scheduling": scheduling,
+            },
+            headers={"profile": script_data.profile},
+            priority=priority,
+            task_id=scheduling["task_id"],
+        )
+    except Exception:
+        # The task will never run to release what was reserved for it
+        release_schedule(scheduling)
+        admission.release(scheduling)
+        raise
     
     return ProcessingStatus(
         task_id=task.id,
         status="processing",
         progress=0,
-        message="Video processing started"
+        message="Video processing started",
+        eta_seconds=decision.eta_seconds,
     )
 
-@router.get("/status/{task_id}", response_model=ProcessingStatus)
-def get_transcription_status(task_id: str, db: Session = Depends(get_db)):
-    """Get the status of a transcription task"""
-    
+def _status_from_result(task_id: str, task_result: dict) -> ProcessingStatus:
+    return ProcessingStatus(
+        task_id=task_id,
+        status='completed' if task_result.get('state') == 'SUCCESS' else 
+                'failed' if task_result.get('state') == 'FAILURE' else 'processing',
+        progress=task_result.get('progress', 0),
+        message=task_result.get('status', 'Processing...'),
+        script_id=task_result.get('script_id'),
+        transfer=task_result.get('transfer'),
+    )
+
+def _status_from_script(task_id: str, script: Script) -> Optional[ProcessingStatus]:
+    if script.status == 'completed':
+        return ProcessingStatus(
+            task_id=task_id,
+            status='completed',
+            progress=100,
+            message='Transcription completed!',
+            script_id=script.id
+        )
+    elif script.status == 'failed':
+        return ProcessingStatus(
+            task_id=task_id,
+            status='failed',
+            progress=0,
+            message=script.error_message or 'Transcription failed',
+            script_id=script.id
+        )
+    return None
+
+def _default_status(task_id: str) -> ProcessingStatus:
+    return ProcessingStatus(
+        task_id=task_id,
+        status='processing',
+        progress=50,
+        message='Processing video...'
+    )
+
+def _load_transcription_status(task_id: str, db: Session) -> ProcessingStatus:
     redis_client = get_redis_client()
     
     # First, try to get result from Redis
     task_result_str = redis_client.get(f"task_result:{task_id}")
-    
     if task_result_str:
-        # We have a result in Redis
-        task_result = json.loads(task_result_str)
-        print(f"Task {task_id} result from Redis: {task_result}")
-        
-        return ProcessingStatus(
-            task_id=task_id,
-            status='completed' if task_result.get('state') == 'SUCCESS' else 
-                    'failed' if task_result.get('state') == 'FAILURE' else 'processing',
-            progress=task_result.get('progress', 0),
-            message=task_result.get('status', 'Processing...'),
-            script_id=task_result.get('script_id')
-        )
+        return _status_from_result(task_id, json.loads(task_result_str))
     
     # Fallback to checking task data
     task_data_str = redis_client.get(f"task:{task_id}")
     if task_data_str:
-        task_data = json.loads(task_data_str)
-        script_id = task_data.get('script_id')
+        script_id = json.loads(task_data_str).get('script_id')
         
         # Check if script exists and is completed
         if script_id:
             script = db.query(Script).filter(Script.id == script_id).first()
             if script:
-                if script.status == 'completed':
-                    return ProcessingStatus(
-                        task_id=task_id,
-                        status='completed',
-                        progress=100,
-                        message='Transcription completed!',
-                        script_id=script.id
-                    )
-                elif script.status == 'failed':
-                    return ProcessingStatus(
-                        task_id=task_id,
-                        status='failed',
-                        progress=0,
-                        message=script.error_message or 'Transcription failed',
-                        script_id=script.id
-                    )
+                status = _status_from_script(task_id, script)
+                if status:
+                    return status
     
-    # Default response
-    return ProcessingStatus(
-        task_id=task_id,
-        status='processing',
-        progress=50,
-        message='Processing video...'
-    )
\ No newline at end of file
+    return _default_status(task_id)
+
+@router.get("/status/{task_id}", response_model=ProcessingStatus)
+def get_transcription_status(
+    task_id: str,
+    db: Session = Depends(get_db),
+    client_id: str = Depends(limit_status_polling),
+):
+    """Get the status of a transcription task"""
+    return _status_cache.get_or_load(
+        f"transcribe:{task_id}", lambda: _load_transcription_status(task_id, db)
+    )
+
+@router.post("/status/bulk", response_model=Dict[str, ProcessingStatus])
+def get_transcription_statuses(
+    request: BulkStatusRequest,
+    db: Session = Depends(get_db),
+    client_id: str = Depends(limit_status_polling),
+):
+    """Get the status of many transcription tasks in one round trip"""
+    task_ids = unique_task_ids(request.task_ids)
+    redis_client = get_redis_client()
+    
+    results = redis_client.mget([f"task_result:{task_id}" for task_id in task_ids])
+    statuses = {
+        task_id: _status_from_result(task_id, json.loads(result))
+        for task_id, result in zip(task_ids, results)
+        if result
+    }
+    
+    # Fallback to the task data and script rows for the rest, in one query
+    missing = [task_id for task_id in task_ids if task_id not in statuses]
+    script_ids = {}
+    if missing:
+        task_data = redis_client.mget([f"task:{task_id}" for task_id in missing])
+        for task_id, data in zip(missing, task_data):
+            script_id = json.loads(data).get('script_id') if data else None
+            if script_id:
+                script_ids[task_id] = script_id
+    
+    scripts = {}
+    if script_ids:
+        rows = db.query(Script).filter(Script.id.in_(set(script_ids.values()))).all()
+        scripts = {script.id: script for script in rows}
+    
+    for task_id in missing:
+        script = scripts.get(script_ids.get(task_id))
+        status = _status_from_script(task_id, script) if script else None
+        statuses[task_id] = status or _default_status(task_id)
+    
+    return {task_id: statuses[task_id] for task_id in task_ids}
+
+@router.post("/bulk", response_model=BulkJobStatus)
+def create_bulk_transcription(
+    request: BulkTranscriptionRequest,
+    client_id: str = Depends(get_client_id),
+):
+    """Transcribe every video of a playlist or channel
+
+    The collection is expanded and fanned out by the workers; progress is
+    tracked on a single parent job.
+    """
+    max_videos = min(request.max_videos or settings.BULK_MAX_VIDEOS, settings.BULK_MAX_VIDEOS)
+    if max_videos < 1:
+        raise HTTPException(status_code=400, detail="max_videos must be at least 1")
+
+    options = {
+        "word_timestamps": request.word_timestamps,
+        "captions_first": request.captions_first,
+    }
+    job_id = create_bulk_job(str(request.url), client_id, options)
+    expand_bulk_job.delay(job_id, str(request.url), max_videos, options)
+
+    return BulkJobStatus(**get_bulk_job(job_id))
+
+@router.get("/bulk/{job_id}", response_model=BulkJobStatus)
+def get_bulk_transcription_status(job_id: str):
+    """Get aggregate progress of a bulk transcription job"""
+    job = get_bulk_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found or expired")
+    return BulkJobStatus(**job)
+
+@router.get("/queue/stats")
+def get_queue_stats():
+    """Queue wait times per job class (interactive, bulk) and estimated backlog"""
+    stats = queue_wait_stats()
+    stats["backlog_seconds"] = round(admission.backlog_seconds(), 1)
+    stats["real_time_factor"] = admission.get_real_time_factor()
+    return stats
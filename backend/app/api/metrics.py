@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from ..core.metrics import EVENT_LOOP_LAG, HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, render_metrics
+
+LOOP_LAG_INTERVAL = 0.5  # seconds between event loop lag checks
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Request latency by route template and requests in flight"""
+
+    async def dispatch(self, request: Request, call_next):
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The route template keeps label cardinality bounded (/status/{task_id})
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=request.method,
+                route=route.path if route else "unmatched",
+                status=str(status),
+            ).observe(time.perf_counter() - start)
+
+
+async def monitor_event_loop_lag():
+    """Measure how late the loop wakes up; blocking work in handlers shows up here"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LOOP_LAG_INTERVAL
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG.set(max(loop.time() - expected, 0))
@@ -0,0 +1,167 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..config import settings
+from .redis_client import get_redis_client
+
+# Pending work is the sum over live reservations, one per queued or running
+# task, so reservations of tasks that never finish expire instead of
+# inflating the backlog for good. The sum is kept as a running total next
+# to the reservations, updated by the same scripts.
+RESERVATIONS_KEY = "admission:reservations"  # Sorted set of task IDs by deadline
+RESERVED_SECONDS_KEY = "admission:reserved_seconds"  # Audio seconds per task ID
+RESERVED_TOTAL_KEY = "admission:reserved_total"  # Sum of RESERVED_SECONDS_KEY
+RTF_KEY = "admission:rtf"
+RTF_SMOOTHING = 0.2  # Weight of the newest real-time factor sample
+
+# Drops expired reservations and reads the total; with a task ID, also
+# reserves for it when the total is within the limit (an empty limit
+# always reserves). Returns {reserved (0/1), pending seconds before the
+# reservation}.
+_RESERVE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, task_id in ipairs(expired) do
+    local seconds = redis.call('HGET', KEYS[2], task_id)
+    if seconds then
+        redis.call('HDEL', KEYS[2], task_id)
+        redis.call('INCRBY', KEYS[3], -tonumber(seconds))
+    end
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local pending = tonumber(redis.call('GET', KEYS[3]) or '0')
+if ARGV[3] == '' or (ARGV[2] ~= '' and pending > tonumber(ARGV[2])) then
+    return {0, tostring(pending)}
+end
+local previous = redis.call('HGET', KEYS[2], ARGV[3])
+if previous then
+    redis.call('INCRBY', KEYS[3], -tonumber(previous))
+end
+redis.call('ZADD', KEYS[1], ARGV[5], ARGV[3])
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[4])
+redis.call('INCRBY', KEYS[3], ARGV[4])
+return {1, tostring(pending)}
+"""
+
+_RELEASE_SCRIPT = """
+local seconds = redis.call('HGET', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[1], ARGV[1])
+if seconds then
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    redis.call('INCRBY', KEYS[3], -tonumber(seconds))
+end
+"""
+
+# Exponential moving average updated in place, so concurrent workers
+# never overwrite each other's samples
+_RTF_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+local weight = tonumber(ARGV[2])
+local updated = (1 - weight) * current + weight * tonumber(ARGV[3])
+redis.call('SET', KEYS[1], string.format('%.4f', updated))
+"""
+
+_scripts = {}
+
+
+def _run(source: str, keys, args):
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = get_redis_client().register_script(source)
+    return script(keys=keys, args=args)
+
+
+@dataclass
+class AdmissionDecision:
+    admitted: bool
+    reason: Optional[str] = None
+    retry_after: Optional[int] = None
+    eta_seconds: Optional[int] = None
+    audio_seconds: int = 0
+
+
+def estimated_duration(duration: Optional[int]) -> int:
+    """Audio seconds to account for a video, with a default when unknown"""
+    return int(duration) if duration else settings.ADMISSION_DEFAULT_DURATION
+
+
+def get_real_time_factor() -> float:
+    """Measured processing seconds per audio second, smoothed across jobs"""
+    value = get_redis_client().get(RTF_KEY)
+    return float(value) if value else settings.ADMISSION_DEFAULT_RTF
+
+
+def record_real_time_factor(processing_seconds: float, audio_seconds: float):
+    """Feed one transcription measurement into the moving average"""
+    if not audio_seconds or audio_seconds <= 0:
+        return
+    sample = processing_seconds / audio_seconds
+    _run(_RTF_SCRIPT, [RTF_KEY], [settings.ADMISSION_DEFAULT_RTF, RTF_SMOOTHING, sample])
+
+
+_RESERVATION_KEYS = [RESERVATIONS_KEY, RESERVED_SECONDS_KEY, RESERVED_TOTAL_KEY]
+
+
+def _reserve(task_id: str = "", audio_seconds: int = 0, max_pending: Optional[float] = None):
+    now = time.time()
+    reserved, pending = _run(
+        _RESERVE_SCRIPT,
+        _RESERVATION_KEYS,
+        [now, "" if max_pending is None else max_pending, task_id, int(audio_seconds),
+         now + settings.SCHEDULING_LEASE_TTL],
+    )
+    return bool(reserved), float(pending)
+
+
+def _backlog(pending: float, rtf: float) -> float:
+    return pending * rtf / max(settings.ADMISSION_WORKER_SLOTS, 1)
+
+
+def backlog_seconds() -> float:
+    """Wall-clock seconds of work queued ahead of a new job"""
+    return _backlog(_reserve()[1], get_real_time_factor())
+
+
+def check_admission(duration: Optional[int], task_id: Optional[str] = None) -> AdmissionDecision:
+    """Decide whether a new transcription can be queued right now
+
+    With a task ID, an admitted job's audio is reserved for that task in
+    the same atomic step, so concurrent submits cannot overshoot the limit.
+    """
+    if duration and duration > settings.MAX_VIDEO_DURATION:
+        return AdmissionDecision(
+            admitted=False,
+            reason=f"Video is longer than the maximum of {settings.MAX_VIDEO_DURATION} seconds",
+        )
+
+    audio_seconds = estimated_duration(duration)
+    rtf = get_real_time_factor()
+    max_pending = settings.ADMISSION_MAX_BACKLOG * max(settings.ADMISSION_WORKER_SLOTS, 1) / rtf
+    _, pending = _reserve(task_id or "", audio_seconds, max_pending)
+    backlog = _backlog(pending, rtf)
+
+    if backlog > settings.ADMISSION_MAX_BACKLOG:
+        return AdmissionDecision(
+            admitted=False,
+            reason="Transcription queue is at capacity, please retry later",
+            retry_after=max(int(math.ceil(backlog - settings.ADMISSION_MAX_BACKLOG)), 1),
+        )
+
+    return AdmissionDecision(
+        admitted=True,
+        eta_seconds=int(math.ceil(backlog + audio_seconds * rtf)),
+        audio_seconds=audio_seconds,
+    )
+
+
+def reserve(task_id: str, audio_seconds: int):
+    """Count a job's audio as pending work, regardless of the limit"""
+    _reserve(task_id, audio_seconds)
+
+
+def release(scheduling: Optional[Dict]):
+    """Remove a finished job's audio from the pending work"""
+    if not scheduling or not scheduling.get("task_id"):
+        return
+    _run(_RELEASE_SCRIPT, _RESERVATION_KEYS, [scheduling["task_id"]])
@@ -0,0 +1,112 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..config import settings
+from .redis_client import get_redis_client
+
+
+def _job_key(job_id: str) -> str:
+    return f"bulk_job:{job_id}"
+
+
+def _items_key(job_id: str) -> str:
+    return f"bulk_job:{job_id}:items"
+
+
+def create_bulk_job(source_url: str, client_id: str, options: Dict) -> str:
+    """Register a parent job for a playlist/channel ingestion"""
+    redis_client = get_redis_client()
+    job_id = uuid.uuid4().hex
+
+    pipe = redis_client.pipeline()
+    pipe.hset(_job_key(job_id), mapping={
+        "job_id": job_id,
+        "source_url": source_url,
+        "client_id": client_id,
+        "status": "expanding",
+        "total": 0,
+        "dispatched": 0,
+        "completed": 0,
+        "failed": 0,
+        "options": json.dumps(options),
+        "created_at": datetime.utcnow().isoformat(),
+    })
+    pipe.expire(_job_key(job_id), settings.BULK_JOB_TTL)
+    pipe.execute()
+    return job_id
+
+
+def set_bulk_job_items(job_id: str, items: List[Dict]):
+    """Store the expanded (script_id, video_url) items and mark the job running"""
+    redis_client = get_redis_client()
+    pipe = redis_client.pipeline()
+    if items:
+        pipe.rpush(_items_key(job_id), *[json.dumps(item) for item in items])
+        pipe.expire(_items_key(job_id), settings.BULK_JOB_TTL)
+    pipe.hset(_job_key(job_id), mapping={
+        "total": len(items),
+        "status": "running" if items else "completed",
+    })
+    pipe.execute()
+
+
+def get_bulk_job_items(job_id: str, start: int, count: int) -> List[Dict]:
+    redis_client = get_redis_client()
+    raw_items = redis_client.lrange(_items_key(job_id), start, start + count - 1)
+    return [json.loads(raw) for raw in raw_items]
+
+
+def mark_bulk_job_failed(job_id: str, error: str):
+    get_redis_client().hset(_job_key(job_id), mapping={"status": "failed", "error": error})
+
+
+def add_dispatched(job_id: str, count: int):
+    get_redis_client().hincrby(_job_key(job_id), "dispatched", count)
+
+
+def record_bulk_result(job_id: str, script_id: int, success: bool):
+    """Count one finished child task and close the job when all are done
+
+    Each script is counted once, so a redelivered or retried task cannot
+    inflate the totals.
+    """
+    redis_client = get_redis_client()
+    key = _job_key(job_id)
+
+    finished_key = f"{key}:finished"
+    if not redis_client.sadd(finished_key, script_id):
+        return
+    redis_client.expire(finished_key, settings.BULK_JOB_TTL)
+
+    pipe = redis_client.pipeline()
+    pipe.hincrby(key, "completed" if success else "failed", 1)
+    pipe.hmget(key, "completed", "failed", "total")
+    _, (completed, failed, total) = pipe.execute()
+
+    if int(total or 0) and int(completed or 0) + int(failed or 0) >= int(total):
+        redis_client.hset(key, "status", "completed")
+
+
+def get_bulk_job(job_id: str) -> Optional[Dict]:
+    data = get_redis_client().hgetall(_job_key(job_id))
+    if not data:
+        return None
+
+    total = int(data.get("total", 0))
+    completed = int(data.get("completed", 0))
+    failed = int(data.get("failed", 0))
+    return {
+        "job_id": job_id,
+        "source_url": data.get("source_url"),
+        "client_id": data.get("client_id"),
+        "status": data.get("status"),
+        "total": total,
+        "dispatched": int(data.get("dispatched", 0)),
+        "completed": completed,
+        "failed": failed,
+        "progress": int((completed + failed) * 100 / total) if total else 0,
+        "error": data.get("error"),
+        "options": json.loads(data.get("options") or "{}"),
+    }
@@ -0,0 +1,142 @@
+import re
+import xml.etree.ElementTree as ET
+from html import unescape
+from typing import Dict, List, Optional
+
+# Preferred subtitle formats, in order. srv3 keeps YouTube's own cue timing
+# without the rolling duplicate lines of auto-generated VTT.
+CAPTION_FORMATS = ("srv3", "vtt")
+
+_VTT_TIMING = re.compile(
+    r"((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})\s+-->\s+((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})"
+)
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _vtt_time_to_seconds(value: str) -> float:
+    parts = value.replace(",", ".").split(":")
+    seconds = float(parts[-1])
+    minutes = int(parts[-2])
+    hours = int(parts[-3]) if len(parts) == 3 else 0
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _make_segments(cues: List[tuple]) -> List[Dict]:
+    """Turn (start, end, text) cues into whisper-style segments
+
+    Overlapping cues (common in auto-generated captions) are clipped so the
+    segments stay in order and never overlap.
+    """
+    segments = []
+    for index, (start, end, text) in enumerate(cues):
+        if index + 1 < len(cues):
+            end = min(end, cues[index + 1][0])
+        segments.append({
+            "id": len(segments),
+            "start": round(start, 3),
+            "end": round(max(end, start), 3),
+            "text": " " + text,
+        })
+    return segments
+
+
+def parse_vtt(content: str) -> List[Dict]:
+    """Parse WebVTT into segments, dropping the repeated rolling lines of auto captions"""
+    cues = []
+    previous_lines = set()
+    for block in re.split(r"\r?\n\r?\n", content):
+        lines = block.strip().splitlines()
+        timing_index = next(
+            (i for i, line in enumerate(lines) if _VTT_TIMING.search(line)), None
+        )
+        if timing_index is None:
+            continue
+
+        match = _VTT_TIMING.search(lines[timing_index])
+        start = _vtt_time_to_seconds(match.group(1))
+        end = _vtt_time_to_seconds(match.group(2))
+
+        text_lines = [
+            unescape(_TAG.sub("", line)).strip()
+            for line in lines[timing_index + 1:]
+        ]
+        text_lines = [line for line in text_lines if line]
+        new_lines = [line for line in text_lines if line not in previous_lines]
+        previous_lines = set(text_lines)
+
+        text = " ".join(new_lines)
+        if text:
+            cues.append((start, end, text))
+
+    return _make_segments(cues)
+
+
+def parse_srv3(content: str) -> List[Dict]:
+    """Parse YouTube's srv3 (timedtext XML) format into segments"""
+    root = ET.fromstring(content)
+    cues = []
+    for paragraph in root.iter("p"):
+        text = " ".join("".join(paragraph.itertext()).split())
+        if not text:
+            continue
+        start = int(paragraph.get("t", 0)) / 1000
+        end = start + int(paragraph.get("d", 0)) / 1000
+        cues.append((start, end, unescape(text)))
+
+    cues.sort(key=lambda cue: cue[0])
+    return _make_segments(cues)
+
+
+def parse_captions(content: str, ext: str) -> List[Dict]:
+    if ext == "srv3":
+        return parse_srv3(content)
+    if ext == "vtt":
+        return parse_vtt(content)
+    raise ValueError(f"Unsupported caption format: {ext}")
+
+
+def _language_matches(track_language: str, wanted: List[str]) -> bool:
+    base = track_language.split("-")[0].lower()
+    return any(base == language.split("-")[0].lower() for language in wanted)
+
+
+def _pick_format(formats: List[Dict]) -> Optional[Dict]:
+    by_ext = {fmt.get("ext"): fmt for fmt in formats if fmt.get("url")}
+    for ext in CAPTION_FORMATS:
+        if ext in by_ext:
+            return by_ext[ext]
+    return None
+
+
+def select_caption_track(info: Dict, languages: List[str], allow_auto: bool = True) -> Optional[Dict]:
+    """Pick the best acceptable caption track from yt-dlp video info
+
+    Uploaded subtitles win over auto-generated ones. Uploaded tracks are
+    acceptable when their language is the video's own language or one of the
+    configured languages. Auto-generated tracks are always in the spoken
+    language, except machine translations of them, which are never used.
+    Returns {"language", "ext", "url", "source"} or None.
+    """
+    wanted = [language for language in [info.get("language")] + list(languages) if language]
+
+    candidates = [("captions_manual", info.get("subtitles") or {})]
+    if allow_auto:
+        candidates.append(("captions_auto", info.get("automatic_captions") or {}))
+
+    for source, tracks in candidates:
+        for track_language, formats in tracks.items():
+            if track_language == "live_chat":
+                continue
+            if source == "captions_manual" and not _language_matches(track_language, wanted):
+                continue
+            # Auto captions in other languages are translations of the original
+            formats = [fmt for fmt in formats if "tlang=" not in (fmt.get("url") or "")]
+            fmt = _pick_format(formats)
+            if fmt:
+                return {
+                    "language": track_language.split("-")[0],
+                    "ext": fmt["ext"],
+                    "url": fmt["url"],
+                    "source": source,
+                }
+    return None
@@ -0,0 +1,128 @@
+import logging
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Script, ScriptSegment
+from .redis_client import get_redis_client
+from .transcriber import WhisperTranscriber
+
+logger = logging.getLogger(__name__)
+
+# Audio is retained per script, not per video: every script downloads into
+# its own directory (audio_dir), so a script finishing and deleting its file
+# never pulls it from under another script of the same video.
+def _audio_key(script_id: int) -> str:
+    return f"retained_audio:{script_id}"
+
+
+def audio_dir(script_id: int) -> str:
+    return os.path.join(settings.TEMP_AUDIO_PATH, f"script_{script_id}")
+
+
+def retained_audio(script_id: int) -> Optional[str]:
+    """Path of audio kept from an earlier attempt of this script, if still on this node"""
+    path = get_redis_client().get(_audio_key(script_id))
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+def retain_audio(script_id: int, audio_path: str):
+    """Remember downloaded audio so a retried task can skip the download"""
+    get_redis_client().set(_audio_key(script_id), audio_path, ex=settings.AUDIO_RETAIN_TTL)
+
+
+def release_audio(script_id: int):
+    get_redis_client().delete(_audio_key(script_id))
+
+
+def sweep_audio_dirs() -> int:
+    """Remove script audio directories nothing will come back for
+
+    A worker killed mid-task, or a retry that never runs, leaves its
+    directory behind. Directories untouched for longer than AUDIO_RETAIN_TTL
+    whose retain key is gone are deleted. Returns how many were removed.
+    """
+    try:
+        entries = list(os.scandir(settings.TEMP_AUDIO_PATH))
+    except FileNotFoundError:
+        return 0
+
+    cutoff = time.time() - settings.AUDIO_RETAIN_TTL
+    redis_client = get_redis_client()
+    removed = 0
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith("script_") and name[len("script_"):].isdigit()):
+            continue
+        try:
+            if not entry.is_dir() or entry.stat().st_mtime > cutoff:
+                continue
+        except FileNotFoundError:
+            continue
+        if redis_client.exists(_audio_key(int(name[len("script_"):]))):
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed += 1
+
+    if removed:
+        logger.info("Removed %d stale audio directories", removed)
+    return removed
+
+
+def _segment_from_item(item: Dict) -> Dict:
+    """Turn a stored script item back into a whisper-style segment"""
+    segment = {
+        "start": item["start_seconds"],
+        "end": item["end_seconds"],
+        "text": " " + item["script"],
+    }
+    if item.get("words"):
+        segment["words"] = [dict(word, word=" " + word["word"]) for word in item["words"]]
+    return segment
+
+
+def load_checkpoint(db: Session, script: Script) -> Tuple[List[Dict], float]:
+    """Segments saved so far and the offset to resume from
+
+    Without a checkpoint any partial output is cleared so the script starts
+    over from a clean state.
+    """
+    if script.transcribed_until:
+        items = script.formatted_script or []
+        return [_segment_from_item(item) for item in items], script.transcribed_until
+
+    discard_partial(db, script)
+    return [], 0.0
+
+
+def discard_partial(db: Session, script: Script):
+    """Drop a script's partial output, checkpoint and search rows"""
+    script.formatted_script = []
+    script.transcribed_until = None
+    db.query(ScriptSegment).filter(ScriptSegment.script_id == script.id).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def save_window(db: Session, script: Script, segments: List[Dict], next_offset: Optional[float], language: str):
+    """Persist one transcribed window together with the new resume offset
+
+    Windows are not indexed for search; the completed script is.
+    """
+    items = WhisperTranscriber.format_transcript_as_list(segments)
+    existing = list(script.formatted_script or [])
+
+    # Reassign so SQLAlchemy notices the JSON change
+    script.formatted_script = existing + items
+    script.transcript_language = language
+    script.transcribed_until = next_offset if next_offset is not None else (
+        segments[-1]["end"] if segments else script.transcribed_until
+    )
+    db.commit()
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ShortClipBatcher:
+    """Collects short transcription jobs across worker processes into batches
+
+    Every job pushes its audio path onto a per-node Redis list. The first job
+    to take the leader lock waits SHORT_CLIP_BATCH_WINDOW seconds, pops up to
+    SHORT_CLIP_BATCH_SIZE jobs, transcribes them in one batched pass and hands
+    each result back through a per-job Redis list. Other jobs block on their
+    result list and fall back to transcribing on their own if nobody picks
+    them up in time.
+
+    Queues are keyed by hostname because audio files live on the local disk
+    of the node that downloaded them.
+
+    Each job carries its script's resolved language and the cores of the
+    process that queued it. With WORKER_PIN_CPUS every prefork child is
+    pinned to its own cores, so the leader widens its affinity and torch
+    threads to the cores of the batched jobs' children, which sit idle in
+    _wait_for_result until the batch is done (benchmarks/bench_clip_batch.py
+    compares the two layouts).
+    """
+
+    RESULT_TTL = 600
+    POLL_INTERVAL = 1  # seconds between leader attempts while waiting
+
+    def __init__(self, transcriber, redis_client, node: str = None):
+        self.transcriber = transcriber
+        self.redis = redis_client
+        node = node or socket.gethostname()
+        self.queue_key = f"clip_batch:{node}:queue"
+        self.leader_key = f"clip_batch:{node}:leader"
+
+    def _result_key(self, job_id: str) -> str:
+        return f"{self.queue_key}:result:{job_id}"
+
+    def transcribe(self, audio_path: str, language: Optional[str] = None) -> Dict:
+        """Transcribe one short clip, batched together with concurrent clips
+
+        language pins decoding to one language; None lets the model detect it.
+        """
+        job_id = uuid.uuid4().hex
+        payload = json.dumps({
+            "job_id": job_id,
+            "audio_path": audio_path,
+            "language": language,
+            "cpus": self._own_cpus(),
+        })
+        self.redis.rpush(self.queue_key, payload)
+
+        result = None
+        deadline = time.monotonic() + settings.SHORT_CLIP_WAIT_TIMEOUT
+        while result is None and time.monotonic() < deadline:
+            # Whoever finds no active leader runs the next batch
+            if self.redis.set(self.leader_key, job_id, nx=True, ex=settings.SHORT_CLIP_WAIT_TIMEOUT):
+                try:
+                    result = self._lead_batch(job_id)
+                finally:
+                    if self.redis.get(self.leader_key) == job_id:
+                        self.redis.delete(self.leader_key)
+                if result is not None:
+                    break
+            result = self._wait_for_result(job_id, self.POLL_INTERVAL)
+
+        if result is None and self.redis.lrem(self.queue_key, 1, payload) == 0:
+            # Already taken by a leader that is still working on it
+            result = self._wait_for_result(job_id, settings.SHORT_CLIP_WAIT_TIMEOUT)
+
+        if result is None or "error" in result:
+            logger.info("Batched transcription unavailable for %s, transcribing alone", audio_path)
+            return self.transcriber.transcribe_audio(audio_path, word_timestamps=False, language=language)
+        return result
+
+    @staticmethod
+    def _own_cpus() -> List[int]:
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        return []
+
+    def _lead_batch(self, job_id: str):
+        """Run one batch; returns this job's result if it was part of it"""
+        time.sleep(settings.SHORT_CLIP_BATCH_WINDOW)
+
+        # Pop atomically so two leaders can never share a job
+        pipe = self.redis.pipeline()
+        pipe.lrange(self.queue_key, 0, settings.SHORT_CLIP_BATCH_SIZE - 1)
+        pipe.ltrim(self.queue_key, settings.SHORT_CLIP_BATCH_SIZE, -1)
+        raw_jobs, _ = pipe.execute()
+        jobs = [json.loads(raw) for raw in raw_jobs]
+        if not jobs:
+            return None
+
+        from ..workers.concurrency import borrow_cores
+
+        # Every other job's process is blocked waiting, so its cores are free
+        cpus = {cpu for job in jobs for cpu in job.get("cpus") or []}
+        processes = 1 + sum(1 for job in jobs if job["job_id"] != job_id)
+        threads = self._threads() * processes
+
+        logger.info("Transcribing batch of %d short clips on %d cores", len(jobs), len(cpus))
+        try:
+            with borrow_cores(sorted(cpus), threads):
+                results = self.transcriber.transcribe_audio_batch(
+                    [job["audio_path"] for job in jobs],
+                    languages=[job.get("language") for job in jobs],
+                )
+        except Exception as e:
+            logger.error("Batched transcription failed: %s", e)
+            results = [{"error": str(e)} for _ in jobs]
+
+        own_result = None
+        for job, result in zip(jobs, results):
+            if job["job_id"] == job_id:
+                own_result = result
+            else:
+                self._deliver(job["job_id"], result)
+        return own_result
+
+    @staticmethod
+    def _threads() -> int:
+        """Torch threads this process runs with"""
+        try:
+            import torch
+        except ImportError:
+            return 1
+        return torch.get_num_threads()
+
+    def _deliver(self, job_id: str, result: Dict):
+        key = self._result_key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.rpush(key, json.dumps(result))
+        pipe.expire(key, self.RESULT_TTL)
+        pipe.execute()
+
+    def _wait_for_result(self, job_id: str, timeout: int):
+        item = self.redis.blpop(self._result_key(job_id), timeout=timeout)
+        if item is None:
+            return None
+        return json.loads(item[1])
@@ -1,13 +1,13 @@
 import json
-import pandas as pd
 from typing import List, Dict
 import os
 from datetime import datetime
 from ..config import settings
+from .timing import format_segment_times, render_srt, render_vtt
 
 class ScriptFormatter:
     def __init__(self):
-        self.supported_formats = ['txt', 'json', 'excel']
+        self.supported_formats = ['txt', 'json', 'excel', 'srt', 'vtt']
     
     def save_script(self, 
                    video_info: Dict,
@@ -20,6 +20,7 @@ class ScriptFormatter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         video_id = video_info.get('video_id', 'unknown')
         filename = f"script_{video_id}_{timestamp}.{format_type}"
+        os.makedirs(settings.GENERATED_SCRIPTS_PATH, exist_ok=True)
         file_path = os.path.join(settings.GENERATED_SCRIPTS_PATH, filename)
         
         if format_type == 'txt':
@@ -28,6 +29,10 @@ class ScriptFormatter:
             self._save_as_json(file_path, video_info, transcript_data)
         elif format_type == 'excel':
             self._save_as_excel(file_path, video_info, transcript_data)
+        elif format_type == 'srt':
+            self._save_as_srt(file_path, transcript_data)
+        elif format_type == 'vtt':
+            self._save_as_vtt(file_path, transcript_data)
         else:
             raise ValueError(f"Unsupported format: {format_type}")
         
@@ -45,11 +50,12 @@ class ScriptFormatter:
             f.write("=" * 80 + "\n\n")
             
             # Transcript with timestamps
-            for segment in transcript_data['segments']:
-                start_time = self._seconds_to_timestamp(segment['start'])
-                end_time = self._seconds_to_timestamp(segment['end'])
-                text = segment['text']
-                f.write(f"[{start_time} - {end_time}]: {text}\n\n")
+            segments = transcript_data['segments']
+            times = format_segment_times(segments)
+            f.writelines(
+                f"[{start_time} - {end_time}]: {segment['text']}\n\n"
+                for (start_time, end_time), segment in zip(times, segments)
+            )
     
     def _save_as_json(self, file_path: str, video_info: Dict, transcript_data: Dict):
         """Save script as JSON file"""
@@ -68,18 +74,19 @@ class ScriptFormatter:
     
     def _save_as_excel(self, file_path: str, video_info: Dict, transcript_data: Dict):
         """Save script as Excel file"""
-        # Create DataFrame from segments
-        df_data = []
-        for segment in transcript_data['segments']:
-            df_data.append({
-                'Start Time': self._seconds_to_timestamp(segment['start']),
-                'End Time': self._seconds_to_timestamp(segment['end']),
-                'Start (seconds)': segment['start'],
-                'End (seconds)': segment['end'],
-                'Text': segment['text']
-            })
-        
-        df = pd.DataFrame(df_data)
+        # pandas/openpyxl are slow to import and only needed for this format
+        import pandas as pd
+
+        # Create DataFrame from segments, formatting timestamps column-wise
+        segments = transcript_data['segments']
+        times = format_segment_times(segments)
+        df = pd.DataFrame({
+            'Start Time': [start for start, _ in times],
+            'End Time': [end for _, end in times],
+            'Start (seconds)': [segment['start'] for segment in segments],
+            'End (seconds)': [segment['end'] for segment in segments],
+            'Text': [segment['text'] for segment in segments],
+        })
         
         # Create Excel writer
         with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
@@ -105,16 +112,15 @@ class ScriptFormatter:
                     adjusted_width = min(max_length + 2, 50)
                     worksheet.column_dimensions[column_letter].width = adjusted_width
     
-    def _seconds_to_timestamp(self, seconds: float) -> str:
-        """Convert seconds to timestamp format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
+    def _save_as_srt(self, file_path: str, transcript_data: Dict):
+        """Save script as SRT subtitles"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(render_srt(transcript_data['segments']))
+    
+    def _save_as_vtt(self, file_path: str, transcript_data: Dict):
+        """Save script as WebVTT subtitles"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(render_vtt(transcript_data['segments']))
     
     def _format_duration(self, seconds: int) -> str:
         """Format duration in human-readable format"""
@@ -0,0 +1,138 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from ..config import settings
+
+# Correlation IDs attached to every record logged while they are bound
+_task_id: ContextVar[Optional[str]] = ContextVar("task_id", default=None)
+_script_id: ContextVar[Optional[int]] = ContextVar("script_id", default=None)
+
+# Fields of a LogRecord that are not user-supplied `extra`
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "task_id", "script_id"}
+
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
+
+def bind_context(task_id: Optional[str] = None, script_id: Optional[int] = None):
+    """Attach correlation IDs to what this thread/task logs from now on"""
+    if task_id is not None:
+        _task_id.set(task_id)
+    if script_id is not None:
+        _script_id.set(script_id)
+
+
+def clear_context():
+    _task_id.set(None)
+    _script_id.set(None)
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the bound task/script IDs before they are queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.task_id = _task_id.get()
+        record.script_id = _script_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for the log pipeline"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("task_id", "script_id"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting them twice
+
+    The stock prepare() renders the whole line with its own formatter; this
+    only resolves the message and traceback so the target formatter (JSON
+    or text) still sees the structured record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _make_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        "%(asctime)s %(levelname)s [%(task_id)s] %(name)s: %(message)s"
+    )
+
+
+def configure_logging():
+    """Route all logging through a queue drained by a background thread
+
+    Callers only pay for putting the record on the queue; formatting and
+    writing to stderr happen in the listener thread. Threads do not survive
+    fork, so prefork children call this again to start their own listener.
+    """
+    global _listener, _listener_pid
+
+    # A listener inherited from the parent has no thread in this process
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_make_formatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # Chatty libraries stay at warnings unless debugging
+    if root.level > logging.DEBUG:
+        for name in ("urllib3", "httpx", "multipart", "numba"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    atexit.register(_stop_listener, _listener)
+
+
+def _stop_listener(listener: QueueListener):
+    # Flushes what is still queued at interpreter exit
+    if _listener is listener and _listener_pid == os.getpid():
+        listener.stop()
@@ -0,0 +1,76 @@
+import mimetypes
+import os
+from typing import Dict, List, Optional
+
+from ..config import settings
+
+# Audio output profiles. passthrough keeps the downloaded stream untouched;
+# remux copies it into the matching audio container (aac -> .m4a, opus ->
+# .opus) without decoding; the rest re-encode with ffmpeg.
+AUDIO_PROFILES: Dict[str, Optional[Dict]] = {
+    "passthrough": None,
+    "remux": {"preferredcodec": "best"},
+    "mp3-128": {"preferredcodec": "mp3", "preferredquality": "128"},
+    "mp3-192": {"preferredcodec": "mp3", "preferredquality": "192"},
+    "mp3-320": {"preferredcodec": "mp3", "preferredquality": "320"},
+    "opus-64": {"preferredcodec": "opus", "preferredquality": "64"},
+    "opus-128": {"preferredcodec": "opus", "preferredquality": "128"},
+}
+
+# Types mimetypes does not know everywhere
+_EXTRA_TYPES = {
+    ".m4a": "audio/mp4",
+    ".opus": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".weba": "audio/webm",
+    ".webm": "video/webm",
+    ".mkv": "video/x-matroska",
+}
+
+
+def resolve_audio_profile(profile: Optional[str]) -> str:
+    """Validated profile name; None falls back to AUDIO_DOWNLOAD_PROFILE"""
+    profile = profile or settings.AUDIO_DOWNLOAD_PROFILE
+    if profile not in AUDIO_PROFILES:
+        raise ValueError(
+            f"Unknown audio profile: {profile} (choose from {', '.join(AUDIO_PROFILES)})"
+        )
+    return profile
+
+
+def audio_options(profile: str) -> Dict:
+    """yt-dlp options producing the given audio profile"""
+    extract = AUDIO_PROFILES[resolve_audio_profile(profile)]
+    if extract is None:
+        # m4a first: it plays nearly everywhere and needs no container change
+        return {"format": "bestaudio[ext=m4a]/bestaudio/best"}
+    return {
+        "format": "bestaudio/best",
+        "postprocessors": [{"key": "FFmpegExtractAudio", **extract}],
+    }
+
+
+def ffmpeg_options() -> Dict:
+    """Thread count for every ffmpeg yt-dlp runs (merging, extraction, encoding)"""
+    if not settings.FFMPEG_THREADS:
+        return {}
+    return {"postprocessor_args": {"default": ["-threads", str(settings.FFMPEG_THREADS)]}}
+
+
+def downloaded_path(info: Dict, fallback_dir: str = None, stem: str = None, extensions: List[str] = ()) -> Optional[str]:
+    """Final path of a download once post-processing settled its extension"""
+    for download in info.get("requested_downloads") or []:
+        path = download.get("filepath")
+        if path and os.path.exists(path):
+            return path
+    # Older yt-dlp versions do not report requested_downloads
+    for ext in extensions:
+        path = os.path.join(fallback_dir, f"{stem}.{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def media_type_for(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    return _EXTRA_TYPES.get(ext) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
@@ -0,0 +1,95 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Processing stages take from milliseconds (formatting) to an hour (long
+# transcriptions), HTTP requests from milliseconds to a few seconds
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+STAGE_SECONDS = Histogram(
+    "scriptgen_stage_seconds",
+    "Time spent per processing stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+TASK_SECONDS = Histogram(
+    "scriptgen_task_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=STAGE_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "scriptgen_cache_requests_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"],
+)
+DOWNLOADED_BYTES = Counter(
+    "scriptgen_downloaded_bytes_total",
+    "Bytes of media downloaded from YouTube",
+)
+TRANSCRIBED_AUDIO_SECONDS = Counter(
+    "scriptgen_transcribed_audio_seconds_total",
+    "Seconds of audio turned into transcripts",
+    ["source"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "scriptgen_http_request_seconds",
+    "API request latency by route",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "scriptgen_http_requests_in_flight",
+    "API requests currently being handled",
+    multiprocess_mode="livesum",
+)
+EVENT_LOOP_LAG = Gauge(
+    "scriptgen_event_loop_lag_seconds",
+    "How late the API event loop woke up for its last scheduled check",
+    multiprocess_mode="livemax",
+)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Observe the duration of a processing stage, also when it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def multiprocess_enabled() -> bool:
+    """Prefork workers and multi-process API servers share metrics via files"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry():
+    if not multiprocess_enabled():
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics():
+    """(body, content type) of the current metrics in the text format"""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,155 @@
+import io
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from ..config import settings
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "task_profile:{task_id}"
+PROFILE_INDEX_KEY = "task_profiles"  # Sorted set of profiled task IDs by time
+
+
+def should_profile(requested: Optional[bool]) -> bool:
+    """Profile when the submitter asked for it, otherwise by sample rate"""
+    if requested is not None:
+        return requested
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+class _SamplingProfiler:
+    """pyinstrument: statistical, cheap enough to leave on a production task"""
+
+    engine = "pyinstrument"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self._profiler = Profiler(interval=settings.PROFILE_INTERVAL, async_mode="disabled")
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def reports(self) -> dict:
+        return {
+            "html": self._profiler.output_html(),
+            "text": self._profiler.output_text(unicode=True, show_all=False),
+        }
+
+
+class _DeterministicProfiler:
+    """cProfile fallback when pyinstrument is missing; slows Python code down more"""
+
+    engine = "cprofile"
+
+    def __init__(self):
+        import cProfile
+
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+
+    def reports(self) -> dict:
+        import pstats
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILE_TOP_FUNCTIONS)
+        return {"text": stream.getvalue()}
+
+
+def _make_profiler():
+    try:
+        return _SamplingProfiler()
+    except ImportError:
+        return _DeterministicProfiler()
+
+
+def save_profile(task_id: str, task_name: str, engine: str, wall_seconds: float, reports: dict):
+    redis_client = get_redis_client()
+    key = PROFILE_KEY.format(task_id=task_id)
+    now = time.time()
+    pipe = redis_client.pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping={
+        "task_id": task_id,
+        "task_name": task_name,
+        "engine": engine,
+        "wall_seconds": round(wall_seconds, 3),
+        "created_at": now,
+        **reports,
+    })
+    pipe.expire(key, settings.PROFILE_TTL)
+    pipe.zadd(PROFILE_INDEX_KEY, {task_id: now})
+    # Forget index entries whose profile has expired
+    pipe.zremrangebyscore(PROFILE_INDEX_KEY, "-inf", now - settings.PROFILE_TTL)
+    pipe.execute()
+
+
+def get_profile(task_id: str) -> Optional[dict]:
+    profile = get_redis_client().hgetall(PROFILE_KEY.format(task_id=task_id))
+    return profile or None
+
+
+def list_profiles(limit: int = 100) -> List[dict]:
+    """Most recent profiles first, without their reports"""
+    redis_client = get_redis_client()
+    task_ids = redis_client.zrevrange(PROFILE_INDEX_KEY, 0, limit - 1)
+    pipe = redis_client.pipeline()
+    for task_id in task_ids:
+        pipe.hmget(PROFILE_KEY.format(task_id=task_id), "task_name", "engine", "wall_seconds", "created_at")
+    profiles = []
+    for task_id, (task_name, engine, wall_seconds, created_at) in zip(task_ids, pipe.execute()):
+        if engine is None:
+            continue
+        profiles.append({
+            "task_id": task_id,
+            "task_name": task_name,
+            "engine": engine,
+            "wall_seconds": float(wall_seconds),
+            "created_at": float(created_at),
+        })
+    return profiles
+
+
+@contextmanager
+def profile_task(task_id: str, task_name: str):
+    """Profile the enclosed block and store the report under the task ID
+
+    Failures to profile or to store the report are logged and never fail
+    the task itself.
+    """
+    try:
+        profiler = _make_profiler()
+        profiler.start()
+    except Exception as e:
+        logger.warning("Profiling unavailable for task %s: %s", task_id, e)
+        profiler = None
+    if profiler is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        wall_seconds = time.perf_counter() - start
+        try:
+            save_profile(task_id, task_name, profiler.engine, wall_seconds, profiler.reports())
+            logger.info("Stored %s profile for task %s (%.1fs)", profiler.engine, task_id, wall_seconds)
+        except Exception as e:
+            logger.warning("Could not store profile for task %s: %s", task_id, e)
+
@@ -0,0 +1,54 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-client token bucket kept in process memory
+
+    Each client gets `burst` tokens refilled at `rate` per second. Limits
+    apply per API process, which is enough to stop runaway pollers without
+    adding a Redis round trip to every request.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        # Without a refill every client would be locked out for good once
+        # its burst is spent
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"Rate limit burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client_id: str) -> Optional[int]:
+        """Take one token; returns None if allowed, else seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+            if tokens >= 1:
+                if client_id not in self._buckets and len(self._buckets) >= self.max_clients:
+                    self._evict_full()
+                self._buckets[client_id] = (tokens - 1, now)
+                return None
+
+            self._buckets[client_id] = (tokens, now)
+            return max(int(math.ceil((1 - tokens) / self.rate)), 1)
+
+    def _evict_full(self):
+        """Forget clients whose bucket has refilled completely"""
+        now = time.monotonic()
+        idle = self.burst / self.rate
+        for client_id in [
+            client_id for client_id, (_, updated) in self._buckets.items()
+            if now - updated >= idle
+        ]:
+            del self._buckets[client_id]
+        if len(self._buckets) >= self.max_clients:
+            self._buckets.clear()
@@ -0,0 +1,132 @@
+import json
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from ..config import settings
+from .redis_client import get_redis_client
+
+# Celery's Redis transport serves priority 0 first. Interactive jobs always
+# sit in a better band than bulk jobs; inside a band shorter videos and
+# clients with fewer jobs in flight come first.
+PRIORITY_BANDS = {
+    "interactive": (0, 4),
+    "bulk": (5, 9),
+}
+DURATION_BUCKETS = (120, 600, 1800)  # seconds
+
+# Each queued or running task holds a slot until it ends. Slots carry a
+# deadline, so tasks that never report back (killed workers, revoked or
+# lost messages) stop counting against their client once it passes.
+IN_FLIGHT_KEY = "sched:in_flight:{client_id}"  # Sorted set of task IDs by slot deadline
+CLIENTS_KEY = "sched:clients"  # Sorted set of client IDs by their latest slot deadline
+WAIT_SAMPLES = 1000  # Queue wait samples kept per job class
+
+
+def _duration_rank(duration: Optional[int]) -> int:
+    if not duration:
+        # Unknown duration, schedule like a medium-length video
+        return 2
+    for rank, limit in enumerate(DURATION_BUCKETS):
+        if duration <= limit:
+            return rank
+    return len(DURATION_BUCKETS)
+
+
+def compute_priority(job_class: str, duration: Optional[int], client_in_flight: int) -> int:
+    low, high = PRIORITY_BANDS[job_class]
+    penalty = client_in_flight // settings.FAIR_SHARE_STEP
+    return min(low + _duration_rank(duration) + penalty, high)
+
+
+def prepare_schedule(
+    job_class: str, client_id: str, duration: Optional[int], task_id: Optional[str] = None
+) -> Tuple[int, Dict]:
+    """Reserve a client slot and return (priority, scheduling info for the task)
+
+    The slot belongs to `task_id` (generated when not given); the task must
+    be sent with that ID so the slot is released when it ends.
+    """
+    if job_class not in PRIORITY_BANDS:
+        raise ValueError(f"Unknown job class: {job_class}")
+
+    task_id = task_id or str(uuid.uuid4())
+    key = IN_FLIGHT_KEY.format(client_id=client_id)
+    now = time.time()
+    deadline = now + settings.SCHEDULING_LEASE_TTL
+    pipe = get_redis_client().pipeline()
+    pipe.zremrangebyscore(key, "-inf", now)
+    pipe.zcard(key)
+    pipe.zadd(key, {task_id: deadline})
+    pipe.expire(key, settings.SCHEDULING_LEASE_TTL)
+    pipe.zadd(CLIENTS_KEY, {client_id: deadline})
+    in_flight = pipe.execute()[1]
+
+    priority = compute_priority(job_class, duration, in_flight)
+    scheduling = {
+        "job_class": job_class,
+        "client_id": client_id,
+        "task_id": task_id,
+        "priority": priority,
+        "enqueued_at": time.time(),
+    }
+    return priority, scheduling
+
+
+def release_schedule(scheduling: Optional[Dict]):
+    """Free the client slot taken by prepare_schedule once the task ends"""
+    if not scheduling or not scheduling.get("task_id"):
+        return
+    key = IN_FLIGHT_KEY.format(client_id=scheduling["client_id"])
+    get_redis_client().zrem(key, scheduling["task_id"])
+
+
+def record_queue_wait(scheduling: Optional[Dict]) -> Optional[float]:
+    """Store how long a task waited in the queue, returns the wait in seconds"""
+    if not scheduling:
+        return None
+
+    wait = max(time.time() - scheduling["enqueued_at"], 0)
+    key = f"sched:wait:{scheduling['job_class']}"
+    pipe = get_redis_client().pipeline()
+    pipe.lpush(key, json.dumps(round(wait, 3)))
+    pipe.ltrim(key, 0, WAIT_SAMPLES - 1)
+    pipe.execute()
+    return wait
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def queue_wait_stats() -> Dict:
+    """Queue wait summary per job class over the most recent samples"""
+    redis_client = get_redis_client()
+    stats = {}
+    for job_class in PRIORITY_BANDS:
+        samples = sorted(
+            float(value) for value in redis_client.lrange(f"sched:wait:{job_class}", 0, -1)
+        )
+        if not samples:
+            stats[job_class] = {"samples": 0}
+            continue
+        stats[job_class] = {
+            "samples": len(samples),
+            "mean_seconds": round(sum(samples) / len(samples), 3),
+            "p50_seconds": _percentile(samples, 0.5),
+            "p95_seconds": _percentile(samples, 0.95),
+            "max_seconds": samples[-1],
+        }
+
+    now = time.time()
+    redis_client.zremrangebyscore(CLIENTS_KEY, "-inf", now)
+    pipe = redis_client.pipeline()
+    for client_id in redis_client.zrange(CLIENTS_KEY, 0, -1):
+        key = IN_FLIGHT_KEY.format(client_id=client_id)
+        pipe.zremrangebyscore(key, "-inf", now)
+        pipe.zcard(key)
+    in_flight = [count for count in pipe.execute()[1::2] if count]
+    stats["active_clients"] = len(in_flight)
+    stats["jobs_in_flight"] = sum(in_flight)
+    return stats
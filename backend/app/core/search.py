@@ -0,0 +1,105 @@
+from typing import Dict, List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import Script, ScriptSegment, SEARCH_TEXT_CONFIG, segment_search_vector
+
+SNIPPET_RADIUS = 60
+
+
+def index_script_segments(db: Session, script_id: int, formatted_script: List[Dict]):
+    """Replace the search index rows of a script with its formatted segments
+
+    The caller owns the transaction, so indexing commits together with the
+    script update.
+    """
+    db.query(ScriptSegment).filter(ScriptSegment.script_id == script_id).delete(
+        synchronize_session=False
+    )
+
+    rows = [
+        {
+            "script_id": script_id,
+            "position": position,
+            "start_seconds": item["start_seconds"],
+            "end_seconds": item["end_seconds"],
+            "text": item["script"],
+        }
+        for position, item in enumerate(formatted_script or [])
+        if isinstance(item, dict) and item.get("script")
+    ]
+    if rows:
+        db.bulk_insert_mappings(ScriptSegment, rows)
+
+
+def search_segments(db: Session, query: str, limit: int = 20) -> List[Dict]:
+    """Search transcript segments across all completed scripts"""
+    if db.bind.dialect.name == "postgresql":
+        return _search_postgres(db, query, limit)
+    return _search_fallback(db, query, limit)
+
+
+def _search_postgres(db: Session, query: str, limit: int) -> List[Dict]:
+    ts_query = func.plainto_tsquery(SEARCH_TEXT_CONFIG, query)
+    vector = segment_search_vector(ScriptSegment.text)
+
+    rows = (
+        db.query(
+            ScriptSegment.script_id,
+            Script.video_title,
+            ScriptSegment.start_seconds,
+            ScriptSegment.end_seconds,
+            func.ts_headline(
+                SEARCH_TEXT_CONFIG,
+                ScriptSegment.text,
+                ts_query,
+                "StartSel=<b>, StopSel=</b>, MaxWords=25, MinWords=10",
+            ).label("snippet"),
+        )
+        .join(Script, Script.id == ScriptSegment.script_id)
+        .filter(Script.status == "completed", vector.op("@@")(ts_query))
+        .order_by(func.ts_rank(vector, ts_query).desc(), ScriptSegment.id)
+        .limit(limit)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
+
+def _search_fallback(db: Session, query: str, limit: int) -> List[Dict]:
+    """Substring search for databases without full-text support (e.g. SQLite)"""
+    rows = (
+        db.query(
+            ScriptSegment.script_id,
+            Script.video_title,
+            ScriptSegment.start_seconds,
+            ScriptSegment.end_seconds,
+            ScriptSegment.text,
+        )
+        .join(Script, Script.id == ScriptSegment.script_id)
+        .filter(
+            Script.status == "completed",
+            func.lower(ScriptSegment.text).contains(query.lower(), autoescape=True),
+        )
+        .order_by(ScriptSegment.id)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "script_id": row.script_id,
+            "video_title": row.video_title,
+            "start_seconds": row.start_seconds,
+            "end_seconds": row.end_seconds,
+            "snippet": _make_snippet(row.text, query),
+        }
+        for row in rows
+    ]
+
+
+def _make_snippet(text: str, query: str) -> str:
+    index = text.lower().find(query.lower())
+    if index == -1:
+        return text[: SNIPPET_RADIUS * 2]
+    start = max(index - SNIPPET_RADIUS, 0)
+    end = index + len(query) + SNIPPET_RADIUS
+    return text[start:end]
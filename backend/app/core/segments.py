@@ -0,0 +1,233 @@
+"""
+Segment post-processing: merge short segments, split long ones
+
+Whisper and caption tracks produce segments of very uneven length, from
+one-word fragments to half-minute run-ons. resegment() rebuilds them to a
+profile's target duration and character count: long segments are cut at
+the last sentence (or else clause) punctuation that leaves a reasonably
+sized piece, otherwise at a word boundary, and short neighbours are merged
+while the result stays within the limits. Cut times come from word
+timestamps when a segment has them and are interpolated by character
+offset otherwise.
+
+Splitting and merging stream over the words once, so the cost is linear in
+the length of the transcript.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+SENTENCE_END = frozenset(".!?…。！？")
+CLAUSE_END = frozenset(",;:—–，、；：")
+_CLOSING = "\"'”’)]}»」』"
+_TOKEN = re.compile(r"\s*\S+")
+
+
+@dataclass(frozen=True)
+class SegmentProfile:
+    max_chars: int
+    max_duration: float
+    min_chars: int  # Shorter pieces are merged into a neighbour when they fit
+    min_duration: float
+    max_gap: float  # Never merge across a longer pause
+    line_chars: int = 0  # Wrap text into balanced lines of this width, 0 keeps one line
+    sentences: bool = False  # Keep merging until a sentence ends
+
+
+SEGMENT_PROFILES: Dict[str, Optional[SegmentProfile]] = {
+    "none": None,
+    # Two lines of 42 characters, on screen long enough to read
+    "subtitle": SegmentProfile(
+        max_chars=84, max_duration=6.0, min_chars=15, min_duration=1.0, max_gap=1.0, line_chars=42,
+    ),
+    # Sentence-sized paragraphs for the transcript view and txt/json exports
+    "reading": SegmentProfile(
+        max_chars=320, max_duration=30.0, min_chars=60, min_duration=3.0, max_gap=2.0, sentences=True,
+    ),
+}
+
+
+def resolve_segment_profile(name: str) -> Optional[SegmentProfile]:
+    if name not in SEGMENT_PROFILES:
+        raise ValueError(
+            f"Unknown segment profile: {name} (choose from {', '.join(SEGMENT_PROFILES)})"
+        )
+    return SEGMENT_PROFILES[name]
+
+
+def _ends_with(text: str, marks: frozenset) -> bool:
+    text = text.rstrip().rstrip(_CLOSING)
+    return bool(text) and text[-1] in marks
+
+
+def _tokens(segment: Dict) -> List[tuple]:
+    """(text, start, end, word) per word, text keeping its leading space"""
+    words = segment.get("words")
+    if words:
+        # Raw Whisper words carry their leading space, stored ones are stripped
+        return [
+            (w["word"] if w["word"][:1].isspace() else " " + w["word"], w["start"], w["end"], w)
+            for w in words
+        ]
+
+    text = segment["text"]
+    start, end = segment["start"], segment["end"]
+    scale = (end - start) / max(len(text), 1)
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        tokens.append((
+            match.group(),
+            start + match.start() * scale,
+            start + match.end() * scale,
+            None,
+        ))
+    return tokens
+
+
+def _own(segment: Dict) -> Dict:
+    """Copy of the fields we keep, safe to extend while merging"""
+    own = {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+    if segment.get("words"):
+        own["words"] = list(segment["words"])
+    return own
+
+
+def _piece(tokens: List[tuple], first: int, last: int, segment: Dict, has_words: bool) -> Dict:
+    piece = {
+        # The outer pieces keep the segment's own bounds
+        "start": segment["start"] if first == 0 else tokens[first][1],
+        "end": segment["end"] if last == len(tokens) else tokens[last - 1][2],
+        "text": "".join(token[0] for token in tokens[first:last]).strip(),
+    }
+    if has_words:
+        piece["words"] = [token[3] for token in tokens[first:last]]
+    return piece
+
+
+def _split(segment: Dict, profile: SegmentProfile) -> Iterator[Dict]:
+    text = segment["text"].strip()
+    if len(text) <= profile.max_chars and segment["end"] - segment["start"] <= profile.max_duration:
+        yield _own(segment)
+        return
+
+    tokens = _tokens(segment)
+    if len(tokens) < 2:
+        yield _own(segment)
+        return
+    has_words = bool(segment.get("words"))
+
+    begin = 0
+    chars = 0
+    # Best cut points in the current piece: (token index, piece length there)
+    sentence_cut = clause_cut = None
+    index = 0
+    while index < len(tokens):
+        word, start, end, _ = tokens[index]
+        size = len(word) if index > begin else len(word.strip())
+        too_long = (
+            chars + size > profile.max_chars
+            or end - tokens[begin][1] > profile.max_duration
+        )
+        if index > begin and too_long:
+            if sentence_cut and sentence_cut[1] >= profile.min_chars:
+                cut = sentence_cut[0]
+            elif clause_cut and clause_cut[1] >= profile.min_chars:
+                cut = clause_cut[0]
+            else:
+                cut = index
+            yield _piece(tokens, begin, cut, segment, has_words)
+            # Words after the cut start the next piece; rescanning them is
+            # bounded by the piece size
+            begin, index = cut, cut
+            chars = 0
+            sentence_cut = clause_cut = None
+            continue
+
+        chars += size
+        if _ends_with(word, SENTENCE_END):
+            sentence_cut = (index + 1, chars)
+        elif _ends_with(word, CLAUSE_END):
+            clause_cut = (index + 1, chars)
+        index += 1
+
+    yield _piece(tokens, begin, len(tokens), segment, has_words)
+
+
+def _is_short(segment: Dict, profile: SegmentProfile) -> bool:
+    return (
+        len(segment["text"]) < profile.min_chars
+        or segment["end"] - segment["start"] < profile.min_duration
+    )
+
+
+def _should_merge(current: Dict, following: Dict, profile: SegmentProfile) -> bool:
+    if following["start"] - current["end"] > profile.max_gap:
+        return False
+    if len(current["text"]) + 1 + len(following["text"]) > profile.max_chars:
+        return False
+    if following["end"] - current["start"] > profile.max_duration:
+        return False
+    if _is_short(current, profile) or _is_short(following, profile):
+        return True
+    return profile.sentences and not _ends_with(current["text"], SENTENCE_END)
+
+
+def _merge(segments: Iterable[Dict], profile: SegmentProfile) -> Iterator[Dict]:
+    # Pieces from _split are fresh dicts, so they are extended in place
+    current = None
+    for segment in segments:
+        if not segment["text"]:
+            continue
+        if current is None:
+            current = segment
+        elif _should_merge(current, segment, profile):
+            current["end"] = segment["end"]
+            current["text"] = f"{current['text']} {segment['text']}"
+            if "words" in current and segment.get("words"):
+                current["words"].extend(segment["words"])
+            else:
+                # Text would no longer match the words, and re-splitting
+                # rebuilds text from words
+                current.pop("words", None)
+        else:
+            yield current
+            current = segment
+    if current is not None:
+        yield current
+
+
+def wrap_lines(text: str, width: int) -> str:
+    """Break text into lines of at most `width` characters, balanced in length"""
+    if len(text) <= width:
+        return text
+    words = text.split()
+    target = math.ceil(len(text) / math.ceil(len(text) / width))
+    lines, line = [], ""
+    for word in words:
+        if line and (len(line) + 1 + len(word) > width or len(line) >= target):
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    lines.append(line)
+    return "\n".join(lines)
+
+
+def resegment(segments: List[Dict], profile_name: str) -> List[Dict]:
+    """Segments with start/end/text (and optional words) reshaped to a profile
+
+    Returns new dicts with start, end, text and, when the input had word
+    timings, words. The "none" profile returns the input unchanged.
+    """
+    profile = resolve_segment_profile(profile_name)
+    if profile is None:
+        return segments
+
+    split = (piece for segment in segments for piece in _split(segment, profile))
+    result = list(_merge(split, profile))
+    if profile.line_chars:
+        for segment in result:
+            segment["text"] = wrap_lines(segment["text"], profile.line_chars)
+    return result
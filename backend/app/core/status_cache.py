@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from .metrics import record_cache
+
+
+class StatusCache:
+    """Short-lived in-process cache for task status reads
+
+    Concurrent misses for the same key are coalesced: the first caller loads
+    the value while the others wait for it, so a burst of polls for one task
+    costs a single Redis/DB lookup.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 10000):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    record_cache(self.name, hit=True)
+                    return entry[1]
+                event = self._loading.get(key)
+                if event is None:
+                    event = self._loading[key] = threading.Event()
+                    break
+            # Another request is loading this key, use its result
+            event.wait()
+
+        record_cache(self.name, hit=False)
+        try:
+            value = loader()
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._evict_expired()
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            event.set()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
@@ -0,0 +1,250 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+ARTIFACT_INDEX_KEY = "storage:artifacts"  # Sorted set of artifact keys by deletion time
+SWEEP_BATCH = 100
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> "Storage":
+    """Process-wide artifact storage configured by STORAGE_BACKEND"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                backend = STORAGE_BACKENDS.get(settings.STORAGE_BACKEND)
+                if backend is None:
+                    raise ValueError(
+                        f"Unknown storage backend: {settings.STORAGE_BACKEND} "
+                        f"(choose from {', '.join(STORAGE_BACKENDS)})"
+                    )
+                _storage = backend()
+    return _storage
+
+
+def artifact_key(task_id: str, file_path: str) -> str:
+    """Key of a task's output file; one prefix per task keeps names from colliding"""
+    return f"downloads/{task_id}/{os.path.basename(file_path)}"
+
+
+def track_artifact(key: str):
+    """Schedule an artifact for deletion after STORAGE_RETENTION"""
+    if settings.STORAGE_RETENTION <= 0:
+        return
+    from .redis_client import get_redis_client
+
+    get_redis_client().zadd(ARTIFACT_INDEX_KEY, {key: time.time() + settings.STORAGE_RETENTION})
+
+
+def sweep_artifacts() -> int:
+    """Delete artifacts past their retention; returns how many were deleted
+
+    Safe to run on several workers at once: a key is only deleted by the
+    caller that removed it from the index.
+    """
+    from .redis_client import get_redis_client
+
+    redis_client = get_redis_client()
+    storage = get_storage()
+    deleted = 0
+    while True:
+        keys = redis_client.zrangebyscore(ARTIFACT_INDEX_KEY, "-inf", time.time(), start=0, num=SWEEP_BATCH)
+        for key in keys:
+            if not redis_client.zrem(ARTIFACT_INDEX_KEY, key):
+                continue
+            try:
+                storage.delete(key)
+                deleted += 1
+            except Exception as e:
+                logger.warning("Could not delete artifact %s: %s", key, e)
+        if len(keys) < SWEEP_BATCH:
+            break
+    if deleted:
+        logger.info("Deleted %d expired artifacts", deleted)
+    return deleted
+
+
+class Storage(ABC):
+    """Where finished artifacts live so any API node can serve any worker's output"""
+
+    @abstractmethod
+    def put_file(self, file_path: str, key: str, content_type: str = None):
+        """Store a local file under `key`; the local file is consumed"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def stream(self, key: str) -> Iterator[bytes]:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove an artifact; a missing key is not an error"""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Path on this node's disk, if the backend keeps files locally"""
+        return None
+
+    def presigned_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        """Time-limited direct download URL, if the backend supports one"""
+        return None
+
+
+class LocalStorage(Storage):
+    """Files on a directory shared by the API and workers (one node or a shared volume)"""
+
+    def __init__(self, root: str = None):
+        self.root = os.path.abspath(root or settings.STORAGE_LOCAL_PATH)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_file(self, file_path: str, key: str, content_type: str = None):
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # A rename when both are on one filesystem, a copy otherwise
+        shutil.move(file_path, target)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def stream(self, key: str) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def delete(self, key: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+        # Drop the task's directory once its last file is gone
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+
+class S3Storage(Storage):
+    """S3 or any S3-compatible service (MinIO, Ceph, R2) via STORAGE_S3_ENDPOINT_URL"""
+
+    def __init__(self):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+        except ImportError:
+            raise ImportError(
+                "The s3 storage backend requires the boto3 package (pip install boto3)"
+            )
+
+        if not settings.STORAGE_S3_BUCKET:
+            raise ValueError("STORAGE_S3_BUCKET must be set for the s3 storage backend")
+
+        self.bucket = settings.STORAGE_S3_BUCKET
+        self.prefix = settings.STORAGE_S3_PREFIX.strip("/")
+        # Credentials fall back to boto3's chain (env, profile, instance role)
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.STORAGE_S3_ENDPOINT_URL or None,
+            region_name=settings.STORAGE_S3_REGION or None,
+            aws_access_key_id=settings.STORAGE_S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.STORAGE_S3_SECRET_KEY or None,
+            # Path-style addressing works with MinIO and other stand-ins
+            config=Config(
+                s3={"addressing_style": "path" if settings.STORAGE_S3_ENDPOINT_URL else "auto"},
+                max_pool_connections=max(10, settings.STORAGE_UPLOAD_CONCURRENCY * 2),
+            ),
+        )
+        chunk_size = settings.STORAGE_MULTIPART_CHUNK_MB * 1024 * 1024
+        self.transfer_config = TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=settings.STORAGE_UPLOAD_CONCURRENCY,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, file_path: str, key: str, content_type: str = None):
+        # Large files go up as concurrent multipart chunks read from disk
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_file(
+            file_path, self.bucket, self._key(key),
+            ExtraArgs=extra_args, Config=self.transfer_config,
+        )
+        os.remove(file_path)
+        logger.info("Uploaded %s to s3://%s/%s", os.path.basename(file_path), self.bucket, self._key(key))
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=self._key(key))["ContentLength"]
+
+    def stream(self, key: str) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+        try:
+            yield from body.iter_chunks(STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def presigned_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        if not settings.STORAGE_PRESIGNED_DOWNLOADS:
+            return None
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(key),
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+                "ResponseContentType": content_type,
+            },
+            ExpiresIn=settings.STORAGE_PRESIGNED_TTL,
+        )
+
+
+STORAGE_BACKENDS = {
+    "local": LocalStorage,
+    "s3": S3Storage,
+}
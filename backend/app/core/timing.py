@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List
+
+# Precomputed zero-padded strings so batch formatting avoids per-call f-string work
+_PAD2 = [f"{i:02d}" for i in range(100)]
+_PAD3 = [f"{i:03d}" for i in range(1000)]
+
+TIMESTAMP_STYLES = ("clock", "ms", "srt", "vtt")
+
+
+def _format_clock(seconds: float) -> str:
+    """HH:MM:SS when an hour or longer, otherwise MM:SS"""
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours > 0:
+        return f"{_pad_hours(hours)}:{_PAD2[minutes]}:{_PAD2[secs]}"
+    return f"{_PAD2[minutes]}:{_PAD2[secs]}"
+
+
+def _pad_hours(hours: int) -> str:
+    return _PAD2[hours] if hours < 100 else str(hours)
+
+
+def _split_ms(seconds: float):
+    total_ms = int(round(seconds * 1000))
+    total_secs, ms = divmod(total_ms, 1000)
+    hours, rem = divmod(total_secs, 3600)
+    minutes, secs = divmod(rem, 60)
+    return hours, minutes, secs, ms
+
+
+def _format_ms(seconds: float, separator: str) -> str:
+    hours, minutes, secs, ms = _split_ms(seconds)
+    return f"{_pad_hours(hours)}:{_PAD2[minutes]}:{_PAD2[secs]}{separator}{_PAD3[ms]}"
+
+
+def _format_srt(seconds: float) -> str:
+    return _format_ms(seconds, ",")
+
+
+def _format_vtt(seconds: float) -> str:
+    return _format_ms(seconds, ".")
+
+
+_FORMATTERS = {
+    "clock": _format_clock,
+    "ms": _format_vtt,
+    "srt": _format_srt,
+    "vtt": _format_vtt,
+}
+
+
+def _get_formatter(style: str):
+    try:
+        return _FORMATTERS[style]
+    except KeyError:
+        raise ValueError(f"Unknown timestamp style: {style}")
+
+
+def seconds_to_timestamp(seconds: float, style: str = "clock") -> str:
+    """Convert seconds to a timestamp string
+
+    Styles:
+        clock - MM:SS, or HH:MM:SS for an hour or longer
+        ms    - HH:MM:SS.mmm
+        srt   - HH:MM:SS,mmm
+        vtt   - HH:MM:SS.mmm
+    """
+    return _get_formatter(style)(max(seconds or 0, 0))
+
+
+def format_timestamps(values: Iterable[float], style: str = "clock") -> List[str]:
+    """Format many second values at once"""
+    fmt = _get_formatter(style)
+    return [fmt(v if v and v > 0 else 0) for v in values]
+
+
+def format_segment_times(segments: List[Dict], style: str = "clock") -> List[tuple]:
+    """Return (start, end) timestamp strings for every segment in one pass"""
+    fmt = _get_formatter(style)
+    return [
+        (fmt(max(seg["start"], 0)), fmt(max(seg["end"], 0)))
+        for seg in segments
+    ]
+
+
+def format_segment_ranges(segments: List[Dict], style: str = "clock") -> List[str]:
+    """Return "[start - end]" labels for every segment"""
+    return [f"[{start} - {end}]" for start, end in format_segment_times(segments, style)]
+
+
+def format_duration(seconds: int) -> str:
+    """Format a duration as H:MM:SS or M:SS"""
+    if not seconds:
+        return "0:00"
+
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
+
+    if hours > 0:
+        return f"{hours}:{_PAD2[minutes]}:{_PAD2[secs]}"
+    return f"{minutes}:{_PAD2[secs]}"
+
+
+def render_srt(segments: List[Dict]) -> str:
+    """Render segments with start/end/text keys as SRT subtitles"""
+    times = format_segment_times(segments, style="srt")
+    return "".join(
+        f"{index}\n{start} --> {end}\n{segment['text'].strip()}\n\n"
+        for index, ((start, end), segment) in enumerate(zip(times, segments), 1)
+    )
+
+
+def render_vtt(segments: List[Dict]) -> str:
+    """Render segments with start/end/text keys as WebVTT subtitles"""
+    times = format_segment_times(segments, style="vtt")
+    return "WEBVTT\n\n" + "".join(
+        f"{start} --> {end}\n{segment['text'].strip()}\n\n"
+        for (start, end), segment in zip(times, segments)
+    )
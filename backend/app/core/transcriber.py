@@ -1,107 +1,232 @@
-import whisper
+import logging
 import os
-from typing import Dict, List
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
 from ..config import settings
+from .timing import format_segment_ranges, format_segment_times
+from .whisper_backends import SAMPLE_RATE, load_audio_head, load_audio_range, load_backend
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CHARS = 200  # Tail of the previous window passed as context to the next
+
+_shared_transcriber = None
+_shared_lock = threading.Lock()
+
+
+def get_transcriber() -> "WhisperTranscriber":
+    """Process-wide transcriber, so the model is loaded once per worker process
+
+    Under the threads pool every task thread shares it; the transcriber's own
+    lock runs one model call at a time.
+    """
+    global _shared_transcriber
+    if _shared_transcriber is None:
+        with _shared_lock:
+            if _shared_transcriber is None:
+                _shared_transcriber = WhisperTranscriber()
+    return _shared_transcriber
 
 
 class WhisperTranscriber:
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, backend: str = None):
         self.model_name = model_name or settings.WHISPER_MODEL
-        print(f"Loading Whisper model: {self.model_name}")
-        self.model = whisper.load_model(self.model_name)
-        print(f"Whisper model loaded successfully")
+        self.backend_name = backend or settings.TRANSCRIBER_BACKEND
+        logger.info("Loading Whisper model: %s (%s)", self.model_name, self.backend_name)
+        self.backend = load_backend(
+            self.backend_name,
+            self.model_name,
+            device=settings.WHISPER_DEVICE,
+            compute_type=settings.WHISPER_COMPUTE_TYPE,
+            cpu_threads=settings.WHISPER_CPU_THREADS,
+        )
+        # One model call at a time; the model already uses every thread it has
+        self._lock = threading.Lock()
+        logger.info("Whisper model loaded successfully")
 
-    def transcribe_audio(self, audio_path: str) -> Dict:
-        """Transcribe audio file using Whisper"""
+    def detect_language(self, audio_path: str) -> Tuple[str, float]:
+        """Identify the spoken language from the first 30 seconds of audio"""
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        print(f"Starting transcription of: {audio_path}")
+        audio = load_audio_head(audio_path, 30)
+        with self._lock:
+            language, probability = self.backend.detect_language(audio)
+        logger.info("Detected language: %s (p=%.2f)", language, probability)
+        return language, probability
+
+    def transcribe_audio(
+        self, audio_path: str, word_timestamps: bool = None, language: str = None
+    ) -> Dict:
+        """Transcribe audio file using Whisper
+
+        word_timestamps adds per-word timings to every segment; None falls back
+        to settings.WHISPER_WORD_TIMESTAMPS. language pins decoding to one
+        language; None lets the model detect it.
+        """
+        if word_timestamps is None:
+            word_timestamps = settings.WHISPER_WORD_TIMESTAMPS
+
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        logger.info("Starting transcription of: %s", audio_path)
 
         try:
             # Transcribe the audio file directly with the path
-            result = self.model.transcribe(
-                audio_path,
-                language=None,  # Auto-detect language
-                task="transcribe",
-                verbose=True,
-                temperature=0.0,
-                compression_ratio_threshold=2.4,
-                logprob_threshold=-1.0,
-                no_speech_threshold=0.6,
-                condition_on_previous_text=True,
-                initial_prompt=None,
-                word_timestamps=False,
-            )
-
-            print(
-                f"Transcription completed. Detected language: {result.get('language', 'unknown')}"
-            )
-
-            return {
-                "text": result["text"],
-                "segments": result["segments"],
-                "language": result.get("language", "unknown"),
-            }
-
+            with self._lock:
+                result = self.backend.transcribe(
+                    audio_path, **self._decode_options(word_timestamps, language)
+                )
         except Exception as e:
-            print(f"Error during transcription: {str(e)}")
-            # Try with different parameters as fallback
+            # Failed windows are already retried at higher temperatures inside
+            # the decoder, so a full re-run here would only double the cost
+            logger.error("Error during transcription: %s", e)
+            raise Exception(f"Transcription failed: {str(e)}")
+
+        logger.info("Transcription completed. Language: %s", result["language"])
+        return result
+
+    def transcribe_audio_windows(
+        self,
+        audio_path: str,
+        start: float = 0.0,
+        word_timestamps: bool = None,
+        language: str = None,
+        prompt: str = None,
+    ) -> Iterator[Tuple[List[Dict], Optional[float], str]]:
+        """Transcribe a long file in CHECKPOINT_WINDOW chunks starting at `start`
+
+        Yields (segments, next_offset, language) after every window, with
+        segment times relative to the whole file; next_offset is None after
+        the last window. A window's final segment may be cut by the boundary,
+        so it is dropped and the next window starts where it began.
+        """
+        if word_timestamps is None:
+            word_timestamps = settings.WHISPER_WORD_TIMESTAMPS
+
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        window = settings.CHECKPOINT_WINDOW
+        offset = start
+        while True:
+            logger.info("Transcribing %s from %.1fs", audio_path, offset)
+            audio = load_audio_range(audio_path, offset, window)
+            is_last = len(audio) < window * SAMPLE_RATE
+            if len(audio) == 0:
+                yield [], None, language
+                return
+
             try:
-                print("Attempting transcription with basic parameters...")
-                result = self.model.transcribe(audio_path)
-                return {
-                    "text": result["text"],
-                    "segments": result["segments"],
-                    "language": result.get("language", "unknown"),
-                }
-            except Exception as fallback_error:
-                print(f"Fallback transcription also failed: {str(fallback_error)}")
+                with self._lock:
+                    result = self.backend.transcribe(
+                        audio, **self._decode_options(word_timestamps, language, prompt)
+                    )
+            except Exception as e:
+                logger.error("Error during transcription: %s", e)
                 raise Exception(f"Transcription failed: {str(e)}")
 
+            # Later windows reuse the first window's language
+            language = language or result["language"]
+            segments = result["segments"]
+            if not is_last and len(segments) > 1 and segments[-1]["start"] > 0:
+                next_offset = offset + segments[-1]["start"]
+                segments = segments[:-1]
+            else:
+                next_offset = offset + window
+
+            segments = [self._shift_segment(segment, offset) for segment in segments]
+            yield segments, None if is_last else next_offset, language
+            if is_last:
+                return
+
+            prompt = "".join(segment["text"] for segment in segments)[-PROMPT_CHARS:] or prompt
+            offset = next_offset
+
+    @staticmethod
+    def _decode_options(word_timestamps: bool, language: str = None, prompt: str = None) -> Dict:
+        return dict(
+            language=language,
+            verbose=settings.WHISPER_VERBOSE,
+            temperature=tuple(settings.WHISPER_TEMPERATURE_FALLBACK),
+            compression_ratio_threshold=2.4,
+            logprob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            condition_on_previous_text=True,
+            initial_prompt=prompt,
+            word_timestamps=word_timestamps,
+        )
+
+    @staticmethod
+    def _shift_segment(segment: Dict, offset: float) -> Dict:
+        shifted = {
+            "start": segment["start"] + offset,
+            "end": segment["end"] + offset,
+            "text": segment["text"],
+        }
+        if segment.get("words"):
+            shifted["words"] = [
+                dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                for word in segment["words"]
+            ]
+        return shifted
+
+    def transcribe_audio_batch(
+        self, audio_paths: List[str], languages: List[Optional[str]] = None
+    ) -> List[Dict]:
+        """Transcribe several short audio files in one batched model pass
+
+        languages holds each file's resolved language, None to detect it.
+        Decoding uses the same options as transcribe_audio.
+        """
+        for audio_path in audio_paths:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        options = self._decode_options(word_timestamps=False)
+        del options["language"]
+        logger.info("Starting batched transcription of %d clips", len(audio_paths))
+        with self._lock:
+            return self.backend.transcribe_batch(audio_paths, languages=languages, **options)
+
     def format_transcript(
         self, segments: List[Dict], format_type: str = "timestamp"
     ) -> str:
         """Format transcript segments into readable text"""
         if format_type == "timestamp":
-            lines = []
-            for segment in segments:
-                start_time = self._seconds_to_timestamp(segment["start"])
-                end_time = self._seconds_to_timestamp(segment["end"])
-                text = segment["text"].strip()
-                lines.append(f"[{start_time} - {end_time}]: {text}")
+            ranges = format_segment_ranges(segments)
+            lines = [
+                f"{label}: {segment['text'].strip()}"
+                for label, segment in zip(ranges, segments)
+            ]
             return "\n\n".join(lines)
         elif format_type == "plain":
             return " ".join([segment["text"].strip() for segment in segments])
         else:
             raise ValueError(f"Unknown format type: {format_type}")
 
-    def format_transcript_as_list(self, segments: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def format_transcript_as_list(segments: List[Dict]) -> List[Dict]:
         """Format transcript segments into a list of script objects"""
+        times = format_segment_times(segments)
         script_list = []
-        for segment in segments:
-            start_time = self._seconds_to_timestamp(segment["start"])
-            end_time = self._seconds_to_timestamp(segment["end"])
-            text = segment["text"].strip()
-
-            script_list.append(
-                {
-                    "timestamp": f"[{start_time} - {end_time}]",
-                    "script": text,
-                    "start_seconds": segment["start"],
-                    "end_seconds": segment["end"],
-                }
-            )
+        for (start_time, end_time), segment in zip(times, segments):
+            item = {
+                "timestamp": f"[{start_time} - {end_time}]",
+                "script": segment["text"].strip(),
+                "start_seconds": segment["start"],
+                "end_seconds": segment["end"],
+            }
+            if segment.get("words"):
+                item["words"] = [
+                    {
+                        "word": word["word"].strip(),
+                        "start": round(word["start"], 3),
+                        "end": round(word["end"], 3),
+                    }
+                    for word in segment["words"]
+                ]
+            script_list.append(item)
 
         return script_list
-
-    def _seconds_to_timestamp(self, seconds: float) -> str:
-        """Convert seconds to HH:MM:SS or MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
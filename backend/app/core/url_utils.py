@@ -0,0 +1,66 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+YOUTUBE_HOSTS = {
+    "youtube.com",
+    "www.youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+    "www.youtube-nocookie.com",
+}
+SHORT_HOSTS = {"youtu.be", "www.youtu.be"}
+
+# /shorts/<id>, /embed/<id>, /live/<id>, /v/<id>, /e/<id>
+PATH_PREFIXES = {"shorts", "embed", "live", "v", "e"}
+
+
+def parse_video_id(url: str) -> Optional[str]:
+    """YouTube video ID of a URL, without any network access
+
+    Accepts watch, youtu.be, shorts, embed, live and /v/ links with or
+    without scheme, on the default ports; returns None for anything else,
+    including playlists and channels.
+    """
+    url = (url or "").strip()
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        # urlsplit only validates the port when it is read
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https"):
+        return None
+    if port not in (None, 80, 443):
+        return None
+
+    host = (parts.hostname or "").lower()
+    segments = [segment for segment in parts.path.split("/") if segment]
+
+    video_id = None
+    if host in SHORT_HOSTS:
+        video_id = segments[0] if segments else None
+    elif host in YOUTUBE_HOSTS:
+        if segments == ["watch"]:
+            video_id = (parse_qs(parts.query).get("v") or [None])[0]
+        elif len(segments) >= 2 and segments[0] in PATH_PREFIXES:
+            video_id = segments[1]
+
+    if video_id and VIDEO_ID_PATTERN.match(video_id):
+        return video_id
+    return None
+
+
+def canonical_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def normalize_video_url(url: str) -> Optional[str]:
+    """Canonical watch URL for any accepted YouTube video URL shape"""
+    video_id = parse_video_id(url)
+    return canonical_url(video_id) if video_id else None
@@ -0,0 +1,34 @@
+import json
+import logging
+from typing import Dict, Optional
+
+from ..config import settings
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+VIDEO_INFO_KEY = "video_info:{video_id}"
+
+
+def remember_video_info(info: Dict):
+    """Share extracted metadata with the API, which no longer extracts on submit"""
+    video_id = info.get("video_id")
+    if not video_id or video_id == "unknown":
+        return
+    try:
+        get_redis_client().set(
+            VIDEO_INFO_KEY.format(video_id=video_id),
+            json.dumps(info),
+            ex=settings.VIDEO_INFO_CACHE_TTL,
+        )
+    except Exception as e:
+        logger.warning("Could not cache video info for %s: %s", video_id, e)
+
+
+def lookup_video_info(video_id: str) -> Optional[Dict]:
+    """Metadata of a video some worker or API process extracted recently"""
+    from .metrics import record_cache
+
+    value = get_redis_client().get(VIDEO_INFO_KEY.format(video_id=video_id))
+    record_cache("video_info", hit=bool(value))
+    return json.loads(value) if value else None
@@ -0,0 +1,334 @@
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+SAMPLE_RATE = 16000
+
+
+def load_audio_head(audio_path: str, seconds: float = 30.0):
+    """Decode only the first seconds of a file as 16 kHz mono float32
+
+    Much cheaper than decoding the whole file when only a short probe is
+    needed, e.g. for language identification.
+    """
+    return load_audio_range(audio_path, 0.0, seconds)
+
+
+def load_audio_range(audio_path: str, start: float, seconds: float):
+    """Decode `seconds` of audio starting at `start` as 16 kHz mono float32"""
+    import numpy as np
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-ss", str(start),
+        "-i", audio_path,
+        "-t", str(seconds),
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+class TranscriptionBackend(ABC):
+    """Base class for speech-to-text engines used by WhisperTranscriber
+
+    Every backend returns the same contract as openai-whisper:
+    {"text": str, "segments": [{"id", "start", "end", "text", ...}], "language": str}
+    """
+
+    name = None
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @abstractmethod
+    def transcribe(self, audio: Any, **options) -> Dict:
+        """Transcribe a file path or a 16 kHz mono float32 array"""
+
+    @abstractmethod
+    def detect_language(self, audio: Any) -> Tuple[str, float]:
+        """Identify the spoken language of a short (<= 30 s) 16 kHz array
+
+        Returns (language code, probability).
+        """
+
+    def transcribe_batch(self, audios: List[Any], languages: List[Optional[str]] = None,
+                         **options) -> List[Dict]:
+        """Transcribe several short inputs, one result per input
+
+        languages pins each input to a language, None entries are detected.
+        Backends without a batched decoder simply run them one after another.
+        """
+        languages = languages or [None] * len(audios)
+        return [
+            self.transcribe(audio, language=language, **options)
+            for audio, language in zip(audios, languages)
+        ]
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference PyTorch implementation (fp32 on CPU)"""
+
+    name = "openai-whisper"
+
+    def __init__(self, model_name: str, device: str = None, **kwargs):
+        super().__init__(model_name)
+        import whisper
+
+        self.model = whisper.load_model(model_name, device=device)
+
+    def transcribe(self, audio, **options) -> Dict:
+        result = self.model.transcribe(audio, task="transcribe", **options)
+        return {
+            "text": result["text"],
+            "segments": result["segments"],
+            "language": result.get("language", "unknown"),
+        }
+
+
+    def detect_language(self, audio) -> Tuple[str, float]:
+        import whisper
+
+        if not self.model.is_multilingual:
+            return "en", 1.0
+
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), self.model.dims.n_mels)
+        _, probs = self.model.detect_language(mel.to(self.model.device))
+        language = max(probs, key=probs.get)
+        return language, float(probs[language])
+
+    def transcribe_batch(self, audios: List[Any], languages: List[Optional[str]] = None,
+                         **options) -> List[Dict]:
+        """Decode inputs of up to 30 s together in batched model passes
+
+        Such an input is a single whisper window, so there is no earlier text
+        to condition on and batching decodes it exactly as transcribe() would.
+        Windows failing the compression ratio or log probability thresholds
+        are decoded again, batched, at the next temperature of the fallback.
+        Longer inputs go through transcribe() one by one.
+        """
+        import whisper
+        from whisper.audio import N_SAMPLES, SAMPLE_RATE
+        from whisper.tokenizer import get_tokenizer
+
+        languages = languages or [None] * len(audios)
+        temperatures = options.get("temperature", 0.0)
+        if not isinstance(temperatures, (list, tuple)):
+            temperatures = [temperatures]
+
+        tokenizer_kwargs = {}
+        if hasattr(self.model, "num_languages"):
+            tokenizer_kwargs["num_languages"] = self.model.num_languages
+        tokenizer = get_tokenizer(self.model.is_multilingual, **tokenizer_kwargs)
+
+        results: List[Optional[Dict]] = [None] * len(audios)
+        # Single-window inputs by language: (input index, mel, duration)
+        groups: Dict[Optional[str], List[Tuple[int, Any, float]]] = {}
+        for index, (audio, language) in enumerate(zip(audios, languages)):
+            samples = whisper.load_audio(audio) if isinstance(audio, str) else audio
+            if len(samples) > N_SAMPLES:
+                results[index] = self.transcribe(samples, language=language, **options)
+                continue
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), self.model.dims.n_mels)
+            groups.setdefault(language, []).append((index, mel, len(samples) / SAMPLE_RATE))
+
+        no_speech_threshold = options.get("no_speech_threshold", 0.6)
+        logprob_threshold = options.get("logprob_threshold", -1.0)
+        for language, items in groups.items():
+            decoded = self._decode_with_fallback([mel for _, mel, _ in items], language, temperatures, options)
+            for (index, _, duration), result in zip(items, decoded):
+                output = {"text": "", "segments": [], "language": result.language or "unknown"}
+                results[index] = output
+                if result.no_speech_prob > no_speech_threshold and result.avg_logprob < logprob_threshold:
+                    continue
+                for segment in self._tokens_to_segments(tokenizer, result.tokens, 0.0, duration):
+                    segment.update(
+                        id=len(output["segments"]),
+                        temperature=result.temperature,
+                        avg_logprob=result.avg_logprob,
+                        compression_ratio=result.compression_ratio,
+                        no_speech_prob=result.no_speech_prob,
+                    )
+                    output["segments"].append(segment)
+                output["text"] = "".join(segment["text"] for segment in output["segments"])
+        return results
+
+    def _decode_with_fallback(self, mels: List[Any], language: Optional[str], temperatures,
+                              options: Dict) -> List[Any]:
+        """Batched whisper.decode with transcribe()'s per-window temperature fallback"""
+        import torch
+        import whisper
+
+        compression_ratio_threshold = options.get("compression_ratio_threshold", 2.4)
+        logprob_threshold = options.get("logprob_threshold", -1.0)
+        no_speech_threshold = options.get("no_speech_threshold", 0.6)
+
+        results = [None] * len(mels)
+        pending = list(range(len(mels)))
+        for temperature in temperatures:
+            decode_options = whisper.DecodingOptions(
+                task="transcribe",
+                language=language,
+                temperature=temperature,
+                fp16=self.model.device.type != "cpu",
+            )
+            mel_batch = torch.stack([mels[i] for i in pending]).to(self.model.device)
+            retry = []
+            for i, result in zip(pending, whisper.decode(self.model, mel_batch, decode_options)):
+                results[i] = result
+                # Same rule as whisper.transcribe: a failed window is retried
+                # unless it is judged to be silence
+                failed = (
+                    (compression_ratio_threshold is not None
+                     and result.compression_ratio > compression_ratio_threshold)
+                    or (logprob_threshold is not None and result.avg_logprob < logprob_threshold)
+                )
+                if failed and not (no_speech_threshold is not None
+                                   and result.no_speech_prob > no_speech_threshold):
+                    retry.append(i)
+            pending = retry
+            if not pending:
+                break
+        return results
+
+    @staticmethod
+    def _tokens_to_segments(tokenizer, tokens: List[int], window_start: float, window_end: float) -> List[Dict]:
+        """Split decoded tokens into segments at timestamp token pairs"""
+        timestamp_begin = tokenizer.timestamp_begin
+        segments = []
+        start, text_tokens = None, []
+
+        def add_segment(segment_start, segment_end):
+            text = tokenizer.decode(text_tokens)
+            if text.strip():
+                segments.append({
+                    "start": round(segment_start, 3),
+                    "end": round(max(segment_end, segment_start), 3),
+                    "text": text,
+                    "tokens": list(text_tokens),
+                })
+
+        for token in tokens:
+            if token >= timestamp_begin:
+                time = window_start + (token - timestamp_begin) * 0.02
+                if start is None:
+                    start = time
+                else:
+                    add_segment(start, min(time, window_end))
+                    start, text_tokens = None, []
+            else:
+                text_tokens.append(token)
+
+        # Trailing text without a closing timestamp runs to the end of the window
+        if text_tokens:
+            add_segment(start if start is not None else window_start, window_end)
+        return segments
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 engine with int8 quantization, much faster on CPU
+
+    Requires the optional faster-whisper package.
+    """
+
+    name = "faster-whisper"
+
+    # openai-whisper option name -> faster-whisper option name
+    OPTION_NAMES = {
+        "language": "language",
+        "temperature": "temperature",
+        "compression_ratio_threshold": "compression_ratio_threshold",
+        "logprob_threshold": "log_prob_threshold",
+        "no_speech_threshold": "no_speech_threshold",
+        "condition_on_previous_text": "condition_on_previous_text",
+        "initial_prompt": "initial_prompt",
+        "word_timestamps": "word_timestamps",
+    }
+
+    def __init__(self, model_name: str, device: str = "cpu", compute_type: str = "int8",
+                 cpu_threads: int = 0, **kwargs):
+        super().__init__(model_name)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError(
+                "The faster-whisper backend requires the faster-whisper package "
+                "(pip install faster-whisper)"
+            )
+
+        self.model = WhisperModel(
+            model_name,
+            device=device or "cpu",
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+        )
+
+    def transcribe(self, audio, **options) -> Dict:
+        kwargs = {
+            self.OPTION_NAMES[key]: value
+            for key, value in options.items()
+            if key in self.OPTION_NAMES
+        }
+        segments, info = self.model.transcribe(audio, task="transcribe", **kwargs)
+
+        # faster-whisper yields segments lazily, decoding happens while iterating
+        result_segments = [self._segment_to_dict(segment) for segment in segments]
+
+        return {
+            "text": "".join(segment["text"] for segment in result_segments),
+            "segments": result_segments,
+            "language": info.language or "unknown",
+        }
+
+    def detect_language(self, audio) -> Tuple[str, float]:
+        # Language detection happens eagerly, decoding only starts when the
+        # returned segment generator is consumed, which we never do here
+        _, info = self.model.transcribe(audio, task="transcribe")
+        return info.language, float(info.language_probability)
+
+    @staticmethod
+    def _segment_to_dict(segment) -> Dict:
+        data = {
+            "id": segment.id,
+            "seek": segment.seek,
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text,
+            "tokens": list(segment.tokens),
+            "temperature": segment.temperature,
+            "avg_logprob": segment.avg_logprob,
+            "compression_ratio": segment.compression_ratio,
+            "no_speech_prob": segment.no_speech_prob,
+        }
+        if segment.words:
+            data["words"] = [
+                {
+                    "word": word.word,
+                    "start": word.start,
+                    "end": word.end,
+                    "probability": word.probability,
+                }
+                for word in segment.words
+            ]
+        return data
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def load_backend(name: str, model_name: str, **kwargs) -> TranscriptionBackend:
+    """Instantiate a transcription backend by its settings name"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown transcriber backend: {name}. Available: {', '.join(BACKENDS)}"
+        )
+    return backend_class(model_name, **kwargs)
@@ -1,9 +1,74 @@
-import yt_dlp
+import logging
 import os
+import shlex
 import zipfile
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from ..config import settings
+from .captions import parse_captions, select_caption_track
+from . import ytdlp_session
+from .video_info import remember_video_info
+from .media_profiles import audio_options, downloaded_path, ffmpeg_options
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ["mp3", "m4a", "opus", "ogg", "webm", "wav"]
+VIDEO_EXTENSIONS = ["mp4", "webm", "mkv", "avi"]
+
+
+def _retry_backoff(n: int) -> float:
+    """Exponential wait before retry n (from 0); yt-dlp passes n by keyword"""
+    return min(settings.YTDLP_RETRY_BACKOFF * 2 ** n, settings.YTDLP_RETRY_BACKOFF_MAX)
+
+
+def transfer_options() -> Dict:
+    """yt-dlp options controlling how media bytes are fetched"""
+    options = {
+        # DASH/HLS formats are split into fragments; fetch several at once
+        "concurrent_fragment_downloads": settings.YTDLP_CONCURRENT_FRAGMENTS,
+        "retries": settings.YTDLP_RETRIES,
+        "fragment_retries": settings.YTDLP_RETRIES,
+        "retry_sleep_functions": {"http": _retry_backoff, "fragment": _retry_backoff},
+    }
+    if settings.YTDLP_HTTP_CHUNK_SIZE:
+        # Ranged requests of this size sidestep per-connection throttling
+        options["http_chunk_size"] = settings.YTDLP_HTTP_CHUNK_SIZE
+    if settings.YTDLP_THROTTLED_RATE:
+        # Re-extract the URLs when YouTube throttles a stream below this
+        options["throttledratelimit"] = settings.YTDLP_THROTTLED_RATE
+    if settings.YTDLP_EXTERNAL_DOWNLOADER:
+        options["external_downloader"] = {"default": settings.YTDLP_EXTERNAL_DOWNLOADER}
+        if settings.YTDLP_EXTERNAL_DOWNLOADER_ARGS:
+            options["external_downloader_args"] = {
+                "default": shlex.split(settings.YTDLP_EXTERNAL_DOWNLOADER_ARGS)
+            }
+    return options
+
+
+class TransferStats:
+    """Bytes and transfer time of the files fetched by one downloader call"""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def hook(self, progress: Dict):
+        # yt-dlp progress hook; a merged video reports its video and audio
+        # streams as two finished files
+        if progress.get("status") != "finished":
+            return
+        self.files += 1
+        self.bytes += progress.get("total_bytes") or progress.get("downloaded_bytes") or 0
+        self.seconds += progress.get("elapsed") or 0
+
+    def as_dict(self) -> Dict:
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "bytes_per_second": int(self.bytes / self.seconds) if self.seconds else None,
+        }
 
 
 class YouTubeDownloader:
@@ -12,31 +77,121 @@ class YouTubeDownloader:
         self.video_output_path = os.path.join(settings.TEMP_AUDIO_PATH, "videos")
         os.makedirs(self.output_path, exist_ok=True)
         os.makedirs(self.video_output_path, exist_ok=True)
+        # Throughput of the last download call, reported in task status
+        self.transfer_stats = TransferStats()
+
+    def _download_options(self) -> Dict:
+        """Per-call yt-dlp options for media downloads; resets transfer_stats"""
+        self.transfer_stats = TransferStats()
+        return {
+            **transfer_options(),
+            **ffmpeg_options(),
+        }
 
     def extract_video_info(self, url: str) -> dict:
-        """Extract video information without downloading"""
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": False,
+        """Extract video information without downloading
+
+        Served from the process-wide extractor cache when the URL was seen
+        recently, which later downloads of the same URL reuse as well.
+        """
+        info = ytdlp_session.extract_info(url)
+
+        # Unprocessed results only list thumbnails, the last is the largest
+        thumbnails = info.get("thumbnails") or [{}]
+        video_info = {
+            "title": info.get("title", "Unknown"),
+            "duration": info.get("duration", 0),
+            "channel": info.get("channel", "Unknown"),
+            "video_id": info.get("id", "unknown"),
+            "thumbnail": info.get("thumbnail") or thumbnails[-1].get("url", ""),
+            "description": info.get("description", ""),
+            "upload_date": info.get("upload_date", ""),
+            "view_count": info.get("view_count", 0),
         }
+        remember_video_info(video_info)
+        return video_info
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-
-            return {
-                "title": info.get("title", "Unknown"),
-                "duration": info.get("duration", 0),
-                "channel": info.get("channel", "Unknown"),
-                "video_id": info.get("id", "unknown"),
-                "thumbnail": info.get("thumbnail", ""),
-                "description": info.get("description", ""),
-                "upload_date": info.get("upload_date", ""),
-                "view_count": info.get("view_count", 0),
-            }
+    def expand_collection(self, url: str, limit: int) -> List[Dict]:
+        """List the videos of a playlist or channel without resolving each one
+
+        Uses flat extraction, so thousands of entries cost a handful of page
+        requests instead of one metadata request per video. Channel URLs
+        without a tab expand into their tabs (videos, shorts, ...), which are
+        expanded one level further.
+        """
+        videos = []
+        seen = set()
+
+        with ytdlp_session.session(extract_flat="in_playlist", playlistend=limit) as ydl:
+            pending = [(url, 0)]
+            while pending and len(videos) < limit:
+                collection_url, depth = pending.pop(0)
+                info = ydl.extract_info(collection_url, download=False)
+
+                if info.get("_type") not in ("playlist", "multi_video"):
+                    # A single video URL, nothing to expand
+                    entries = [info]
+                else:
+                    entries = info.get("entries") or []
+
+                for entry in entries:
+                    if not entry:
+                        continue
+                    if entry.get("ie_key") == "YoutubeTab" or entry.get("_type") == "playlist":
+                        if depth < 1 and entry.get("url"):
+                            pending.append((entry["url"], depth + 1))
+                        continue
+
+                    video_id = entry.get("id")
+                    if not video_id or video_id in seen:
+                        continue
+                    seen.add(video_id)
+                    videos.append({
+                        "video_id": video_id,
+                        "url": f"https://www.youtube.com/watch?v={video_id}",
+                        "title": entry.get("title"),
+                        "duration": entry.get("duration"),
+                    })
+                    if len(videos) >= limit:
+                        break
 
-    def download_audio(self, url: str) -> str:
-        """Download audio from YouTube video and return the file path"""
+        return videos
+
+    def fetch_captions(self, url: str, languages: List[str] = None, allow_auto: bool = True) -> Optional[Dict]:
+        """Fetch an existing subtitle track instead of transcribing audio
+
+        Returns {"text", "segments", "language", "source"} or None when the
+        video has no acceptable caption track.
+        """
+        info = ytdlp_session.extract_info(url)
+        track = select_caption_track(info, languages or [], allow_auto)
+        if not track:
+            return None
+
+        # Same connection pool and cookies as the extraction
+        with ytdlp_session.session() as ydl:
+            content = ydl.urlopen(track["url"]).read().decode("utf-8")
+
+        segments = parse_captions(content, track["ext"])
+        if not segments:
+            return None
+
+        logger.info("Using %s (%s, %s) for %s", track["source"], track["language"], track["ext"], url)
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": track["language"],
+            "source": track["source"],
+        }
+
+    def download_audio(self, url: str, profile: str = None, output_dir: str = None) -> str:
+        """Download audio from YouTube video and return the file path
+
+        profile is one of media_profiles.AUDIO_PROFILES; None uses
+        AUDIO_DOWNLOAD_PROFILE. output_dir defaults to TEMP_AUDIO_PATH.
+        """
+        output_dir = output_dir or self.output_path
+        os.makedirs(output_dir, exist_ok=True)
         # Extract video info first to get video title
         info = self.extract_video_info(url)
         video_id = info["video_id"]
@@ -44,51 +199,36 @@ class YouTubeDownloader:
 
         # Set output filename using video title
         output_filename = f"{clean_title}_{video_id}.%(ext)s"
-        output_template = os.path.join(self.output_path, output_filename)
-
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }
-            ],
+        output_template = os.path.join(output_dir, output_filename)
+
+        options = {
+            **self._download_options(),
+            **audio_options(profile),
             "outtmpl": output_template,
-            "quiet": True,
-            "no_warnings": True,
-            "prefer_ffmpeg": True,
             "keepvideo": False,
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Download the audio
-                ydl.download([url])
-
-                # Get the actual output filename
-                # After conversion, the file will have .mp3 extension
-                audio_path = os.path.join(self.output_path, f"{clean_title}_{video_id}.mp3")
-
-                # Verify the file exists
-                if os.path.exists(audio_path):
-                    print(f"Audio downloaded successfully: {audio_path}")
-                    return audio_path
-                else:
-                    # Check for other possible extensions
-                    for ext in ["m4a", "webm", "opus", "wav"]:
-                        possible_path = os.path.join(
-                            self.output_path, f"{clean_title}_{video_id}.{ext}"
-                        )
-                        if os.path.exists(possible_path):
-                            print(f"Audio downloaded successfully: {possible_path}")
-                            return possible_path
+            # Download the audio from the cached info; the extension depends
+            # on the profile and the source stream
+            result = ytdlp_session.download(
+                url,
+                postprocessors=options.pop("postprocessors", None),
+                progress_hook=self.transfer_stats.hook,
+                **options,
+            )
 
-                    raise Exception(f"Downloaded file not found at expected location")
+            audio_path = downloaded_path(
+                result, output_dir, f"{clean_title}_{video_id}", AUDIO_EXTENSIONS
+            )
+            if audio_path:
+                logger.info("Audio downloaded successfully: %s", audio_path)
+                return audio_path
+
+            raise Exception(f"Downloaded file not found at expected location")
 
         except Exception as e:
-            print(f"Error downloading audio: {str(e)}")
+            logger.error("Error downloading audio: %s", e)
             raise Exception(f"Failed to download audio: {str(e)}")
 
     def download_video(self, url: str, quality: str = "best") -> str:
@@ -114,39 +254,38 @@ class YouTubeDownloader:
         else:
             format_string = "best[ext=mp4]/best"
 
-        ydl_opts = {
-            "format": format_string,
-            "outtmpl": output_template,
-            "quiet": True,
-            "no_warnings": True,
-            "prefer_ffmpeg": True,
-            "merge_output_format": "mp4",
-        }
+        options = self._download_options()
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Download the video
-                ydl.download([url])
-
-                # Find the downloaded file
-                for ext in ["mp4", "webm", "mkv", "avi"]:
-                    video_path = os.path.join(
-                        self.video_output_path, f"{clean_title}_{video_id}.{ext}"
-                    )
-                    if os.path.exists(video_path):
-                        print(f"Video downloaded successfully: {video_path}")
-                        return video_path
+            # Download the video from the cached info
+            result = ytdlp_session.download(
+                url,
+                progress_hook=self.transfer_stats.hook,
+                format=format_string,
+                outtmpl=output_template,
+                merge_output_format="mp4",
+                **options,
+            )
+
+            video_path = downloaded_path(
+                result, self.video_output_path, f"{clean_title}_{video_id}", VIDEO_EXTENSIONS
+            )
+            if video_path:
+                logger.info("Video downloaded successfully: %s", video_path)
+                return video_path
 
-                raise Exception("Downloaded video file not found")
+            raise Exception("Downloaded video file not found")
 
         except Exception as e:
-            print(f"Error downloading video: {str(e)}")
+            logger.error("Error downloading video: %s", e)
             raise Exception(f"Failed to download video: {str(e)}")
 
     def download_multiple_videos(self, urls: List[str], quality: str = "best") -> str:
         """Download multiple videos and return them as a zip file"""
         downloaded_files = []
         failed_downloads = []
+        # One throughput counter across the whole batch
+        download_options = self._download_options()
         
         # Create temporary directory for this batch
         batch_id = os.urandom(8).hex()
@@ -157,7 +296,7 @@ class YouTubeDownloader:
             # Download each video
             for i, url in enumerate(urls):
                 try:
-                    print(f"Downloading video {i+1}/{len(urls)}: {url}")
+                    logger.info("Downloading video %d/%d: %s", i + 1, len(urls), url)
                     
                     # Extract video info
                     info = self.extract_video_info(url)
@@ -178,34 +317,29 @@ class YouTubeDownloader:
                     else:
                         format_string = "best[ext=mp4]/best"
                     
-                    ydl_opts = {
-                        "format": format_string,
-                        "outtmpl": output_template,
-                        "quiet": True,
-                        "no_warnings": True,
-                        "prefer_ffmpeg": True,
-                        "merge_output_format": "mp4",
-                    }
-                    
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
+                    result = ytdlp_session.download(
+                        url,
+                        progress_hook=self.transfer_stats.hook,
+                        format=format_string,
+                        outtmpl=output_template,
+                        merge_output_format="mp4",
+                        **download_options,
+                    )
                     
                     # Find the downloaded file
-                    for ext in ["mp4", "webm", "mkv", "avi"]:
-                        video_path = os.path.join(
-                            batch_dir, f"{i+1:02d}_{clean_title}_{video_id}.{ext}"
-                        )
-                        if os.path.exists(video_path):
-                            downloaded_files.append({
-                                "path": video_path,
-                                "filename": os.path.basename(video_path),
-                                "url": url,
-                                "title": info["title"]
-                            })
-                            break
+                    video_path = downloaded_path(
+                        result, batch_dir, f"{i+1:02d}_{clean_title}_{video_id}", VIDEO_EXTENSIONS
+                    )
+                    if video_path:
+                        downloaded_files.append({
+                            "path": video_path,
+                            "filename": os.path.basename(video_path),
+                            "url": url,
+                            "title": info["title"]
+                        })
                     
                 except Exception as e:
-                    print(f"Failed to download {url}: {str(e)}")
+                    logger.warning("Failed to download %s: %s", url, e)
                     failed_downloads.append({
                         "url": url,
                         "error": str(e)
@@ -255,10 +389,12 @@ class YouTubeDownloader:
             
             raise Exception(f"Failed to create zip file: {str(e)}")
 
-    def download_multiple_audios(self, urls: List[str]) -> str:
+    def download_multiple_audios(self, urls: List[str], profile: str = None) -> str:
         """Download audio from multiple videos and return them as a zip file"""
         downloaded_files = []
         failed_downloads = []
+        # One throughput counter across the whole batch
+        download_options = self._download_options()
         
         # Create temporary directory for this batch
         batch_id = os.urandom(8).hex()
@@ -269,7 +405,7 @@ class YouTubeDownloader:
             # Download each audio
             for i, url in enumerate(urls):
                 try:
-                    print(f"Downloading audio {i+1}/{len(urls)}: {url}")
+                    logger.info("Downloading audio %d/%d: %s", i + 1, len(urls), url)
                     
                     # Extract video info
                     info = self.extract_video_info(url)
@@ -280,38 +416,34 @@ class YouTubeDownloader:
                     output_filename = f"{i+1:02d}_{clean_title}_{video_id}.%(ext)s"
                     output_template = os.path.join(batch_dir, output_filename)
                     
-                    ydl_opts = {
-                        "format": "bestaudio/best",
+                    options = {
+                        **download_options,
+                        **audio_options(profile),
                         "outtmpl": output_template,
-                        "quiet": True,
-                        "no_warnings": True,
-                        "prefer_ffmpeg": True,
-                        "postprocessors": [
-                            {
-                                "key": "FFmpegExtractAudio",
-                                "preferredcodec": "mp3",
-                                "preferredquality": "192",
-                            }
-                        ],
                     }
                     
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
+                    result = ytdlp_session.download(
+                        url,
+                        postprocessors=options.pop("postprocessors", None),
+                        progress_hook=self.transfer_stats.hook,
+                        **options,
+                    )
                     
                     # Find the downloaded audio file
-                    audio_filename = f"{clean_title}.mp3"
-                    audio_path = os.path.join(batch_dir, f"{i+1:02d}_{clean_title}_{video_id}.mp3")
+                    audio_path = downloaded_path(
+                        result, batch_dir, f"{i+1:02d}_{clean_title}_{video_id}", AUDIO_EXTENSIONS
+                    )
                     
-                    if os.path.exists(audio_path):
+                    if audio_path:
                         downloaded_files.append({
                             "path": audio_path,
-                            "filename": audio_filename,
+                            "filename": clean_title + os.path.splitext(audio_path)[1],
                             "url": url,
                             "title": info["title"]
                         })
                     
                 except Exception as e:
-                    print(f"Failed to download audio from {url}: {str(e)}")
+                    logger.warning("Failed to download audio from %s: %s", url, e)
                     failed_downloads.append({
                         "url": url,
                         "error": str(e)
@@ -414,6 +546,6 @@ class YouTubeDownloader:
                 if file_age > (hours * 3600):
                     try:
                         os.remove(file_path)
-                        print(f"Deleted old file: {filename}")
+                        logger.debug("Deleted old file: %s", filename)
                     except:
                         pass
\ No newline at end of file
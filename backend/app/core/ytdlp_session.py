@@ -0,0 +1,174 @@
+"""
+Reusable yt-dlp instances and extractor result cache
+
+Building a YoutubeDL sets up every extractor and a fresh HTTP stack, and
+every extract_info call downloads the watch page and player again. Here
+each thread keeps its YoutubeDL instances (one per post-processor chain)
+alive across calls, so extractor state, cookies and keep-alive connections
+stay warm, and options that differ per call (format, output template,
+transfer tuning) are swapped into the instance's params for one call.
+
+Raw extractor results are cached per process, so a download following an
+info lookup of the same URL only resolves formats and fetches the media.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from ..config import settings
+from .url_utils import normalize_video_url
+
+logger = logging.getLogger(__name__)
+
+BASE_OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+}
+
+_local = threading.local()
+_info_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_info_lock = threading.Lock()
+
+
+def _dispatch_progress(progress: Dict):
+    # Instances are long-lived, so their single hook forwards to the
+    # caller's hook for the current call
+    hook = getattr(_local, "progress_hook", None)
+    if hook is not None:
+        hook(progress)
+
+
+def _instance(postprocessors: List[Dict]):
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    key = json.dumps(postprocessors, sort_keys=True)
+    ydl = pool.get(key)
+    if ydl is None:
+        # yt-dlp is only imported once it is needed
+        import yt_dlp
+
+        ydl = pool[key] = yt_dlp.YoutubeDL({
+            **BASE_OPTIONS,
+            "postprocessors": postprocessors,
+            "progress_hooks": [_dispatch_progress],
+        })
+    return ydl
+
+
+@contextmanager
+def session(postprocessors: List[Dict] = None, progress_hook: Callable = None, **overrides):
+    """This thread's YoutubeDL for a post-processor chain, with per-call options
+
+    Options are restored when the block exits. Post-processors and progress
+    hooks are bound when an instance is built, hence their own arguments;
+    a `format` override recompiles the instance's format selector.
+    """
+    ydl = _instance(postprocessors or [])
+    if "outtmpl" in overrides:
+        # YoutubeDL keeps output templates per file type
+        overrides["outtmpl"] = {**ydl.params["outtmpl"], "default": overrides["outtmpl"]}
+
+    saved = {name: ydl.params[name] for name in overrides if name in ydl.params}
+    saved_selector = ydl.format_selector
+    try:
+        # Inside the try, so a bad override never sticks to the pooled instance
+        ydl.params.update(overrides)
+        if "format" in overrides:
+            # YoutubeDL compiles the format spec once, when it is built
+            ydl.format_selector = ydl.build_format_selector(overrides["format"])
+        _local.progress_hook = progress_hook
+        yield ydl
+    finally:
+        _local.progress_hook = None
+        ydl.format_selector = saved_selector
+        for name in overrides:
+            if name in saved:
+                ydl.params[name] = saved[name]
+            else:
+                ydl.params.pop(name, None)
+
+
+def _cache_key(url: str) -> str:
+    # Every URL shape of one video shares its entry
+    return normalize_video_url(url) or url
+
+
+def cached_info(url: str) -> Optional[Dict]:
+    """Copy of the cached extractor result for a URL, if still fresh"""
+    from .metrics import record_cache
+
+    key = _cache_key(url)
+    with _info_lock:
+        entry = _info_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            _info_cache.move_to_end(key)
+            info = entry[1]
+        else:
+            info = None
+    record_cache("ytdlp_info", hit=info is not None)
+    # Processing adds download state to the dict, never hand out the original
+    return copy.deepcopy(info) if info is not None else None
+
+
+def extract_info(url: str, fresh: bool = False) -> Dict:
+    """Raw (unprocessed) extractor result for a URL, cached per process
+
+    Formats are resolved later by download(), so one result serves metadata,
+    captions and downloads in any format. fresh=True skips the cache, for
+    when cached stream URLs have expired.
+    """
+    if not fresh:
+        info = cached_info(url)
+        if info is not None:
+            return info
+
+    with session() as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+        if info.get("_type") in ("url", "url_transparent"):
+            # Short links and embeds point at the actual video page
+            info = ydl.extract_info(info["url"], ie_key=info.get("ie_key"), download=False, process=False)
+
+    if settings.YTDLP_INFO_CACHE_TTL > 0:
+        key = _cache_key(url)
+        with _info_lock:
+            _info_cache[key] = (time.monotonic() + settings.YTDLP_INFO_CACHE_TTL, info)
+            _info_cache.move_to_end(key)
+            while len(_info_cache) > settings.YTDLP_INFO_CACHE_SIZE:
+                _info_cache.popitem(last=False)
+    return copy.deepcopy(info)
+
+
+def forget_info(url: str):
+    with _info_lock:
+        _info_cache.pop(_cache_key(url), None)
+
+
+def download(
+    url: str,
+    postprocessors: List[Dict] = None,
+    progress_hook: Callable = None,
+    **overrides,
+) -> Dict:
+    """Download a URL from its cached extractor result; returns the processed info
+
+    Stream URLs in a cached result can expire or get rejected, so a failed
+    download from the cache is retried once from a fresh extraction.
+    """
+    info = cached_info(url)
+    if info is not None:
+        try:
+            with session(postprocessors, progress_hook, **overrides) as ydl:
+                return ydl.process_ie_result(info, download=True)
+        except Exception as e:
+            logger.info("Download from cached info failed for %s, extracting again: %s", url, e)
+
+    info = extract_info(url, fresh=True)
+    with session(postprocessors, progress_hook, **overrides) as ydl:
+        return ydl.process_ie_result(info, download=True)
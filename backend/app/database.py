@@ -1,16 +1,44 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Columns added to existing tables after their first release. create_all
+# only creates missing tables, so upgrade_schema adds these to databases
+# created before them. All of them are nullable without a default.
+ADDED_COLUMNS = {
+    "scripts": ["transcript_source", "transcript_language", "transcribed_until"],
+}
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def upgrade_schema(bind=engine):
+    """Create missing tables and add missing ADDED_COLUMNS; safe to run repeatedly"""
+    from . import models  # noqa: F401 - registers the tables on Base
+
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table_name, column_names in ADDED_COLUMNS.items():
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+            for name in column_names:
+                if name in existing:
+                    continue
+                column_type = table.columns[name].type.compile(dialect=bind.dialect)
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+                logger.info("Added column %s.%s", table_name, name)
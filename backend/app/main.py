@@ -1,14 +1,15 @@
-import os
+import asyncio
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from .config import settings
-from .database import engine, Base
-from .api.endpoints import transcription, scripts, contact, download
+from .config import settings, ensure_directories
+from .database import upgrade_schema
+from .api.endpoints import transcription, scripts, contact, download, admin
+from .api.metrics import MetricsMiddleware, monitor_event_loop_lag, router as metrics_router
+from .core.log import configure_logging
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+configure_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -26,13 +27,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-if os.path.exists(settings.GENERATED_SCRIPTS_PATH):
-    app.mount(
-        "/scripts",
-        StaticFiles(directory=settings.GENERATED_SCRIPTS_PATH),
-        name="scripts",
-    )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+_background_tasks = []
+
+@app.on_event("startup")
+def on_startup():
+    ensure_directories()
+
+    # Create database tables and add columns older databases lack
+    if settings.CREATE_TABLES_ON_STARTUP:
+        upgrade_schema()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if settings.METRICS_ENABLED:
+        _background_tasks.append(asyncio.create_task(monitor_event_loop_lag()))
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in _background_tasks:
+        task.cancel()
+
+# Mount static files; the directory is created on startup
+app.mount(
+    "/scripts",
+    StaticFiles(directory=settings.GENERATED_SCRIPTS_PATH, check_dir=False),
+    name="scripts",
+)
 
 # Include routers
 app.include_router(
@@ -59,6 +83,13 @@ app.include_router(
     tags=["download"]
 )
 
+app.include_router(
+    admin.router,
+    prefix=f"{settings.API_V1_STR}/admin",
+    tags=["admin"],
+    include_in_schema=False,
+)
+
 @app.get("/")
 def root():
     return {
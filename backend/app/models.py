@@ -1,7 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, ForeignKey, Index
+from sqlalchemy.sql import func, literal_column
 from .database import Base
 
+# Postgres text search configuration used for the segment index. "simple" avoids
+# language-specific stemming since transcripts can be in any language.
+SEARCH_TEXT_CONFIG = literal_column("'simple'")
+
+def segment_search_vector(column):
+    """tsvector expression shared by the GIN index and search queries"""
+    return func.to_tsvector(SEARCH_TEXT_CONFIG, column)
+
 class Script(Base):
     __tablename__ = "scripts"
     
@@ -12,7 +20,29 @@ class Script(Base):
     status = Column(String, default="pending")
     transcript_text = Column(Text)
     formatted_script = Column(JSON)  # Stores list of timestamp-text pairs
+    transcript_source = Column(String)  # whisper, captions_manual, captions_auto
+    transcript_language = Column(String)
+    transcribed_until = Column(Float)  # Checkpoint: seconds of audio already transcribed
     error_message = Column(Text)
     file_path = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    completed_at = Column(DateTime(timezone=True))
\ No newline at end of file
+    completed_at = Column(DateTime(timezone=True))
+
+class ScriptSegment(Base):
+    __tablename__ = "script_segments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    script_id = Column(Integer, ForeignKey("scripts.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    start_seconds = Column(Float, nullable=False)
+    end_seconds = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        # Full-text index, only created on Postgres
+        Index(
+            "ix_script_segments_text_search",
+            segment_search_vector(text),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -5,6 +5,9 @@ from datetime import datetime
 # Script related schemas
 class ScriptCreate(BaseModel):
     video_url: HttpUrl
+    word_timestamps: Optional[bool] = None  # None uses the server default
+    captions_first: Optional[bool] = None  # None uses the server default
+    profile: Optional[bool] = None  # Profile this job, needs X-Admin-Key
     
 class ScriptBase(BaseModel):
     id: int
@@ -12,6 +15,7 @@ class ScriptBase(BaseModel):
     video_title: Optional[str]
     video_duration: Optional[int]
     status: str
+    transcript_source: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime]
     
@@ -26,6 +30,30 @@ class ScriptWithContent(ScriptBase):
     class Config:
         from_attributes = True
 
+class BulkTranscriptionRequest(BaseModel):
+    url: HttpUrl  # Playlist or channel URL
+    max_videos: Optional[int] = None  # Capped by BULK_MAX_VIDEOS
+    word_timestamps: Optional[bool] = None
+    captions_first: Optional[bool] = None
+
+class BulkJobStatus(BaseModel):
+    job_id: str
+    source_url: Optional[str] = None
+    status: str  # expanding, running, completed, failed
+    total: int
+    dispatched: int
+    completed: int
+    failed: int
+    progress: int
+    error: Optional[str] = None
+
+class SegmentSearchHit(BaseModel):
+    script_id: int
+    video_title: Optional[str]
+    start_seconds: float
+    end_seconds: float
+    snippet: str
+
 # Processing status schema
 class ProcessingStatus(BaseModel):
     task_id: str
@@ -33,6 +61,11 @@ class ProcessingStatus(BaseModel):
     progress: int
     message: str
     script_id: Optional[int] = None
+    eta_seconds: Optional[int] = None
+    transfer: Optional[Dict[str, Any]] = None  # Download throughput once the audio is fetched
+
+class BulkStatusRequest(BaseModel):
+    task_ids: List[str]
 
 class VideoDownloadRequest(BaseModel):
     url: HttpUrl
@@ -59,6 +92,8 @@ class ScriptVideoDownloadRequest(BaseModel):
 
 class AudioDownloadRequest(BaseModel):
     url: HttpUrl
+    profile: Optional[str] = None  # See media_profiles.AUDIO_PROFILES, None uses the server default
 
 class MultipleAudioDownloadRequest(BaseModel):
-    urls: List[HttpUrl]
\ No newline at end of file
+    urls: List[HttpUrl]
+    profile: Optional[str] = None
\ No newline at end of file
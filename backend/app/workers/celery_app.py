@@ -22,4 +22,20 @@ celery_app.conf.update(
     timezone='UTC',
     enable_utc=True,
     imports=['app.workers.tasks'],  # Important!
-)
\ No newline at end of file
+    # Priority support on the Redis broker: 10 levels, 0 is served first.
+    # Prefetching a single message keeps a worker from hoarding low-priority
+    # jobs while higher-priority ones arrive.
+    broker_transport_options={
+        'priority_steps': list(range(10)),
+        'sep': ':',
+        'queue_order_strategy': 'priority',
+        # Long transcriptions are acknowledged late; keep Redis from
+        # redelivering them while they are still running
+        'visibility_timeout': settings.CELERY_VISIBILITY_TIMEOUT,
+    },
+    task_default_priority=0,
+    worker_prefetch_multiplier=1,
+)
+
+# Registers the worker layout and metrics signal handlers
+from . import concurrency, monitoring  # noqa: E402,F401
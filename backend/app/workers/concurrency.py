@@ -0,0 +1,282 @@
+# backend/app/workers/concurrency.py
+"""
+Worker CPU layout for Whisper
+
+Prefork children each run PyTorch/OpenMP with their own intra-op thread
+pool, so the default of one child per core, each using every core, leaves
+the CPU heavily oversubscribed. The plan here splits the cores into
+children x threads-per-child, pins every child to its own cores and caps
+its thread pools to match.
+
+Under the threads pool there is a single process: one shared model, one
+transcription at a time (see get_transcriber), all cores for its threads.
+
+Run `python -m app.workers.concurrency --calibrate` to measure and store the
+thread count for this node; workers started afterwards pick it up.
+
+With WORKER_PRELOAD_MODEL the parent loads the model before forking, so all
+prefork children share its weights copy-on-write instead of each holding a
+copy. Children only read the weights, so the pages stay shared.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import socket
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from celery.signals import celeryd_init, worker_init, worker_process_init
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_KEY = "worker_calibration:{node}"
+CALIBRATION_TTL = 30 * 24 * 3600
+CALIBRATION_MIN_EFFICIENCY = 0.7  # Speedup per added thread worth giving a child
+
+
+@dataclass
+class WorkerPlan:
+    processes: int
+    threads_per_process: int
+    cpus: List[int]
+    source: str  # settings, calibration or default
+
+
+_plan: Optional[WorkerPlan] = None
+_forking_pool = True
+_preloaded_threads: Optional[int] = None  # Parent's torch threads before a preload
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on, honouring container/cgroup affinity"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def calibrate_threads(max_threads: int, size: int = 768, repeats: int = 5) -> int:
+    """Largest thread count whose parallel efficiency stays acceptable
+
+    Times a matrix multiply, the operation Whisper spends most of its time
+    in, at 1, 2, 4, ... threads.
+    """
+    import torch
+
+    a = torch.randn(size, size)
+    b = torch.randn(size, size)
+    original_threads = torch.get_num_threads()
+
+    def throughput(threads: int) -> float:
+        torch.set_num_threads(threads)
+        torch.mm(a, b)  # warm up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            torch.mm(a, b)
+        return repeats / (time.perf_counter() - start)
+
+    try:
+        baseline = throughput(1)
+        best = 1
+        threads = 2
+        while threads <= max_threads:
+            efficiency = throughput(threads) / (baseline * threads)
+            print(f"Calibration: {threads} threads, efficiency {efficiency:.2f}")
+            if efficiency < CALIBRATION_MIN_EFFICIENCY:
+                break
+            best = threads
+            threads *= 2
+        return best
+    finally:
+        torch.set_num_threads(original_threads)
+
+
+def _calibration_key() -> str:
+    return CALIBRATION_KEY.format(node=socket.gethostname())
+
+
+def load_calibration() -> Optional[int]:
+    from ..core.redis_client import get_redis_client
+
+    try:
+        value = get_redis_client().get(_calibration_key())
+    except Exception as e:
+        logger.warning("Could not read worker calibration: %s", e)
+        return None
+    return int(value) if value else None
+
+
+def save_calibration(threads: int):
+    from ..core.redis_client import get_redis_client
+
+    get_redis_client().set(_calibration_key(), threads, ex=CALIBRATION_TTL)
+
+
+def plan_workers(cpus: List[int] = None) -> WorkerPlan:
+    """Split the available cores into prefork children and threads per child"""
+    cpus = cpus or available_cpus()
+
+    if settings.WORKER_THREADS_PER_PROCESS:
+        threads, source = settings.WORKER_THREADS_PER_PROCESS, "settings"
+    else:
+        calibrated = load_calibration()
+        if calibrated:
+            threads, source = calibrated, "calibration"
+        else:
+            # Whisper's GEMMs scale well up to about 4 threads on typical CPUs
+            threads, source = 4, "default"
+    threads = max(1, min(threads, len(cpus)))
+
+    processes = settings.WORKER_PROCESSES or max(1, len(cpus) // threads)
+    return WorkerPlan(processes=processes, threads_per_process=threads, cpus=cpus, source=source)
+
+
+def limit_threads(threads: int):
+    """Cap the intra-op thread pools of this process"""
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = str(threads)
+    # faster-whisper takes its thread count when the model is loaded
+    settings.WHISPER_CPU_THREADS = threads
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+@contextmanager
+def borrow_cores(cpus: List[int], threads: int):
+    """Run this process on `cpus` with `threads` torch threads, then restore
+
+    The short clip batch leader (see app/core/clip_batcher.py) takes over the
+    cores of the children whose clips it transcribes while they block on the
+    result, instead of running the whole batch on its own pinned cores.
+    """
+    try:
+        import torch
+    except ImportError:
+        torch = None
+    own_cpus = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    own_threads = torch.get_num_threads() if torch else None
+
+    cpus = set(cpus) | (own_cpus or set())
+    threads = max(1, min(threads, len(cpus)))
+    if own_cpus is not None and cpus != own_cpus:
+        os.sched_setaffinity(0, cpus)
+    if torch and threads > own_threads:
+        torch.set_num_threads(threads)
+    try:
+        yield
+    finally:
+        if own_cpus is not None and cpus != own_cpus:
+            os.sched_setaffinity(0, own_cpus)
+        if torch and threads > own_threads:
+            torch.set_num_threads(own_threads)
+
+
+def _pool_name(conf, options) -> str:
+    return str(options.get("pool_cls") or conf.worker_pool).lower()
+
+
+@celeryd_init.connect
+def configure_worker(sender=None, conf=None, options=None, **kwargs):
+    """Pick the worker concurrency before the pool is created"""
+    global _plan, _forking_pool
+    options = options or {}
+    pool = _pool_name(conf, options)
+    _forking_pool = "prefork" in pool
+    if not settings.WORKER_AUTO_CONCURRENCY:
+        return
+
+    cpus = available_cpus()
+    if "thread" in pool:
+        # One process shares one model; give its thread pools every core
+        limit_threads(len(cpus))
+        logger.info("Worker layout: threads pool, %d torch threads", len(cpus))
+        return
+
+    _plan = plan_workers(cpus)
+    if options.get("concurrency"):
+        # An explicit -c wins, split the cores among that many children
+        _plan.processes = options["concurrency"]
+        _plan.threads_per_process = max(1, len(cpus) // _plan.processes)
+    else:
+        conf.worker_concurrency = _plan.processes
+    logger.info(
+        "Worker layout: %d processes x %d threads on %d CPUs (%s)",
+        _plan.processes, _plan.threads_per_process, len(cpus), _plan.source,
+    )
+
+
+@worker_init.connect
+def preload_model(sender=None, **kwargs):
+    """Load the model in the parent so prefork children share its weights"""
+    global _preloaded_threads
+    if not settings.WORKER_PRELOAD_MODEL:
+        return
+    if _forking_pool and settings.TRANSCRIBER_BACKEND != "openai-whisper":
+        # CTranslate2 keeps native thread pools that do not survive a fork
+        logger.warning("Model preloading is not supported for %s under prefork", settings.TRANSCRIBER_BACKEND)
+        return
+
+    from ..core.transcriber import get_transcriber
+
+    if _forking_pool:
+        # Load single-threaded so no OpenMP thread team exists at fork time
+        import torch
+
+        _preloaded_threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+
+    get_transcriber()
+    # Move everything allocated so far out of the collector's reach; the GC
+    # would otherwise write to these objects in every child and unshare them
+    gc.freeze()
+    logger.info("Whisper model preloaded in the worker parent")
+
+
+@worker_process_init.connect
+def configure_child(**kwargs):
+    """Give each prefork child its thread budget and its own cores"""
+    if _plan is None:
+        if _preloaded_threads:
+            limit_threads(_preloaded_threads)
+        return
+    from billiard.process import current_process
+
+    threads = _plan.threads_per_process
+    limit_threads(threads)
+
+    index = current_process().index
+    if settings.WORKER_PIN_CPUS and index is not None and hasattr(os, "sched_setaffinity"):
+        start = (index * threads) % len(_plan.cpus)
+        cores = _plan.cpus[start:start + threads]
+        if len(cores) == threads:
+            os.sched_setaffinity(0, cores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calibrate", action="store_true", help="Measure thread scaling and store the result")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        try:
+            threads = calibrate_threads(len(available_cpus()))
+        except ImportError:
+            print("PyTorch is not installed, skipping calibration")
+        else:
+            save_calibration(threads)
+            print(f"Stored calibration for {socket.gethostname()}: {threads} threads per process")
+
+    print(json.dumps(asdict(plan_workers()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
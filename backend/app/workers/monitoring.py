@@ -0,0 +1,94 @@
+import logging
+import time
+
+from celery.signals import (
+    setup_logging,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+)
+
+from ..config import settings
+from ..core.log import bind_context, clear_context, configure_logging
+from ..core.metrics import TASK_SECONDS, metrics_registry, multiprocess_enabled
+
+logger = logging.getLogger(__name__)
+
+# Start times of the tasks running in this process, by task ID
+_task_starts = {}
+
+
+@setup_logging.connect
+def setup_worker_logging(**kwargs):
+    """Use the app's queued logging instead of Celery's own handlers"""
+    configure_logging()
+
+
+@worker_process_init.connect
+def setup_child_logging(**kwargs):
+    # The parent's listener thread did not survive the fork
+    configure_logging()
+
+
+@task_prerun.connect
+def task_started(task_id=None, **kwargs):
+    bind_context(task_id=task_id)
+    _task_starts[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    start = _task_starts.pop(task_id, None)
+    if start is not None and task is not None:
+        TASK_SECONDS.labels(task=task.name, state=state or "UNKNOWN").observe(
+            time.perf_counter() - start
+        )
+    clear_context()
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Serve the metrics of all pool processes from the worker parent
+
+    Prefork children write to PROMETHEUS_MULTIPROC_DIR, which the parent
+    aggregates on every scrape.
+    """
+    if not settings.METRICS_ENABLED or not settings.WORKER_METRICS_PORT:
+        return
+    from prometheus_client import start_http_server
+
+    start_http_server(settings.WORKER_METRICS_PORT, registry=metrics_registry())
+    logger.info("Worker metrics exported on port %d", settings.WORKER_METRICS_PORT)
+
+
+@worker_ready.connect
+def sweep_stale_audio(**kwargs):
+    """Clear audio left behind by tasks that died with an earlier worker"""
+    from ..core.checkpoints import sweep_audio_dirs
+
+    try:
+        sweep_audio_dirs()
+    except Exception as e:
+        logger.warning("Audio sweep failed: %s", e)
+
+
+@worker_ready.connect
+def sweep_expired_artifacts(**kwargs):
+    """Delete downloads whose retention ran out while no worker was storing"""
+    from ..core.storage import sweep_artifacts
+
+    try:
+        sweep_artifacts()
+    except Exception as e:
+        logger.warning("Artifact sweep failed: %s", e)
+
+
+@worker_process_shutdown.connect
+def discard_process_metrics(pid=None, **kwargs):
+    if multiprocess_enabled() and pid:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
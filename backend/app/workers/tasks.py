@@ -1,29 +1,157 @@
+import logging
 import os
-import traceback
+import shutil
+import time
 import json
 
+from celery import Task
+
 from .celery_app import celery_app
+from ..core.profiling import profile_task, should_profile
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _resolve_language(transcriber, redis_client, audio_path: str, video_id: str) -> Optional[str]:
+    """Language to pin decoding to, detected once per video and cached in Redis"""
+    from ..config import settings
+    from ..core.metrics import record_cache
+
+    if not settings.LANGUAGE_DETECTION:
+        return None
 
-@celery_app.task(bind=True, name="process_youtube_video")
-def process_youtube_video(self, script_id: int, video_url: str):
-    """Main task to process YouTube video - No user authentication"""
+    # extract_video_info reports "unknown" when the extractor gave no ID;
+    # such videos must not share one cache entry
+    cacheable = bool(video_id) and video_id != "unknown"
+    cache_key = f"video_language:{video_id}"
+    cached = redis_client.get(cache_key) if cacheable else None
+    record_cache("video_language", hit=bool(cached))
+    if cached:
+        return cached
+
+    try:
+        language, probability = transcriber.detect_language(audio_path)
+    except Exception as e:
+        logger.warning("Language detection failed, falling back to auto-detect: %s", e)
+        return None
+
+    if probability < settings.LANGUAGE_MIN_PROBABILITY:
+        return None
+
+    if cacheable:
+        redis_client.set(cache_key, language, ex=settings.LANGUAGE_CACHE_TTL)
+    return language
+
+class NonRetryableError(Exception):
+    """Failure that retrying the task cannot fix"""
+
+
+def _transcribe_checkpointed(transcriber, db, script, audio_path: str, word_timestamps: bool,
+                             language: Optional[str], update_task_status) -> dict:
+    """Transcribe window by window, saving each window before starting the next
+
+    Resumes after the last saved window when the script has a checkpoint.
+    """
+    from ..core import checkpoints
+    from ..core.transcriber import PROMPT_CHARS
+
+    segments, offset = checkpoints.load_checkpoint(db, script)
+    if offset:
+        logger.info("Resuming script %s from %.1fs", script.id, offset)
+
+    duration = script.video_duration or 0
+    prompt = "".join(segment["text"] for segment in segments)[-PROMPT_CHARS:] or None
+    for window_segments, next_offset, language in transcriber.transcribe_audio_windows(
+        audio_path, start=offset, word_timestamps=word_timestamps, language=language, prompt=prompt
+    ):
+        checkpoints.save_window(db, script, window_segments, next_offset, language)
+        segments.extend(window_segments)
+
+        if next_offset is not None and duration:
+            percent = min(int(next_offset * 100 / duration), 99)
+            update_task_status(50 + percent * 30 // 100, {
+                "message_key": "celery.transcription.generating_transcript",
+                "message_fallback": f"Transcribing audio using AI ({percent}%)..."
+            })
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language or script.transcript_language,
+    }
+
+
+class ProfiledTask(Task):
+    """Task base that profiles runs on request or by PROFILE_SAMPLE_RATE
+
+    The request travels in a `profile` message header
+    (apply_async(headers={"profile": True})), so the task keeps its own
+    signature. True forces profiling, False disables it and a missing
+    header falls back to the sample rate. Retries keep the header.
+    """
+
+    def __call__(self, *args, **kwargs):
+        if not should_profile((self.request.headers or {}).get("profile")):
+            return super().__call__(*args, **kwargs)
+        with profile_task(self.request.id, self.name):
+            return super().__call__(*args, **kwargs)
+
+@celery_app.task(
+    bind=True,
+    base=ProfiledTask,
+    name="process_youtube_video",
+    # Redeliver to another worker if this one dies mid-transcription
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def process_youtube_video(
+    self,
+    script_id: int,
+    video_url: str,
+    word_timestamps: bool = None,
+    captions_first: bool = None,
+    bulk_job_id: str = None,
+    scheduling: dict = None,
+):
+    """Main task to process YouTube video - No user authentication
+
+    Safe to run more than once for the same script: completed scripts are
+    returned as they are, and long videos resume from their last checkpoint.
+    Profiled when sent with a `profile` header (see ProfiledTask).
+    """
 
     # Import here to avoid circular imports
     from ..database import SessionLocal
     from ..models import Script
     from ..core.youtube_downloader import YouTubeDownloader
-    from ..core.transcriber import WhisperTranscriber
+    from ..core.transcriber import WhisperTranscriber, get_transcriber
     from ..core.formatter import ScriptFormatter
     from ..core.redis_client import get_redis_client
-
+    from ..core.search import index_script_segments
+    from ..core.clip_batcher import ShortClipBatcher
+    from ..core.bulk_jobs import record_bulk_result
+    from ..core.scheduling import record_queue_wait, release_schedule
+    from ..core import admission, checkpoints
+    from ..core.metrics import (
+        DOWNLOADED_BYTES, TRANSCRIBED_AUDIO_SECONDS, record_cache, stage_timer,
+    )
+    from ..core.log import bind_context
+    from ..config import settings
+
+    bind_context(script_id=script_id)
+    # Resolved once, so clip batching and the transcriber agree on it
+    word_timestamps = settings.WHISPER_WORD_TIMESTAMPS if word_timestamps is None else word_timestamps
     db = SessionLocal()
     downloader = YouTubeDownloader()
-    transcriber = WhisperTranscriber()
     formatter = ScriptFormatter()
     audio_path = None
+    script = None
+    video_id = None
+    retrying = False
     redis_client = get_redis_client()
+    # Kept in every later status update, e.g. the download throughput
+    sticky_status = {}
 
     # Store task progress in Redis
     def update_task_status(progress, status, extra_data=None):
@@ -42,6 +170,7 @@ def process_youtube_video(self, script_id: int, video_url: str):
             "status": status_data,
             "state": "PROGRESS" if progress < 100 else "SUCCESS",
             "timestamp": datetime.utcnow().isoformat(),
+            **sticky_status,
         }
         if extra_data:
             task_data.update(extra_data)
@@ -61,7 +190,13 @@ def process_youtube_video(self, script_id: int, video_url: str):
         )
 
     try:
-        print(f"Starting to process video: {video_url}")
+        queue_wait = record_queue_wait(scheduling) if not self.request.retries else None
+        if queue_wait is not None:
+            logger.info(
+                "Script %s waited %.1fs in the %s queue", script_id, queue_wait, scheduling["job_class"]
+            )
+
+        logger.info("Starting to process video: %s", video_url)
 
         # Update task state - Extracting info
         update_task_status(10, {
@@ -70,57 +205,165 @@ def process_youtube_video(self, script_id: int, video_url: str):
         })
 
         # Get script record
-        script = db.query(Script).filter(Script.id == script_id).first()
+        with stage_timer("db_read"):
+            script = db.query(Script).filter(Script.id == script_id).first()
         if not script:
-            raise Exception(f"Script with ID {script_id} not found")
+            raise NonRetryableError(f"Script with ID {script_id} not found")
+
+        if script.status == "completed":
+            # Redelivered after the work was already done
+            logger.info("Script %s already completed, skipping", script_id)
+            update_task_status(100, {
+                "message_key": "celery.transcription.completed",
+                "message_fallback": "Transcription completed!"
+            }, {"state": "SUCCESS"})
+            if bulk_job_id:
+                record_bulk_result(bulk_job_id, script_id, success=True)
+            return {
+                "script_id": script_id,
+                "status": "completed",
+                "message": "Video processed successfully",
+            }
 
         # Update script status
         script.status = "processing"
         db.commit()
 
         # Extract video info
-        update_task_status(20, {
-            "message_key": "celery.transcription.extracting_audio",
-            "message_fallback": "Downloading audio from video..."
-        })
-        video_info = downloader.extract_video_info(video_url)
+        with stage_timer("info"):
+            video_info = downloader.extract_video_info(video_url)
 
         # Update script with video info
         script.video_title = video_info.get("title")
         script.video_duration = video_info.get("duration")
-        db.commit()
-
-        # Download audio
-        audio_path = downloader.download_audio(video_url)
-
-        # Ensure audio_path is a string, not a tuple
-        if isinstance(audio_path, tuple):
-            audio_path = audio_path[0]
-
-        print(f"Audio downloaded to: {audio_path}")
-
-        # Transcribe audio
-        update_task_status(50, {
-            "message_key": "celery.transcription.generating_transcript",
-            "message_fallback": "Transcribing audio using AI..."
-        })
-        transcript_data = transcriber.transcribe_audio(audio_path)
+        with stage_timer("db_commit"):
+            db.commit()
+        video_id = video_info.get("video_id")
+
+        if (script.video_duration or 0) > settings.MAX_VIDEO_DURATION:
+            raise NonRetryableError(
+                f"Video is longer than the maximum of {settings.MAX_VIDEO_DURATION} seconds"
+            )
+
+        transcript_data = None
+        transcript_source = "whisper"
+
+        # Try existing YouTube captions before spending CPU on Whisper
+        use_captions = settings.CAPTIONS_FIRST if captions_first is None else captions_first
+        if use_captions:
+            update_task_status(20, {
+                "message_key": "celery.transcription.fetching_captions",
+                "message_fallback": "Checking for existing captions..."
+            })
+            try:
+                with stage_timer("captions"):
+                    captions = downloader.fetch_captions(
+                        video_url, settings.CAPTIONS_LANGUAGES, settings.CAPTIONS_ALLOW_AUTO
+                    )
+            except Exception as e:
+                logger.warning("Caption lookup failed, falling back to Whisper: %s", e)
+                captions = None
+
+            if captions:
+                transcript_source = captions.pop("source")
+                transcript_data = captions
+                TRANSCRIBED_AUDIO_SECONDS.labels(source=transcript_source).inc(
+                    script.video_duration or 0
+                )
+
+        if transcript_data is None:
+            # Download audio
+            update_task_status(30, {
+                "message_key": "celery.transcription.extracting_audio",
+                "message_fallback": "Downloading audio from video..."
+            })
+            audio_path = checkpoints.retained_audio(script_id)
+            record_cache("retained_audio", hit=bool(audio_path))
+            if audio_path:
+                logger.info("Reusing audio from an earlier attempt: %s", audio_path)
+            else:
+                with stage_timer("download"):
+                    audio_path = downloader.download_audio(
+                        video_url,
+                        profile=settings.TRANSCRIPTION_AUDIO_PROFILE,
+                        output_dir=checkpoints.audio_dir(script_id),
+                    )
+
+                # Ensure audio_path is a string, not a tuple
+                if isinstance(audio_path, tuple):
+                    audio_path = audio_path[0]
+
+                logger.info("Audio downloaded to: %s", audio_path)
+                DOWNLOADED_BYTES.inc(os.path.getsize(audio_path))
+                sticky_status["transfer"] = downloader.transfer_stats.as_dict()
+                checkpoints.retain_audio(script_id, audio_path)
+
+            # Transcribe audio
+            update_task_status(50, {
+                "message_key": "celery.transcription.generating_transcript",
+                "message_fallback": "Transcribing audio using AI..."
+            })
+            transcriber = get_transcriber()
+            use_clip_batching = (
+                settings.SHORT_CLIP_BATCHING
+                and not word_timestamps
+                and 0 < (video_info.get("duration") or 0) <= settings.SHORT_CLIP_MAX_DURATION
+            )
+            use_checkpoints = (script.video_duration or 0) >= settings.CHECKPOINT_MIN_DURATION
+            if use_clip_batching:
+                language = _resolve_language(transcriber, redis_client, audio_path, video_id)
+                with stage_timer("transcribe"):
+                    transcript_data = ShortClipBatcher(transcriber, redis_client).transcribe(
+                        audio_path, language=language
+                    )
+                TRANSCRIBED_AUDIO_SECONDS.labels(source="whisper").inc(script.video_duration or 0)
+            else:
+                resume_from = (script.transcribed_until or 0.0) if use_checkpoints else 0.0
+                if resume_from and script.transcript_language:
+                    language = script.transcript_language
+                else:
+                    language = _resolve_language(transcriber, redis_client, audio_path, video_id)
+
+                transcribe_start = time.monotonic()
+                with stage_timer("transcribe"):
+                    if use_checkpoints:
+                        transcript_data = _transcribe_checkpointed(
+                            transcriber, db, script, audio_path, word_timestamps, language,
+                            update_task_status,
+                        )
+                    else:
+                        transcript_data = transcriber.transcribe_audio(
+                            audio_path, word_timestamps=word_timestamps, language=language
+                        )
+                transcribed_seconds = (script.video_duration or 0) - resume_from
+                admission.record_real_time_factor(
+                    time.monotonic() - transcribe_start, transcribed_seconds
+                )
+                TRANSCRIBED_AUDIO_SECONDS.labels(source="whisper").inc(max(transcribed_seconds, 0))
 
         # Format transcript
         update_task_status(80, {
             "message_key": "celery.transcription.finalizing",
             "message_fallback": "Formatting transcript..."
         })
-        formatted_script = transcriber.format_transcript_as_list(
-            transcript_data["segments"]
-        )
+        with stage_timer("format"):
+            # Stored with the transcriber's own segment timings; the reading
+            # view and subtitle cues are derived from them on request
+            formatted_script = WhisperTranscriber.format_transcript_as_list(
+                transcript_data["segments"]
+            )
 
         # Update script with results
         script.transcript_text = transcript_data["text"]
         script.formatted_script = formatted_script  # Now storing as JSON list
+        script.transcript_source = transcript_source
+        script.transcript_language = transcript_data.get("language")
+        script.transcribed_until = None
         script.status = "completed"
         script.completed_at = datetime.utcnow()
-        db.commit()
+        with stage_timer("db_commit"):
+            index_script_segments(db, script_id, formatted_script)
+            db.commit()
 
         # Final update
         update_task_status(100, {
@@ -128,7 +371,10 @@ def process_youtube_video(self, script_id: int, video_url: str):
             "message_fallback": "Transcription completed!"
         }, {"state": "SUCCESS"})
 
-        print(f"Successfully processed script {script_id}")
+        if bulk_job_id:
+            record_bulk_result(bulk_job_id, script_id, success=True)
+
+        logger.info("Successfully processed script %s", script_id)
         return {
             "script_id": script_id,
             "status": "completed",
@@ -136,14 +382,30 @@ def process_youtube_video(self, script_id: int, video_url: str):
         }
 
     except Exception as e:
-        print(f"Error processing video: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error processing video: %s", e)
+
+        retrying = (
+            not isinstance(e, NonRetryableError)
+            and self.request.retries < settings.TRANSCRIPTION_MAX_RETRIES
+        )
+        if retrying:
+            # Keep the script, audio and checkpoint for the next attempt
+            update_task_status(10, {
+                "message_key": "celery.transcription.retrying",
+                "message_fallback": f"Retrying after error: {str(e)}"
+            })
+            raise self.retry(
+                exc=e,
+                countdown=settings.TRANSCRIPTION_RETRY_DELAY * 2 ** self.request.retries,
+                max_retries=settings.TRANSCRIPTION_MAX_RETRIES,
+            )
 
         # Update script with error
         if script:
             script.status = "failed"
             script.error_message = str(e)
-            db.commit()
+            # Partial checkpoint output is not kept for a failed script
+            checkpoints.discard_partial(db, script)
 
         # Update task status
         update_task_status(
@@ -153,24 +415,56 @@ def process_youtube_video(self, script_id: int, video_url: str):
             }, {"state": "FAILURE", "error": str(e)}
         )
 
+        if bulk_job_id:
+            record_bulk_result(bulk_job_id, script_id, success=False)
+
         raise
 
     finally:
-        # Cleanup
-        if audio_path:
+        # Cleanup, unless a retry still needs the audio and the reservations
+        if audio_path and not retrying:
             # Ensure audio_path is a string
             if isinstance(audio_path, tuple):
                 audio_path = audio_path[0]
 
+            checkpoints.release_audio(script_id)
             if isinstance(audio_path, str) and os.path.exists(audio_path):
                 try:
                     os.remove(audio_path)
-                    print(f"Cleaned up audio file: {audio_path}")
+                    # The directory is this script's own, drop any leftovers
+                    shutil.rmtree(checkpoints.audio_dir(script_id), ignore_errors=True)
+                    logger.debug("Cleaned up audio file: %s", audio_path)
                 except Exception as cleanup_error:
-                    print(f"Failed to clean up audio file: {cleanup_error}")
-
+                    logger.warning("Failed to clean up audio file: %s", cleanup_error)
+
+        if not retrying:
+            release_schedule(scheduling)
+            admission.release(scheduling)
+            # Long-running workers never restart to sweep, so clean up after
+            # killed tasks here as well
+            try:
+                checkpoints.sweep_audio_dirs()
+            except Exception as sweep_error:
+                logger.warning("Audio sweep failed: %s", sweep_error)
         db.close()
 
+
+def _store_artifact(task_id: str, file_path: str) -> dict:
+    """Hand a finished download to artifact storage; returns its result fields"""
+    from ..core.media_profiles import media_type_for
+    from ..core.storage import artifact_key, get_storage, sweep_artifacts, track_artifact
+
+    key = artifact_key(task_id, file_path)
+    file_name = os.path.basename(file_path)
+    get_storage().put_file(file_path, key, content_type=media_type_for(file_name))
+    track_artifact(key)
+    try:
+        sweep_artifacts()
+    except Exception as e:
+        logger.warning("Artifact sweep failed: %s", e)
+    return {"storage_key": key, "file_name": file_name}
+
+
 @celery_app.task(bind=True, name="download_video")
 def download_video_task(self, video_url: str, quality: str = "best"):
     """Task to download a single YouTube video"""
@@ -231,6 +525,7 @@ def download_video_task(self, video_url: str, quality: str = "best"):
         
         # Download video
         video_path = downloader.download_video(video_url, quality)
+        artifact = _store_artifact(self.request.id, video_path)
         
         # Update final status
         update_task_status(
@@ -241,13 +536,15 @@ def download_video_task(self, video_url: str, quality: str = "best"):
             },
             {
                 "state": "SUCCESS",
-                "file_path": video_path,
+                **artifact,
+                "transfer": downloader.transfer_stats.as_dict(),
                 "video_info": video_info
             }
         )
         
         return {
-            "file_path": video_path,
+            **artifact,
+            "transfer": downloader.transfer_stats.as_dict(),
             "video_info": video_info,
             "status": "completed"
         }
@@ -325,6 +622,7 @@ def download_multiple_videos_task(self, video_urls: List[str], quality: str = "b
         
         # Download videos and create zip
         zip_path = downloader.download_multiple_videos(video_urls, quality)
+        artifact = _store_artifact(self.request.id, zip_path)
         
         # Update final status
         update_task_status(
@@ -335,13 +633,15 @@ def download_multiple_videos_task(self, video_urls: List[str], quality: str = "b
             },
             {
                 "state": "SUCCESS",
-                "file_path": zip_path,
+                **artifact,
+                "transfer": downloader.transfer_stats.as_dict(),
                 "total_videos": total_videos
             }
         )
         
         return {
-            "file_path": zip_path,
+            **artifact,
+            "transfer": downloader.transfer_stats.as_dict(),
             "total_videos": total_videos,
             "status": "completed"
         }
@@ -363,7 +663,7 @@ def download_multiple_videos_task(self, video_urls: List[str], quality: str = "b
 
 
 @celery_app.task(bind=True, name="download_audio")
-def download_audio_task(self, video_url: str):
+def download_audio_task(self, video_url: str, profile: str = None):
     """Task to download audio from a single YouTube video"""
     
     from ..core.youtube_downloader import YouTubeDownloader
@@ -421,7 +721,8 @@ def download_audio_task(self, video_url: str):
         })
         
         # Download audio
-        audio_path = downloader.download_audio(video_url)
+        audio_path = downloader.download_audio(video_url, profile)
+        artifact = _store_artifact(self.request.id, audio_path)
         
         # Update final status
         update_task_status(
@@ -432,13 +733,15 @@ def download_audio_task(self, video_url: str):
             },
             {
                 "state": "SUCCESS",
-                "file_path": audio_path,
+                **artifact,
+                "transfer": downloader.transfer_stats.as_dict(),
                 "video_info": video_info
             }
         )
         
         return {
-            "file_path": audio_path,
+            **artifact,
+            "transfer": downloader.transfer_stats.as_dict(),
             "video_info": video_info,
             "status": "completed"
         }
@@ -460,7 +763,7 @@ def download_audio_task(self, video_url: str):
 
 
 @celery_app.task(bind=True, name="download_multiple_audios")
-def download_multiple_audios_task(self, video_urls: List[str]):
+def download_multiple_audios_task(self, video_urls: List[str], profile: str = None):
     """Task to download audio from multiple YouTube videos"""
     
     from ..core.youtube_downloader import YouTubeDownloader
@@ -511,7 +814,8 @@ def download_multiple_audios_task(self, video_urls: List[str]):
         })
         
         # Download audio files and create zip
-        zip_path = downloader.download_multiple_audios(video_urls)
+        zip_path = downloader.download_multiple_audios(video_urls, profile)
+        artifact = _store_artifact(self.request.id, zip_path)
         
         # Update final status
         update_task_status(
@@ -522,13 +826,15 @@ def download_multiple_audios_task(self, video_urls: List[str]):
             },
             {
                 "state": "SUCCESS",
-                "file_path": zip_path,
+                **artifact,
+                "transfer": downloader.transfer_stats.as_dict(),
                 "total_videos": total_videos
             }
         )
         
         return {
-            "file_path": zip_path,
+            **artifact,
+            "transfer": downloader.transfer_stats.as_dict(),
             "total_videos": total_videos,
             "status": "completed"
         }
@@ -547,3 +853,117 @@ def download_multiple_audios_task(self, video_urls: List[str]):
         )
         
         raise
+
+
+@celery_app.task(bind=True, name="expand_bulk_job")
+def expand_bulk_job(self, job_id: str, source_url: str, max_videos: int, options: dict):
+    """Expand a playlist/channel into Script rows and start the shard fan-out"""
+
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.youtube_downloader import YouTubeDownloader
+    from ..core.bulk_jobs import set_bulk_job_items, mark_bulk_job_failed
+
+    db = SessionLocal()
+    try:
+        videos = YouTubeDownloader().expand_collection(source_url, max_videos)
+        logger.info("Bulk job %s: expanded %s into %d videos", job_id, source_url, len(videos))
+
+        scripts = [
+            Script(
+                video_url=video["url"],
+                video_title=video.get("title"),
+                video_duration=video.get("duration"),
+                status="pending",
+            )
+            for video in videos
+        ]
+        db.add_all(scripts)
+        db.commit()
+
+        set_bulk_job_items(job_id, [
+            {
+                "script_id": script.id,
+                "video_url": script.video_url,
+                "duration": script.video_duration,
+            }
+            for script in scripts
+        ])
+
+        if scripts:
+            dispatch_bulk_shard.delay(job_id, 0, options)
+
+        return {"job_id": job_id, "total": len(scripts)}
+
+    except Exception as e:
+        logger.exception("Bulk job %s expansion failed: %s", job_id, e)
+        mark_bulk_job_failed(job_id, str(e))
+        raise
+
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name="dispatch_bulk_shard")
+def dispatch_bulk_shard(self, job_id: str, offset: int, options: dict):
+    """Dispatch the next shard of a bulk job as a Celery group
+
+    Only one dispatcher is scheduled per job at a time, and it waits while
+    the job already has BULK_MAX_IN_FLIGHT unfinished tasks, so a large
+    channel trickles into the queue instead of flooding it.
+    """
+    from celery import group
+    from ..config import settings
+    from ..core.bulk_jobs import get_bulk_job, get_bulk_job_items, add_dispatched
+    from ..core.scheduling import prepare_schedule, release_schedule
+    from ..core import admission
+
+    job = get_bulk_job(job_id)
+    if not job or job["status"] != "running":
+        return
+
+    # Defer while this job has too much in flight or the cluster is over capacity
+    in_flight = job["dispatched"] - job["completed"] - job["failed"]
+    if (
+        in_flight >= settings.BULK_MAX_IN_FLIGHT
+        or admission.backlog_seconds() > settings.ADMISSION_MAX_BACKLOG
+    ):
+        dispatch_bulk_shard.apply_async(
+            (job_id, offset, options), countdown=settings.BULK_SHARD_INTERVAL
+        )
+        return
+
+    items = get_bulk_job_items(job_id, offset, settings.BULK_SHARD_SIZE)
+    if not items:
+        return
+
+    signatures = []
+    reserved = []
+    for item in items:
+        priority, scheduling = prepare_schedule("bulk", job["client_id"], item.get("duration"))
+        scheduling["audio_seconds"] = admission.estimated_duration(item.get("duration"))
+        admission.reserve(scheduling["task_id"], scheduling["audio_seconds"])
+        reserved.append(scheduling)
+        signatures.append(
+            process_youtube_video.s(
+                script_id=item["script_id"],
+                video_url=item["video_url"],
+                bulk_job_id=job_id,
+                scheduling=scheduling,
+                **options,
+            ).set(priority=priority, task_id=scheduling["task_id"])
+        )
+    try:
+        group(signatures).apply_async()
+    except Exception:
+        for scheduling in reserved:
+            release_schedule(scheduling)
+            admission.release(scheduling)
+        raise
+    add_dispatched(job_id, len(items))
+
+    next_offset = offset + len(items)
+    if next_offset < job["total"]:
+        dispatch_bulk_shard.apply_async(
+            (job_id, next_offset, options), countdown=settings.BULK_SHARD_INTERVAL
+        )
@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_backends.py
+"""
+Compare transcription backends on local audio
+
+Every backend/model combination runs in a fresh subprocess so model load
+time, real-time factor (transcribe seconds / audio seconds) and peak RSS
+are measured in isolation.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_backends path/to/audio.mp3 \\
+        --backends openai-whisper faster-whisper --models tiny base
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+
+def audio_duration(audio_path: str) -> float:
+    """Duration in seconds as reported by ffprobe"""
+    output = subprocess.check_output([
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        audio_path,
+    ])
+    return float(output.strip())
+
+
+def run_child(backend: str, model: str, audio_path: str) -> dict:
+    """Runs inside the subprocess: load, transcribe, report"""
+    from app.core.transcriber import WhisperTranscriber
+
+    load_start = time.perf_counter()
+    transcriber = WhisperTranscriber(model_name=model, backend=backend)
+    load_seconds = time.perf_counter() - load_start
+
+    transcribe_start = time.perf_counter()
+    result = transcriber.transcribe_audio(audio_path)
+    transcribe_seconds = time.perf_counter() - transcribe_start
+
+    duration = audio_duration(audio_path)
+    return {
+        "backend": backend,
+        "model": model,
+        "audio_seconds": round(duration, 2),
+        "load_seconds": round(load_seconds, 3),
+        "transcribe_seconds": round(transcribe_seconds, 3),
+        "real_time_factor": round(transcribe_seconds / duration, 4) if duration else None,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "segments": len(result["segments"]),
+        "language": result["language"],
+    }
+
+
+def run_isolated(backend: str, model: str, audio_path: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_backends", audio_path,
+         "--child", backend, model],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"backend": backend, "model": model, "error": proc.stderr.strip().splitlines()[-1:]}
+    # The result is the last line, anything before it is model/progress output
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="Audio file to transcribe")
+    parser.add_argument("--backends", nargs="+", default=["openai-whisper", "faster-whisper"])
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"])
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "MODEL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], args.child[1], args.audio)))
+        return
+
+    results = [
+        run_isolated(backend, model, args.audio)
+        for backend in args.backends
+        for model in args.models
+    ]
+    print(json.dumps({"audio": args.audio, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_clip_batch.py
+"""
+Benchmark for short clip batching under pinned worker children
+
+Transcribes the same short clip N times in three layouts and reports wall
+time for each:
+
+- sequential: one clip after another at one child's thread budget;
+  parallel_estimate divides it by the children the cores can run at once,
+  which is what N pinned children achieve without batching
+- batch_pinned: one batched pass at one child's thread budget, the leader
+  staying on its own pinned cores
+- batch_borrowed: one batched pass on the cores of all N children, as
+  ShortClipBatcher runs it
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_clip_batch path/to/clip.mp3 --clips 4 --threads 2 --model base
+"""
+
+import argparse
+import json
+import os
+import time
+
+from app.workers.concurrency import available_cpus, borrow_cores, limit_threads
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(audio_path: str, clips: int, threads: int, model: str) -> dict:
+    from app.core.transcriber import WhisperTranscriber
+
+    cpus = available_cpus()
+    # Pin like a prefork child with WORKER_PIN_CPUS
+    os.sched_setaffinity(0, cpus[:threads])
+    limit_threads(threads)
+    transcriber = WhisperTranscriber(model_name=model, backend="openai-whisper")
+    paths = [audio_path] * clips
+
+    transcriber.transcribe_audio(audio_path, word_timestamps=False)  # warm up
+
+    sequential = timed(lambda: [transcriber.transcribe_audio(p, word_timestamps=False) for p in paths])
+    batch_pinned = timed(lambda: transcriber.transcribe_audio_batch(paths))
+    with borrow_cores(cpus[:threads * clips], threads * clips):
+        batch_borrowed = timed(lambda: transcriber.transcribe_audio_batch(paths))
+
+    parallel_children = max(1, min(clips, len(cpus) // threads))
+    return {
+        "clips": clips,
+        "threads_per_child": threads,
+        "cpus": len(cpus),
+        "sequential_seconds": round(sequential, 3),
+        "parallel_estimate_seconds": round(sequential / parallel_children, 3),
+        "batch_pinned_seconds": round(batch_pinned, 3),
+        "batch_borrowed_seconds": round(batch_borrowed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio")
+    parser.add_argument("--clips", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--model", default="base")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.audio, args.clips, args.threads, args.model), indent=2))
+
+
+if __name__ == "__main__":
+    main()
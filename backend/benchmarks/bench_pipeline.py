@@ -0,0 +1,296 @@
+# backend/benchmarks/bench_pipeline.py
+"""
+End-to-end benchmark of the transcription pipeline on local fixtures
+
+Runs process_youtube_video eagerly, in process, against local audio files:
+the yt-dlp calls are replaced by a stub that serves the fixtures from disk,
+Redis is fakeredis and the database is a throwaway SQLite file. Reports the
+time spent per stage (info, download, decode, transcribe, format, db),
+real-time factor and peak RSS as JSON, tagged with the current commit so
+runs can be compared.
+
+decode is ffmpeg decoding done by the transcriber and is also included in
+transcribe; model loading happens once, before the first fixture.
+
+Usage (from the backend directory):
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.bench_pipeline fixtures/*.mp3 --output results.json
+    python -m benchmarks.bench_pipeline --synthetic 60   # generated tone, no fixtures needed
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import resource
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from collections import defaultdict
+
+
+class StageTimer:
+    """Accumulates wall time per named stage"""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def add(self, stage: str, seconds: float):
+        self.totals[stage] += seconds
+        self.calls[stage] += 1
+
+    def wrap(self, owner, name: str, stage: str, static: bool = False):
+        original = getattr(owner, name)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+
+        setattr(owner, name, staticmethod(timed) if static else timed)
+
+    def reset(self):
+        self.totals.clear()
+        self.calls.clear()
+
+    def report(self) -> dict:
+        return {
+            stage: {"calls": self.calls[stage], "seconds": round(self.totals[stage], 4)}
+            for stage in sorted(self.totals)
+        }
+
+
+def write_synthetic_wav(path: str, seconds: int, rate: int = 16000):
+    """A gliding tone; enough to exercise decode and the model, not accuracy"""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        frames = bytearray()
+        for i in range(seconds * rate):
+            t = i / rate
+            frequency = 220 + 110 * math.sin(t / 3)
+            frames += struct.pack("<h", int(8000 * math.sin(2 * math.pi * frequency * t)))
+        wav.writeframes(bytes(frames))
+
+
+def audio_duration(audio_path: str) -> float:
+    output = subprocess.check_output([
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        audio_path,
+    ])
+    return float(output.strip())
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def configure_environment(workdir: str):
+    """Point the app at SQLite and temp dirs; must run before app modules are imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["TEMP_AUDIO_PATH"] = os.path.join(workdir, "audio")
+    os.environ["GENERATED_SCRIPTS_PATH"] = os.path.join(workdir, "scripts")
+
+
+def install_stubs(fixtures: dict, timer: StageTimer):
+    """Replace yt-dlp, Redis and the Celery backends with local stand-ins"""
+    import fakeredis
+    from sqlalchemy import event
+
+    from app.config import settings
+    from app.core import redis_client
+    from app.core import transcriber as transcriber_module
+    from app.core.transcriber import WhisperTranscriber
+    from app.core.whisper_backends import BACKENDS
+    from app.core.youtube_downloader import YouTubeDownloader
+    from app.database import engine
+    from app.workers.celery_app import celery_app
+
+    redis_client._redis_client = fakeredis.FakeRedis(decode_responses=True)
+    celery_app.conf.update(
+        broker_url="memory://",
+        result_backend="cache+memory://",
+        task_always_eager=True,
+    )
+    settings.CAPTIONS_FIRST = False
+    # Eager retries would re-run failures immediately and skew the timings
+    settings.TRANSCRIPTION_MAX_RETRIES = 0
+
+    def extract_video_info(self, url: str) -> dict:
+        fixture = fixtures[url]
+        return {
+            "title": fixture["name"],
+            "duration": int(round(fixture["duration"])),
+            "channel": "fixtures",
+            "video_id": fixture["video_id"],
+            "thumbnail": "",
+            "description": "",
+            "upload_date": "",
+            "view_count": 0,
+        }
+
+    def download_audio(self, url: str, profile: str = None, output_dir: str = None) -> str:
+        fixture = fixtures[url]
+        output_dir = output_dir or self.output_path
+        os.makedirs(output_dir, exist_ok=True)
+        target = os.path.join(output_dir, fixture["video_id"] + os.path.splitext(fixture["path"])[1])
+        shutil.copyfile(fixture["path"], target)
+        return target
+
+    YouTubeDownloader.extract_video_info = extract_video_info
+    YouTubeDownloader.download_audio = download_audio
+    timer.wrap(YouTubeDownloader, "extract_video_info", "info")
+    timer.wrap(YouTubeDownloader, "download_audio", "download")
+
+    timer.wrap(transcriber_module, "load_audio_head", "decode")
+    timer.wrap(transcriber_module, "load_audio_range", "decode")
+    try:
+        import whisper.audio
+        timer.wrap(whisper.audio, "load_audio", "decode")
+    except ImportError:
+        pass
+
+    for backend_class in set(BACKENDS.values()):
+        for name in ("transcribe", "transcribe_batch", "detect_language"):
+            if name in vars(backend_class):
+                timer.wrap(backend_class, name, "transcribe")
+    timer.wrap(WhisperTranscriber, "format_transcript_as_list", "format", static=True)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("bench_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        timer.add("db", time.perf_counter() - conn.info["bench_start"].pop())
+
+
+def run_fixture(url: str, fixture: dict, timer: StageTimer, word_timestamps: bool) -> dict:
+    from app.database import SessionLocal
+    from app.models import Script
+    from app.workers.tasks import process_youtube_video
+
+    db = SessionLocal()
+    script = Script(video_url=url, status="pending")
+    db.add(script)
+    db.commit()
+    script_id = script.id
+    db.close()
+
+    timer.reset()
+    start = time.perf_counter()
+    result = process_youtube_video.apply(
+        kwargs={"script_id": script_id, "video_url": url, "word_timestamps": word_timestamps}
+    )
+    wall_seconds = time.perf_counter() - start
+
+    db = SessionLocal()
+    script = db.query(Script).filter(Script.id == script_id).first()
+    segments = len(script.formatted_script or [])
+    status = script.status
+    db.close()
+
+    stages = timer.report()
+    transcribe_seconds = stages.get("transcribe", {}).get("seconds", 0.0)
+    duration = fixture["duration"]
+    return {
+        "fixture": fixture["name"],
+        "audio_seconds": round(duration, 2),
+        "status": status if result.successful() else "failed",
+        "segments": segments,
+        "wall_seconds": round(wall_seconds, 4),
+        "stages": stages,
+        "real_time_factor": round(transcribe_seconds / duration, 4) if duration else None,
+        "end_to_end_rtf": round(wall_seconds / duration, 4) if duration else None,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", nargs="*", help="Audio fixtures to transcribe")
+    parser.add_argument("--synthetic", type=int, metavar="SECONDS",
+                        help="Add a generated tone fixture of this length")
+    parser.add_argument("--word-timestamps", action="store_true")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        paths = list(args.audio)
+        if args.synthetic:
+            synthetic_path = os.path.join(workdir, f"synthetic_{args.synthetic}s.wav")
+            write_synthetic_wav(synthetic_path, args.synthetic)
+            paths.append(synthetic_path)
+        if not paths:
+            parser.error("give audio fixtures or --synthetic SECONDS")
+
+        fixtures = {}
+        for index, path in enumerate(paths):
+            name = os.path.basename(path)
+            fixtures[f"https://fixtures.local/watch?v=fixture{index}"] = {
+                "name": name,
+                "path": os.path.abspath(path),
+                "video_id": f"fixture{index}",
+                "duration": audio_duration(path),
+            }
+
+        configure_environment(workdir)
+        timer = StageTimer()
+        install_stubs(fixtures, timer)
+
+        from app.config import ensure_directories, settings
+        from app.core.transcriber import get_transcriber
+        from app.database import Base, engine
+        from app import models  # noqa: F401
+
+        ensure_directories()
+        Base.metadata.create_all(bind=engine)
+
+        load_start = time.perf_counter()
+        get_transcriber()
+        model_load_seconds = time.perf_counter() - load_start
+
+        results = [
+            run_fixture(url, fixture, timer, args.word_timestamps)
+            for url, fixture in fixtures.items()
+        ]
+
+        report = {
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "backend": settings.TRANSCRIBER_BACKEND,
+            "model": settings.WHISPER_MODEL,
+            "model_load_seconds": round(model_load_seconds, 3),
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        print(output)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output + "\n")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/bench_segments.py
+"""
+Benchmark for segment post-processing
+
+Runs app.core.segments.resegment with every profile over a synthetic
+transcript of uneven segments (one-word fragments up to long run-ons, half
+of them with word timestamps), and again over a transcript ten times as
+long to check the cost grows linearly. Also reports how much the segment
+lengths even out.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_segments --segments 10000 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import timeit
+
+from app.core.segments import SEGMENT_PROFILES, resegment
+
+WORDS = "the of and to a in is you that it he was for on are as with his they at be this have from".split()
+
+
+def make_segments(count: int, seed: int = 0):
+    """Build a synthetic transcript whose segment lengths vary widely"""
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    for i in range(count):
+        word_count = rng.choice([1, 2, 3, 8, 15, 25, 60, 120])
+        words = []
+        t = start
+        for j in range(word_count):
+            word = rng.choice(WORDS)
+            if j < word_count - 1 and rng.random() < 0.08:
+                word += rng.choice(",.?")
+            duration = rng.uniform(0.15, 0.45)
+            words.append({"word": " " + word, "start": t, "end": t + duration})
+            t += duration
+        segment = {
+            "id": i,
+            "start": start,
+            "end": t,
+            "text": "".join(w["word"] for w in words) + ".",
+        }
+        if i % 2:
+            segment["words"] = words
+        segments.append(segment)
+        start = t + rng.uniform(0.0, 1.5)
+    return segments
+
+
+def length_stats(segments):
+    chars = [len(s["text"]) for s in segments]
+    durations = [s["end"] - s["start"] for s in segments]
+    return {
+        "count": len(segments),
+        "chars_mean": round(statistics.mean(chars), 1),
+        "chars_stdev": round(statistics.pstdev(chars), 1),
+        "chars_max": max(chars),
+        "duration_mean": round(statistics.mean(durations), 2),
+        "duration_max": round(max(durations), 2),
+    }
+
+
+def time_profile(segments, profile: str, repeat: int) -> float:
+    return min(timeit.repeat(lambda: resegment(segments, profile), number=1, repeat=repeat))
+
+
+def run(segment_count: int, repeat: int) -> dict:
+    segments = make_segments(segment_count)
+    larger = make_segments(segment_count * 10, seed=1)
+
+    results = {}
+    for profile in SEGMENT_PROFILES:
+        if SEGMENT_PROFILES[profile] is None:
+            continue
+        best = time_profile(segments, profile, repeat)
+        best_larger = time_profile(larger, profile, max(repeat // 2, 1))
+        results[profile] = {
+            "best_seconds": round(best, 6),
+            "segments_per_second": round(segment_count / best),
+            # Close to 1.0 when the cost is linear
+            "scaling_10x": round(best_larger / best / 10, 2),
+            "output": length_stats(resegment(segments, profile)),
+        }
+
+    return {
+        "segments": segment_count,
+        "repeat": repeat,
+        "input": length_stats(segments),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.segments, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
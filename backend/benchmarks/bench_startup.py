@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_startup.py
+"""
+Cold-start profile of the API and worker entry points
+
+Imports each target in a fresh interpreter with `-X importtime` and reports
+the wall time plus the modules with the largest cumulative import time, so
+heavy dependencies creeping back onto the startup path show up at once.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_startup --repeat 5 --top 15
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = {
+    "api": "app.main",
+    "worker": "app.workers.tasks",
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `import time: self | cumulative | name` lines (microseconds)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def profile_import(module: str) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    return {"wall_seconds": wall_seconds, "modules": parse_importtime(proc.stderr)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to report")
+    args = parser.parse_args()
+
+    results = {}
+    for target in args.targets:
+        module = TARGETS[target]
+        runs = [profile_import(module) for _ in range(args.repeat)]
+        walls = [run["wall_seconds"] for run in runs]
+
+        # Top-level packages (no dot) from the last run, slowest first
+        top_level = [
+            entry for entry in runs[-1]["modules"] if "." not in entry["module"].strip()
+        ]
+        top_level.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+
+        results[target] = {
+            "module": module,
+            "wall_seconds_median": round(statistics.median(walls), 4),
+            "wall_seconds_min": round(min(walls), 4),
+            "modules_imported": len(runs[-1]["modules"]),
+            "slowest_imports": top_level[:args.top],
+        }
+
+    print(json.dumps({"python": sys.version.split()[0], "repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# backend/benchmarks/bench_timing.py
+"""
+Micro-benchmark for timestamp formatting
+
+Compares the old per-segment formatting loop against the shared batch
+formatter in app.core.timing on synthetic transcripts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_timing --segments 10000 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from app.core.timing import format_segment_times, render_srt, render_vtt
+
+
+def make_segments(count: int, seed: int = 0):
+    """Build a synthetic transcript with increasing start times"""
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    for i in range(count):
+        duration = rng.uniform(0.8, 8.0)
+        segments.append({
+            "id": i,
+            "start": start,
+            "end": start + duration,
+            "text": " lorem ipsum dolor sit amet",
+        })
+        start += duration + rng.uniform(0.0, 0.5)
+    return segments
+
+
+def legacy_seconds_to_timestamp(seconds: float) -> str:
+    """Previous per-call implementation kept for comparison"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
+
+
+def legacy_format(segments):
+    return [
+        (legacy_seconds_to_timestamp(s["start"]), legacy_seconds_to_timestamp(s["end"]))
+        for s in segments
+    ]
+
+
+def run(segment_count: int, repeat: int) -> dict:
+    segments = make_segments(segment_count)
+
+    # Sanity check: the batch formatter must match the legacy output
+    assert legacy_format(segments) == format_segment_times(segments)
+
+    cases = {
+        "legacy_clock": lambda: legacy_format(segments),
+        "batch_clock": lambda: format_segment_times(segments),
+        "batch_srt": lambda: format_segment_times(segments, style="srt"),
+        "render_srt": lambda: render_srt(segments),
+        "render_vtt": lambda: render_vtt(segments),
+    }
+
+    results = {}
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        results[name] = {
+            "best_seconds": round(best, 6),
+            "segments_per_second": round(segment_count / best),
+        }
+
+    return {"segments": segment_count, "repeat": repeat, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.segments, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
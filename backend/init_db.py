@@ -1,11 +1,10 @@
 # backend/init_db.py
 """
 Initialize database without using Alembic
-Run this script to create all tables
+Run this script to create all tables, or to upgrade an existing database
 """
 
-from app.database import engine, Base
-from app.models import Script
+from app.database import Base, upgrade_schema
 from app.config import settings
 
 def init_db():
@@ -14,8 +13,8 @@ def init_db():
     print(f"Database URL: {settings.DATABASE_URL}")
     
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create all tables and add columns older databases lack
+        upgrade_schema()
         print("✓ All tables created successfully!")
         
         # List created tables
@@ -0,0 +1,50 @@
+# backend/reindex_search.py
+"""
+Rebuild the transcript segment search index
+Run this script once after upgrading so scripts completed before the
+index existed become searchable
+"""
+
+from app.database import SessionLocal, engine, Base
+from app.models import Script
+from app.core.search import index_script_segments
+
+def reindex(batch_size: int = 200):
+    """Index segments of every completed script"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    indexed = 0
+    
+    try:
+        last_id = 0
+        while True:
+            scripts = (
+                db.query(Script.id, Script.formatted_script)
+                .filter(Script.status == "completed", Script.id > last_id)
+                .order_by(Script.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not scripts:
+                break
+            
+            for script_id, formatted_script in scripts:
+                if isinstance(formatted_script, list):
+                    index_script_segments(db, script_id, formatted_script)
+                    indexed += 1
+            db.commit()
+            last_id = scripts[-1].id
+            print(f"Indexed {indexed} scripts...")
+        
+        print(f"✓ Search index rebuilt for {indexed} scripts")
+    
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error rebuilding search index: {str(e)}")
+        raise
+    
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reindex()
@@ -0,0 +1,100 @@
+import pytest
+
+from app.core.captions import parse_captions, parse_srv3, parse_vtt, select_caption_track
+
+# Auto-generated captions repeat the previous cue's line above the new one
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> there</c>
+
+00:00:01.500 --> 00:00:03.000 align:start position:0%
+hello there
+general<00:00:02.200><c> kenobi</c>
+
+00:00:03.000 --> 00:00:04.000
+general kenobi
+you are
+
+1:00:00.000 --> 1:00:01.000
+late &amp; &lt;bold&gt;
+"""
+
+
+def test_vtt_drops_rolling_duplicate_lines():
+    segments = parse_vtt(ROLLING_VTT)
+    assert [segment["text"] for segment in segments] == [
+        " hello there",
+        " general kenobi",
+        " you are",
+        " late & <bold>",
+    ]
+
+
+def test_vtt_overlapping_cues_are_clipped_in_order():
+    segments = parse_vtt(ROLLING_VTT)
+    assert [(s["start"], s["end"]) for s in segments] == [
+        (0.0, 1.5),
+        (1.5, 3.0),
+        (3.0, 4.0),
+        (3600.0, 3601.0),
+    ]
+    assert [s["id"] for s in segments] == [0, 1, 2, 3]
+
+
+def test_vtt_accepts_comma_milliseconds_and_crlf():
+    content = "WEBVTT\r\n\r\n00:01.000 --> 00:02,500\r\nhi\r\n"
+    assert parse_vtt(content) == [{"id": 0, "start": 1.0, "end": 2.5, "text": " hi"}]
+
+
+def test_srv3_sorts_cues_and_skips_empty_ones():
+    content = """<?xml version="1.0" encoding="utf-8" ?>
+<timedtext format="3"><body>
+<p t="2000" d="1000">second</p>
+<p t="0" d="1500"><s>first</s><s> line</s></p>
+<p t="3000" d="500">   </p>
+</body></timedtext>"""
+    assert parse_srv3(content) == [
+        {"id": 0, "start": 0.0, "end": 1.5, "text": " first line"},
+        {"id": 1, "start": 2.0, "end": 3.0, "text": " second"},
+    ]
+
+
+def test_parse_captions_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        parse_captions("", "ttml")
+
+
+def _track(ext, url):
+    return {"ext": ext, "url": url}
+
+
+def test_manual_subtitles_win_and_prefer_srv3():
+    info = {
+        "language": "de",
+        "subtitles": {"de-DE": [_track("vtt", "https://m/vtt"), _track("srv3", "https://m/srv3")]},
+        "automatic_captions": {"de": [_track("srv3", "https://a/srv3")]},
+    }
+    assert select_caption_track(info, ["en"]) == {
+        "language": "de", "ext": "srv3", "url": "https://m/srv3", "source": "captions_manual",
+    }
+
+
+def test_manual_subtitles_in_other_languages_are_ignored():
+    info = {
+        "language": "de",
+        "subtitles": {"fr": [_track("vtt", "https://m/fr")], "live_chat": [_track("json", "https://c")]},
+        "automatic_captions": {
+            "de": [_track("vtt", "https://a/de")],
+            "en": [_track("vtt", "https://a/de?tlang=en")],
+        },
+    }
+    assert select_caption_track(info, ["en"])["url"] == "https://a/de"
+    assert select_caption_track(info, ["en"], allow_auto=False) is None
+
+
+def test_translated_auto_captions_are_never_used():
+    info = {"automatic_captions": {"en": [_track("vtt", "https://a/x?tlang=en")]}}
+    assert select_caption_track(info, ["en"]) is None
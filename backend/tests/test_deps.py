@@ -0,0 +1,72 @@
+import ipaddress
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import deps
+
+
+def make_request(host, forwarded_for=None, api_key=None):
+    headers = {}
+    if forwarded_for is not None:
+        headers["x-forwarded-for"] = forwarded_for
+    if api_key is not None:
+        headers["x-api-key"] = api_key
+    return SimpleNamespace(client=SimpleNamespace(host=host), headers=headers)
+
+
+@pytest.fixture
+def trusted(monkeypatch):
+    """Trust a load balancer subnet and one edge proxy"""
+    networks = [ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("192.0.2.1")]
+    monkeypatch.setattr(deps, "_trusted_proxies", networks)
+
+
+def test_untrusted_peer_cannot_spoof_forwarded_for(trusted):
+    request = make_request("203.0.113.7", forwarded_for="1.2.3.4")
+    assert deps.get_client_id(request) == "ip:203.0.113.7"
+
+
+def test_forwarded_for_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(deps, "_trusted_proxies", [])
+    request = make_request("10.0.0.5", forwarded_for="1.2.3.4")
+    assert deps.get_client_id(request) == "ip:10.0.0.5"
+
+
+def test_trusted_proxy_forwards_client_address(trusted):
+    request = make_request("10.0.0.5", forwarded_for="198.51.100.20")
+    assert deps.get_client_id(request) == "ip:198.51.100.20"
+
+
+def test_client_written_entries_left_of_the_real_one_are_ignored(trusted):
+    # The client sent "X-Forwarded-For: 1.2.3.4"; the proxy appended its peer
+    request = make_request("10.0.0.5", forwarded_for="1.2.3.4, 198.51.100.20")
+    assert deps.get_client_id(request) == "ip:198.51.100.20"
+
+
+def test_chain_of_trusted_proxies_is_skipped(trusted):
+    request = make_request("10.0.0.5", forwarded_for="1.2.3.4, 198.51.100.20, 192.0.2.1, 10.1.1.1")
+    assert deps.get_client_id(request) == "ip:198.51.100.20"
+
+
+@pytest.mark.parametrize("forwarded_for", [None, "", " , ", "10.1.1.1"])
+def test_trusted_proxy_without_client_entry_falls_back_to_peer(trusted, forwarded_for):
+    request = make_request("10.0.0.5", forwarded_for=forwarded_for)
+    assert deps.get_client_id(request) == "ip:10.0.0.5"
+
+
+def test_unparsable_entries_are_not_trusted(trusted):
+    request = make_request("10.0.0.5", forwarded_for="unknown")
+    assert deps.get_client_id(request) == "ip:unknown"
+
+
+def test_api_key_identifies_client_without_storing_it(trusted):
+    first = deps.get_client_id(make_request("203.0.113.7", api_key="secret"))
+    second = deps.get_client_id(make_request("198.51.100.1", api_key="secret"))
+    assert first == second
+    assert first.startswith("key:") and "secret" not in first
+
+
+def test_missing_client_is_unknown():
+    request = SimpleNamespace(client=None, headers={})
+    assert deps.get_client_id(request) == "ip:unknown"
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manually advanced stand-in for time.monotonic"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_burst_then_retry_after(clock):
+    limiter = TokenBucketLimiter(rate=0.5, burst=3)
+    assert [limiter.acquire("a") for _ in range(3)] == [None, None, None]
+    # One token refills every 2 seconds
+    assert limiter.acquire("a") == 2
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    limiter.acquire("a")
+    limiter.acquire("a")
+    assert limiter.acquire("a") == 1
+
+    clock.now += 1
+    assert limiter.acquire("a") is None
+    assert limiter.acquire("a") == 1
+
+    clock.now += 60
+    assert [limiter.acquire("a") for _ in range(3)] == [None, None, 1]
+
+
+def test_clients_are_limited_separately(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    assert limiter.acquire("a") is None
+    assert limiter.acquire("a") == 1
+    assert limiter.acquire("b") is None
+
+
+def test_retry_after_is_at_least_one_second(clock):
+    limiter = TokenBucketLimiter(rate=100, burst=1)
+    limiter.acquire("a")
+    assert limiter.acquire("a") == 1
+
+
+def test_full_table_evicts_idle_clients(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2)
+    limiter.acquire("a")
+    clock.now += 5
+    limiter.acquire("b")
+    limiter.acquire("c")
+    assert set(limiter._buckets) == {"b", "c"}
+    # b is still empty, so it was not forgotten
+    assert limiter.acquire("b") == 1
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 5), (-1, 5), (1, 0)])
+def test_invalid_limits_are_rejected(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=rate, burst=burst)
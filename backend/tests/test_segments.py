@@ -0,0 +1,102 @@
+import pytest
+
+from app.core.segments import SEGMENT_PROFILES, resegment, wrap_lines
+
+
+def words_of(text, start, step=0.5):
+    """Whisper-style word timings, one word every `step` seconds"""
+    return [
+        {"word": " " + word, "start": start + i * step, "end": start + (i + 1) * step}
+        for i, word in enumerate(text.split())
+    ]
+
+
+def test_none_profile_returns_input():
+    segments = [{"start": 0, "end": 1, "text": " hi"}]
+    assert resegment(segments, "none") is segments
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        resegment([], "karaoke")
+
+
+def test_short_fragments_merge_into_a_sentence():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": " So"},
+        {"start": 1.0, "end": 2.0, "text": " this is"},
+        {"start": 2.0, "end": 4.0, "text": " the first sentence."},
+    ]
+    assert resegment(segments, "reading") == [
+        {"start": 0.0, "end": 4.0, "text": "So this is the first sentence."},
+    ]
+
+
+def test_long_pause_prevents_merging():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": " Before"},
+        {"start": 10.0, "end": 11.0, "text": " after"},
+    ]
+    assert [s["text"] for s in resegment(segments, "reading")] == ["Before", "after"]
+
+
+def test_long_segment_splits_at_sentence_end_with_word_times():
+    text = "This first sentence is long enough to stand alone. " * 2 + "And then it simply keeps going on"
+    segment = {"start": 0.0, "end": 0.0, "text": text, "words": words_of(text, 0.0)}
+    segment["end"] = segment["words"][-1]["end"]
+
+    pieces = resegment([segment], "subtitle")
+
+    assert all(len(piece["text"].replace("\n", " ")) <= SEGMENT_PROFILES["subtitle"].max_chars for piece in pieces)
+    assert pieces[0]["text"].replace("\n", " ") == "This first sentence is long enough to stand alone."
+    # Cut times come from the words, not from interpolation
+    assert pieces[0]["end"] == segment["words"][8]["end"]
+    assert pieces[1]["start"] == segment["words"][9]["start"]
+    assert pieces[0]["start"] == 0.0 and pieces[-1]["end"] == segment["end"]
+    assert [w for piece in pieces for w in piece["words"]] == segment["words"]
+
+
+def test_long_segment_without_words_interpolates_times():
+    text = "word " * 40
+    pieces = resegment([{"start": 0.0, "end": 40.0, "text": text}], "subtitle")
+    assert len(pieces) > 1
+    assert all("words" not in piece for piece in pieces)
+    starts = [piece["start"] for piece in pieces]
+    assert starts == sorted(starts) and pieces[-1]["end"] == 40.0
+
+
+def test_merge_drops_words_when_one_side_has_none():
+    segments = [
+        {"start": 0.0, "end": 0.5, "text": " Hi", "words": words_of("Hi", 0.0)},
+        {"start": 0.5, "end": 1.0, "text": " there"},
+    ]
+    merged = resegment(segments, "reading")
+    assert merged == [{"start": 0.0, "end": 1.0, "text": "Hi there"}]
+
+
+def test_merge_keeps_words_when_both_sides_have_them():
+    first, second = words_of("Hi", 0.0), words_of("there.", 0.5)
+    segments = [
+        {"start": 0.0, "end": 0.5, "text": " Hi", "words": first},
+        {"start": 0.5, "end": 1.0, "text": " there.", "words": second},
+    ]
+    assert resegment(segments, "reading")[0]["words"] == first + second
+
+
+def test_input_segments_are_not_modified():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": " one"},
+        {"start": 1.0, "end": 2.0, "text": " two"},
+    ]
+    resegment(segments, "reading")
+    assert segments[0] == {"start": 0.0, "end": 1.0, "text": " one"}
+
+
+def test_wrap_lines_balances_lines():
+    text = "one two three four five six seven eight nine ten eleven twelve"
+    wrapped = wrap_lines(text, 42)
+    lines = wrapped.split("\n")
+    assert len(lines) == 2
+    assert all(len(line) <= 42 for line in lines)
+    assert abs(len(lines[0]) - len(lines[1])) < 10
+    assert wrap_lines("short", 42) == "short"
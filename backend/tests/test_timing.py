@@ -0,0 +1,79 @@
+import pytest
+
+from app.core.timing import (
+    format_duration,
+    format_segment_ranges,
+    format_timestamps,
+    render_srt,
+    render_vtt,
+    seconds_to_timestamp,
+)
+
+
+@pytest.mark.parametrize("seconds, style, expected", [
+    (0, "clock", "00:00"),
+    (59.9, "clock", "00:59"),
+    (3599, "clock", "59:59"),
+    (3600, "clock", "01:00:00"),
+    (3723.5, "srt", "01:02:03,500"),
+    (3723.5, "vtt", "01:02:03.500"),
+    (3723.5, "ms", "01:02:03.500"),
+])
+def test_seconds_to_timestamp(seconds, style, expected):
+    assert seconds_to_timestamp(seconds, style) == expected
+
+
+@pytest.mark.parametrize("seconds, style, expected", [
+    (360001, "clock", "100:00:01"),
+    (360001, "srt", "100:00:01,000"),
+    (123 * 3600 + 45 * 60 + 6.789, "vtt", "123:45:06.789"),
+])
+def test_hours_of_100_and_more_are_not_truncated(seconds, style, expected):
+    assert seconds_to_timestamp(seconds, style) == expected
+
+
+def test_milliseconds_round_up_into_the_next_second():
+    assert seconds_to_timestamp(59.9996, "srt") == "00:01:00,000"
+
+
+@pytest.mark.parametrize("value", [None, -1, -0.001])
+def test_negative_and_missing_times_clamp_to_zero(value):
+    assert seconds_to_timestamp(value, "srt") == "00:00:00,000"
+    assert format_timestamps([value, 61], "clock") == ["00:00", "01:01"]
+
+
+def test_segment_ranges_clamp_negative_starts():
+    segments = [{"start": -0.2, "end": 1.5, "text": "a"}]
+    assert format_segment_ranges(segments) == ["[00:00 - 00:01]"]
+
+
+def test_unknown_style_raises():
+    with pytest.raises(ValueError):
+        seconds_to_timestamp(1, "frames")
+
+
+@pytest.mark.parametrize("seconds, expected", [
+    (None, "0:00"),
+    (0, "0:00"),
+    (65, "1:05"),
+    (3600, "1:00:00"),
+    (360000, "100:00:00"),
+])
+def test_format_duration(seconds, expected):
+    assert format_duration(seconds) == expected
+
+
+def test_render_srt_and_vtt():
+    segments = [
+        {"start": 0, "end": 1.25, "text": " Hello"},
+        {"start": 1.25, "end": 2, "text": " world "},
+    ]
+    assert render_srt(segments) == (
+        "1\n00:00:00,000 --> 00:00:01,250\nHello\n\n"
+        "2\n00:00:01,250 --> 00:00:02,000\nworld\n\n"
+    )
+    assert render_vtt(segments) == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.250\nHello\n\n"
+        "00:00:01.250 --> 00:00:02.000\nworld\n\n"
+    )
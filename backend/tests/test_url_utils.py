@@ -0,0 +1,51 @@
+import pytest
+
+from app.core.url_utils import normalize_video_url, parse_video_id
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url", [
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"http://youtube.com/watch?v={VIDEO_ID}&t=42s&list=PL123",
+    f"www.youtube.com/watch?feature=share&v={VIDEO_ID}",
+    f"https://m.youtube.com/watch?v={VIDEO_ID}",
+    f"https://music.youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?si=abc",
+    f"youtu.be/{VIDEO_ID}",
+    f"https://www.youtube.com/shorts/{VIDEO_ID}",
+    f"https://youtube.com/shorts/{VIDEO_ID}?feature=share",
+    f"https://www.youtube.com/embed/{VIDEO_ID}?start=10",
+    f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/live/{VIDEO_ID}",
+    f"https://www.youtube.com/v/{VIDEO_ID}",
+    f"https://www.youtube.com:443/watch?v={VIDEO_ID}",
+    f"https://youtu.be:443/{VIDEO_ID}",
+    f"http://www.youtube.com:80/shorts/{VIDEO_ID}",
+    f"  HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}  ",
+])
+def test_accepted_shapes(url):
+    assert parse_video_id(url) == VIDEO_ID
+    assert normalize_video_url(url) == f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+@pytest.mark.parametrize("url", [
+    None,
+    "",
+    "not a url",
+    f"ftp://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com.evil.com/watch?v={VIDEO_ID}",
+    f"https://evil.com/youtu.be/{VIDEO_ID}",
+    "https://www.youtube.com/watch?v=short",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}x",
+    "https://www.youtube.com/playlist?list=PL123",
+    "https://www.youtube.com/@channel",
+    "https://www.youtube.com/shorts/",
+    f"https://www.youtube.com/watch/{VIDEO_ID}",
+    f"https://www.youtube.com:99999/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com:8080/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com:abc/watch?v={VIDEO_ID}",
+])
+def test_rejected_shapes(url):
+    assert parse_video_id(url) is None
+    assert normalize_video_url(url) is None